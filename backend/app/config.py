@@ -1,6 +1,8 @@
 """
 애플리케이션 설정 관리
 """
+from pathlib import Path
+from pydantic import model_validator
 from pydantic_settings import BaseSettings
 from typing import Optional
 
@@ -9,7 +11,10 @@ class Settings(BaseSettings):
     """환경 변수 설정"""
 
     # API Keys
-    google_gemini_api_key: str
+    # 단일 키(GOOGLE_GEMINI_API_KEY) 또는 키 목록(GOOGLE_GEMINI_API_KEYS) 중 하나는 필수
+    google_gemini_api_key: Optional[str] = None
+    # "키[:RPM[:TPM]]"를 쉼표로 나열, 할당량 생략 시 아래 gemini_*_per_minute 사용
+    google_gemini_api_keys: str = ""
     brave_search_api_key: Optional[str] = None
 
     # 서버 설정
@@ -17,14 +22,119 @@ class Settings(BaseSettings):
     port: int = 8000
     debug: bool = True
 
+    # 프론트엔드 직접 서빙 (Flask 프록시 없이 / 와 /static 을 FastAPI가 제공)
+    serve_frontend: bool = False
+    frontend_dir: str = str(Path(__file__).resolve().parents[2] / "frontend")
+
+    # 응답 압축 (Accept-Encoding 협상, brotli 미설치 시 gzip만)
+    compression_enabled: bool = True
+    compression_min_size: int = 1024  # 이 크기(바이트) 미만의 응답은 압축하지 않음
+    compression_gzip_level: int = 6
+    compression_brotli_quality: int = 5  # 4 이하는 gzip -6보다 큼 (benchmarks/payload_bench.py)
+
     # Gemini 설정
     gemini_model: str = "gemini-2.0-flash-exp"
     gemini_api_url: str = "https://generativelanguage.googleapis.com/v1beta/models"
     max_tokens: int = 4096
+    gemini_streaming: bool = False  # 트렌드 요약에 streamGenerateContent 사용
+
+    # 공유 HTTP 클라이언트 설정 (커넥션 풀 / HTTP/2 / keep-alive)
+    http2_enabled: bool = True
+    http_max_connections: int = 100
+    http_max_keepalive_connections: int = 20
+    http_keepalive_expiry: float = 60.0
+    http_connect_timeout: float = 5.0
+    http_warmup: bool = True  # 부팅 시 DNS/TLS 워밍업
+
+    # 업스트림 녹화/재생 (off, record, replay) - 재생 중에는 네트워크를 쓰지 않음
+    cassette_mode: str = "off"
+    cassette_path: str = "cassettes/upstream.jsonl.gz"
+    cassette_replay_timing: str = "original"  # "original": 녹화된 지연 재현, "fast": 대기 없음
+
+    # Gemini 속도 제한 (할당량에 맞춰 조정, 0이면 해당 제한 없음)
+    gemini_requests_per_minute: int = 1000
+    gemini_tokens_per_minute: int = 1_000_000
+    gemini_max_retries: int = 3  # 429/403 응답 재시도 횟수
+    gemini_key_quarantine: float = 60.0  # 429를 받은 키 격리 시간(초)
+    gemini_key_forbidden_quarantine: float = 600.0  # 403을 받은 키 격리 시간(초)
+    gemini_retry_base_delay: float = 0.5  # 초
+    gemini_retry_max_delay: float = 8.0  # 초
+    request_deadline: float = 45.0  # /api/analyze 한 건의 Gemini 호출 전체 마감(초)
+
+    # 서킷 브레이커 (업스트림별: gemini, brave, duckduckgo)
+    circuit_breaker_enabled: bool = True
+    circuit_failure_threshold: int = 5  # 회로를 여는 연속 실패 수
+    circuit_recovery_timeout: float = 30.0  # 시험 요청 전 대기 시간(초)
 
     # 웹 검색 설정
     search_results_limit: int = 10
     search_engine: str = "auto"  # "auto", "brave", "duckduckgo"
+    brave_search_url: str = "https://api.search.brave.com/res/v1/web/search"
+    duckduckgo_search_url: str = "https://html.duckduckgo.com/html/"
+    trend_search_concurrency: int = 3  # 키워드 검색 동시 실행 수
+    trend_search_deadline: float = 12.0  # 검색 단계 마감 시간(초)
+    ddg_parser_backend: str = "lxml"  # "lxml", "stream", "bs4"
+    ddg_max_bytes: int = 256 * 1024  # DuckDuckGo 결과 페이지 최대 수신 바이트
+
+    # 헤지 검색 (Brave API 키가 있을 때 주 엔진이 느리면 다른 엔진에 백업 요청)
+    search_hedging_enabled: bool = False
+    search_hedge_quantile: float = 0.9  # 이 분위수 지연을 넘으면 백업 요청
+    search_hedge_default_delay: float = 2.0  # 관측값이 부족할 때 대기 시간(초)
+    search_hedge_min_delay: float = 0.2  # 초
+    search_hedge_min_samples: int = 20
+    search_latency_window: int = 200  # 엔진별 최근 관측 수
+
+    # 검색 결과 캐시
+    search_cache_enabled: bool = True
+    search_cache_ttl: float = 900.0  # 초
+    search_cache_max_entries: int = 2048
+    search_cache_max_bytes: int = 32 * 1024 * 1024
+
+    # 의도 분석 캐시 (유사 쿼리 재사용)
+    intent_cache_enabled: bool = True
+    intent_cache_ttl: float = 3600.0  # 초
+    intent_cache_max_entries: int = 4096
+    intent_cache_similarity_threshold: float = 0.8  # 문자 bigram Dice 유사도
+
+    # 로컬 의도 분류기 (신뢰도가 임계값 이상이면 Gemini 생략)
+    intent_fast_path_enabled: bool = True
+    intent_fast_path_threshold: float = 0.9
+
+    # 트렌드 요약 캐시 (stale-while-revalidate)
+    trend_cache_enabled: bool = True
+    trend_cache_fresh_ttl: float = 300.0  # 이 시간 이후 백그라운드 갱신
+    trend_cache_hard_ttl: float = 3600.0  # 이 시간 이후 새로 로드될 때까지 대기
+    trend_cache_max_entries: int = 1024
+
+    # 추측 검색: 의도 분석과 병렬로 쿼리 키워드 검색을 미리 시작
+    speculative_search_enabled: bool = False
+    speculative_search_min_overlap: float = 0.67  # LLM 키워드와의 최소 겹침 비율
+
+    # 분석 세션 저장소 (/api/generate-prompts 가 analysis_id 로 조회)
+    session_ttl: float = 1800.0  # 초
+    session_max_entries: int = 10000
+    session_max_bytes: int = 64 * 1024 * 1024
+
+    # 배치 파이프라인
+    batch_max_queries: int = 500
+    batch_intent_concurrency: int = 8  # 동시 의도 분석 수
+    batch_summary_concurrency: int = 4  # 동시 검색+요약 수
+
+    # 동일 요청 병합 (의도 분석 / 검색 / 요약)
+    singleflight_enabled: bool = True
+
+    # 요청 추적 (span을 회전 JSONL 파일로 내보냄)
+    tracing_enabled: bool = False
+    tracing_file: str = "logs/traces.jsonl"
+    tracing_max_bytes: int = 10 * 1024 * 1024  # 파일 하나의 최대 크기
+    tracing_backup_count: int = 5  # 보관할 회전 파일 수
+    tracing_sample_rate: float = 1.0  # traceparent 없이 들어온 요청의 추적 비율
+
+    @model_validator(mode="after")
+    def _require_gemini_key(self) -> "Settings":
+        if not self.google_gemini_api_key and not self.google_gemini_api_keys.strip():
+            raise ValueError("GOOGLE_GEMINI_API_KEY 또는 GOOGLE_GEMINI_API_KEYS가 필요합니다")
+        return self
 
     class Config:
         env_file = ".env"
@@ -0,0 +1,128 @@
+"""
+프론트엔드 직접 서빙
+SERVE_FRONTEND=true면 Flask 프록시 없이 FastAPI가 frontend/의 페이지와 정적 파일을 함께 제공합니다.
+브라우저가 API를 같은 origin으로 바로 호출하므로 프록시 hop과 Flask 스레드 대기가 없어집니다.
+
+frontend/build_assets.py로 빌드한 배포 파일(static/dist/)은 immutable 캐시로,
+브라우저가 받아들이면 사전 압축본(.br, .gz)으로 제공합니다.
+"""
+import hashlib
+import json
+import mimetypes
+import os
+import re
+from pathlib import Path
+from typing import Dict, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import HTMLResponse, Response
+from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse
+from starlette.staticfiles import NotModifiedResponse
+
+from .services.compression import parse_accept_encoding
+
+
+# 템플릿의 정적 파일 참조: {{ asset_url('css/style.css') }} 또는
+# {{ url_for('static', filename='css/style.css') }}
+STATIC_URL_RE = re.compile(
+    r"""\{\{\s*(?:asset_url\(\s*|url_for\(\s*['"]static['"]\s*,\s*filename\s*=\s*)"""
+    r"""['"]([^'"]+)['"]\s*\)\s*\}\}"""
+)
+
+# 배포 파일은 이름이 내용과 함께 바뀌므로 1년 동안 재검증 없이 캐시
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+
+# 선호 순서대로 (Content-Encoding, 사전 압축 파일 확장자)
+PRECOMPRESSED = (("br", ".br"), ("gzip", ".gz"))
+
+
+def load_manifest(static_dir: Path) -> Dict[str, str]:
+    """빌드 manifest (원래 경로 → 배포 경로). 빌드하지 않았으면 빈 딕셔너리."""
+    try:
+        return json.loads((static_dir / "dist" / "manifest.json").read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return {}
+
+
+def render_index(template_dir: Path, manifest: Dict[str, str]) -> str:
+    """
+    index.html의 정적 파일 참조를 /static 경로(빌드되어 있으면 배포 파일)로 바꿔 정적 HTML로 만듭니다.
+    (템플릿에 다른 Jinja 구문은 없으므로 템플릿 엔진 없이 한 번만 렌더링)
+    """
+    html = (template_dir / "index.html").read_text(encoding="utf-8")
+    return STATIC_URL_RE.sub(
+        lambda m: f"/static/{manifest.get(m.group(1), m.group(1))}", html
+    )
+
+
+class AssetStaticFiles(StaticFiles):
+    """dist/ 아래 파일에 immutable 캐시와 사전 압축본 선택을 더한 StaticFiles"""
+
+    def __init__(self, directory: Path):
+        super().__init__(directory=directory)
+        self.dist_dir = os.path.join(os.path.realpath(directory), "dist") + os.sep
+        # 배포 파일은 바뀌지 않으므로 사전 압축본 존재 여부를 캐시
+        self._variants: Dict[str, Optional[os.stat_result]] = {}
+
+    def _variant(self, path: str) -> Optional[os.stat_result]:
+        if path not in self._variants:
+            try:
+                self._variants[path] = os.stat(path)
+            except FileNotFoundError:
+                self._variants[path] = None
+        return self._variants[path]
+
+    def file_response(self, full_path, stat_result, scope, status_code: int = 200) -> Response:
+        full_path = str(full_path)
+        if not full_path.startswith(self.dist_dir):
+            return super().file_response(full_path, stat_result, scope, status_code)
+
+        request_headers = Headers(scope=scope)
+        accepted = parse_accept_encoding(request_headers.get("accept-encoding", ""))
+        headers = {"Cache-Control": IMMUTABLE_CACHE, "Vary": "Accept-Encoding"}
+        media_type = mimetypes.guess_type(full_path)[0]
+
+        for coding, suffix in PRECOMPRESSED:
+            variant_stat = self._variant(full_path + suffix)
+            if variant_stat is not None and accepted.get(coding, 0) > 0:
+                full_path, stat_result = full_path + suffix, variant_stat
+                headers["Content-Encoding"] = coding
+                break
+
+        # ETag는 실제로 보내는 파일(압축본별로 다름)에서 계산
+        response = FileResponse(
+            full_path,
+            status_code=status_code,
+            stat_result=stat_result,
+            media_type=media_type,
+            headers=headers,
+        )
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+
+def mount_frontend(app: FastAPI, frontend_dir: str) -> None:
+    """
+    메인 페이지(/)와 정적 파일(/static)을 등록합니다.
+    API 라우트보다 먼저 호출해야 / 가 API 안내 JSON 대신 페이지를 반환합니다.
+
+    Args:
+        app: FastAPI 앱
+        frontend_dir: templates/와 static/이 있는 프론트엔드 디렉터리
+    """
+    root = Path(frontend_dir).resolve()
+    page = render_index(root / "templates", load_manifest(root / "static"))
+    etag = '"%s"' % hashlib.sha256(page.encode("utf-8")).hexdigest()[:16]
+
+    app.mount("/static", AssetStaticFiles(root / "static"), name="static")
+
+    @app.get("/", response_class=HTMLResponse, include_in_schema=False)
+    async def index(request: Request) -> Response:
+        # 배포 파일 이름이 바뀌면 바로 반영되도록 매번 재검증
+        headers = {"Cache-Control": "no-cache", "ETag": etag}
+        if etag in request.headers.get("if-none-match", ""):
+            return Response(status_code=304, headers=headers)
+        return HTMLResponse(page, headers=headers)
@@ -4,16 +4,34 @@ FastAPI 메인 서버
 """
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
 from typing import Optional, List
+from contextlib import asynccontextmanager
 import asyncio
+import contextvars
+import json
 
 from .services import (
     IntentAnalyzer,
     TrendCollector,
+    SearchDeduplicator,
     PromptGenerator,
     ConfirmationModule,
+    AnalysisSessionStore,
+    breakers,
+    llm_client,
+    Priority,
+    request_priority,
+    request_deadline,
+    metrics_registry,
+    tracer,
 )
+from .services.compression import CompressionMiddleware
+from .services.serialization import FastJSONResponse
+from .services.tracing import TracingMiddleware
+from .config import settings
+from .frontend import mount_frontend
 from .models.schemas import (
     UserQuery,
     IntentAnalysisResult,
@@ -22,11 +40,22 @@ from .models.schemas import (
     PromptStrategyType,
 )
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """앱 수명 주기: 공유 HTTP 커넥션 풀 생성/정리, 추적 파일 정리"""
+    await llm_client.start()
+    yield
+    await llm_client.close()
+    tracer.shutdown()
+
+
 # FastAPI 앱 초기화
 app = FastAPI(
     title="프롬프트 엔지니어링 자동화 API",
     description="AI를 활용한 최적화된 프롬프트 자동 생성 시스템",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # CORS 설정
@@ -36,13 +65,35 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["traceparent", "X-Trace-Id"],
 )
 
+# 요청 추적 (TRACING_ENABLED=true일 때 span을 JSONL로 기록)
+app.add_middleware(TracingMiddleware)
+
+# 응답 압축 (스트리밍 응답과 사전 압축된 정적 파일은 그대로 전달)
+if settings.compression_enabled:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.compression_min_size,
+        gzip_level=settings.compression_gzip_level,
+        brotli_quality=settings.compression_brotli_quality,
+    )
+
+# 프론트엔드 직접 서빙 (/ 는 API 안내 대신 메인 페이지)
+if settings.serve_frontend:
+    mount_frontend(app, settings.frontend_dir)
+
 # 서비스 인스턴스
 intent_analyzer = IntentAnalyzer()
 trend_collector = TrendCollector()
 prompt_generator = PromptGenerator()
 confirmation_module = ConfirmationModule()
+analysis_sessions = AnalysisSessionStore(
+    max_entries=settings.session_max_entries,
+    max_bytes=settings.session_max_bytes,
+    ttl=settings.session_ttl,
+)
 
 
 # 응답 모델
@@ -53,6 +104,22 @@ class AnalysisResponse(BaseModel):
     intent: IntentAnalysisResult
     trends: TrendResult
     confirmation_message: str
+    analysis_id: Optional[str] = None
+
+
+class PromptGenerationRequest(BaseModel):
+    """
+    프롬프트 생성 요청
+    analysis_id만 보내면 서버에 저장된 분석 결과를 사용하고,
+    함께 보낸 필드는 수정값으로 덮어씁니다.
+    analysis_id가 없으면 query, intent, trends가 모두 필요합니다.
+    """
+
+    analysis_id: Optional[str] = None
+    query: Optional[str] = None
+    intent: Optional[IntentAnalysisResult] = None
+    trends: Optional[TrendResult] = None
+    confirmation_message: Optional[str] = None
 
 
 class PromptsResponse(BaseModel):
@@ -62,6 +129,12 @@ class PromptsResponse(BaseModel):
     selection_message: str
 
 
+class BatchPipelineRequest(BaseModel):
+    """배치 파이프라인 요청"""
+
+    queries: List[UserQuery]
+
+
 class FinalPromptRequest(BaseModel):
     """최종 프롬프트 요청"""
 
@@ -81,6 +154,8 @@ async def root():
             "analyze": "/api/analyze",
             "generate_prompts": "/api/generate-prompts",
             "full_pipeline": "/api/pipeline",
+            "pipeline_stream": "/api/pipeline/stream",
+            "pipeline_batch": "/api/pipeline/batch",
         },
     }
 
@@ -95,6 +170,7 @@ async def health_check():
 async def analyze_query(query: UserQuery):
     """
     1단계: 사용자 쿼리 분석 및 트렌드 수집
+    결과는 2단계(/api/generate-prompts)에서 analysis_id로 찾을 수 있도록 세션에 저장합니다.
 
     Args:
         query: 사용자 쿼리
@@ -102,12 +178,41 @@ async def analyze_query(query: UserQuery):
     Returns:
         분석 결과 및 확인 메시지
     """
-    try:
-        # 1. 의도 분석
-        intent = await intent_analyzer.analyze(query.query)
+    analysis = await _analyze(query)
+    analysis.analysis_id = analysis_sessions.create(analysis)
+    return analysis
+
 
-        # 2. 트렌드 수집
-        trends = await trend_collector.collect(intent.keywords, intent)
+async def _analyze(query: UserQuery) -> AnalysisResponse:
+    """의도 분석, 트렌드 수집, 확인 메시지 생성 (세션은 만들지 않음)"""
+    try:
+        # 대화형 요청: Gemini 대기/재시도를 포함한 전체 마감 시간
+        with request_deadline(settings.request_deadline):
+            # 추측 검색: 의도 분석과 동시에 쿼리에서 바로 뽑은 키워드로 검색 시작
+            speculative = None
+            if settings.speculative_search_enabled:
+                speculative = trend_collector.start_speculative_search(
+                    intent_analyzer.quick_keywords(query.query)
+                )
+
+            try:
+                # 1. 의도 분석
+                intent = await intent_analyzer.analyze(query.query)
+
+                # 2. 트렌드 수집 (LLM 키워드와 충분히 겹치면 추측 검색 결과 재사용)
+                search = None
+                if speculative is not None:
+                    search = speculative.search_for(
+                        intent.keywords,
+                        trend_collector.search_web,
+                        settings.speculative_search_min_overlap,
+                    )
+                trends = await trend_collector.collect(
+                    intent.keywords, intent, search=search
+                )
+            finally:
+                if speculative is not None:
+                    speculative.cancel()
 
         # 3. 확인 메시지 생성
         confirmation_msg = confirmation_module.generate_confirmation_message(
@@ -125,62 +230,469 @@ async def analyze_query(query: UserQuery):
         raise HTTPException(status_code=500, detail=f"분석 실패: {str(e)}")
 
 
+async def _build_prompts(
+    query: str, trends: TrendResult, intent: IntentAnalysisResult
+) -> PromptsResponse:
+    """5가지 전략 프롬프트와 선택 메시지를 생성합니다."""
+    # 프롬프트 생성
+    prompts = await prompt_generator.generate_all(query, trends, intent)
+
+    # 선택 메시지 생성
+    selection_msg = confirmation_module.generate_strategy_selection_message(
+        len(prompts.prompts)
+    )
+
+    return PromptsResponse(prompts=prompts, selection_message=selection_msg)
+
+
 @app.post("/api/generate-prompts", response_model=PromptsResponse)
-async def generate_prompts(analysis: AnalysisResponse):
+async def generate_prompts(request: PromptGenerationRequest):
     """
     2단계: 5가지 프롬프팅 전략 생성
 
     Args:
-        analysis: 1단계에서 받은 분석 결과
+        request: 1단계의 analysis_id (+ 수정할 필드) 또는 전체 분석 결과
 
     Returns:
         생성된 프롬프트들
     """
-    try:
-        # 프롬프트 생성
-        prompts = await prompt_generator.generate_all(
-            analysis.query, analysis.trends, analysis.intent
-        )
-
-        # 선택 메시지 생성
-        selection_msg = confirmation_module.generate_strategy_selection_message(
-            len(prompts.prompts)
+    if request.analysis_id is not None:
+        stored = analysis_sessions.get(request.analysis_id)
+        if stored is None:
+            raise HTTPException(
+                status_code=404,
+                detail="분석 결과를 찾을 수 없습니다. 만료되었을 수 있으니 다시 분석해주세요.",
+            )
+        query = request.query or stored.query
+        intent = request.intent or stored.intent
+        trends = request.trends or stored.trends
+    elif request.query and request.intent and request.trends:
+        query, intent, trends = request.query, request.intent, request.trends
+    else:
+        raise HTTPException(
+            status_code=400,
+            detail="analysis_id 또는 query, intent, trends가 필요합니다",
         )
 
-        return PromptsResponse(prompts=prompts, selection_message=selection_msg)
+    try:
+        return await _build_prompts(query, trends, intent)
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"프롬프트 생성 실패: {str(e)}")
 
 
-@app.post("/api/pipeline")
-async def full_pipeline(query: UserQuery):
+def pipeline_payload(analysis: AnalysisResponse, prompts: PromptsResponse, compact: bool = False) -> dict:
+    """
+    /api/pipeline 응답 본문
+
+    Args:
+        analysis: 분석 결과
+        prompts: 프롬프트 생성 결과
+        compact: True면 prompts.prompts에서 analysis와 중복되는 query/intent/trends를 뺌
+
+    Returns:
+        직렬화할 응답 (모델이 들어 있는 dict)
+    """
+    prompts_payload = prompts
+    if compact:
+        # 생성된 프롬프트는 analysis의 query/intent/trends를 그대로 되풀이하므로 한 번만 보냄
+        prompts_payload = {
+            "prompts": {"prompts": prompts.prompts.prompts},
+            "selection_message": prompts.selection_message,
+        }
+    return {"analysis": analysis, "prompts": prompts_payload, "status": "success"}
+
+
+@app.post("/api/pipeline", response_class=FastJSONResponse)
+async def full_pipeline(query: UserQuery, compact: bool = False):
     """
     전체 파이프라인: 분석 → 프롬프트 생성을 한 번에 수행
 
     Args:
         query: 사용자 쿼리
+        compact: True면 prompts.prompts에서 analysis와 중복되는 query/intent/trends를 빼고 반환
 
     Returns:
         전체 결과 (분석 + 프롬프트)
     """
     try:
-        # 1단계: 분석
-        analysis_result = await analyze_query(query)
+        # 1단계: 분석 (프롬프트를 바로 만들므로 세션은 저장하지 않음)
+        analysis_result = await _analyze(query)
 
         # 2단계: 프롬프트 생성
-        prompts_result = await generate_prompts(analysis_result)
+        prompts_result = await _build_prompts(
+            analysis_result.query, analysis_result.trends, analysis_result.intent
+        )
 
-        return {
-            "analysis": analysis_result,
-            "prompts": prompts_result,
-            "status": "success",
-        }
+        # 모델을 dict로 바꾸지 않고 바로 직렬화
+        return FastJSONResponse(pipeline_payload(analysis_result, prompts_result, compact))
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"파이프라인 실패: {str(e)}")
 
 
+# CoT 프롬프트가 참조하는 트렌드 수 (trends[0..5])
+COT_REQUIRED_TRENDS = 6
+
+
+def _sse_event(event: str, data) -> str:
+    """Server-Sent Events 형식의 이벤트 문자열을 만듭니다."""
+    if isinstance(data, BaseModel):
+        data = data.model_dump(mode="json")
+    payload = json.dumps(data, ensure_ascii=False)
+    return f"event: {event}\ndata: {payload}\n\n"
+
+
+@app.post("/api/pipeline/stream")
+async def stream_pipeline(query: UserQuery):
+    """
+    전체 파이프라인 스트리밍 (Server-Sent Events)
+
+    각 단계가 끝나는 즉시 이벤트를 전송합니다:
+    intent → search (키워드별) → trend (요약 스트리밍 중 항목별)
+    → trends → confirmation → prompt (전략별 5회) → done
+    CoT 프롬프트는 트렌드 6개가 도착하는 즉시 먼저 전송될 수 있습니다.
+    오류 발생 시 error 이벤트를 보내고 종료합니다.
+
+    Args:
+        query: 사용자 쿼리
+
+    Returns:
+        text/event-stream 응답
+    """
+
+    async def event_stream():
+        # /api/analyze와 같은 요청 마감 시각을 스트림 전체(의도 분석 + 트렌드 수집)에 적용.
+        # 컨텍스트 변수를 yield 너머로 들고 있지 않도록 마감이 설정된 컨텍스트를 복사해 두고
+        # Gemini를 호출하는 작업은 그 컨텍스트의 태스크로 실행
+        with request_deadline(settings.request_deadline):
+            deadline_context = contextvars.copy_context()
+
+        try:
+            # 1. 의도 분석
+            intent = await deadline_context.run(
+                asyncio.create_task, intent_analyzer.analyze(query.query)
+            )
+            yield _sse_event("intent", intent)
+
+            # 2. 트렌드 수집 (검색이 끝날 때마다 search, 요약 중 항목마다 trend 이벤트)
+            events: asyncio.Queue = asyncio.Queue()
+            streamed_trends: List[str] = []
+
+            def on_results(keyword: str, results: List[dict]) -> None:
+                events.put_nowait(("search", {"keyword": keyword, "results": results}))
+
+            def on_trend(index: int, trend: str) -> None:
+                streamed_trends.append(trend)
+                events.put_nowait(("trend", {"index": index, "trend": trend}))
+
+            collect_task = deadline_context.run(
+                asyncio.create_task,
+                trend_collector.collect(intent.keywords, intent, on_results, on_trend),
+            )
+            early_strategies = set()
+            try:
+                while not collect_task.done() or not events.empty():
+                    get_event = asyncio.ensure_future(events.get())
+                    await asyncio.wait(
+                        [get_event, collect_task], return_when=asyncio.FIRST_COMPLETED
+                    )
+                    if not get_event.done():
+                        get_event.cancel()
+                        continue
+
+                    yield _sse_event(*get_event.result())
+
+                    # CoT 프롬프트는 trends[0..5]만 필요하므로 요약이 끝나기 전에 먼저 전송
+                    # (한 조각에서 여러 항목이 한꺼번에 완성될 수 있으므로 개수는 >= 로 비교)
+                    if (
+                        len(streamed_trends) >= COT_REQUIRED_TRENDS
+                        and PromptStrategyType.COT not in early_strategies
+                    ):
+                        partial = TrendResult(
+                            trends=streamed_trends[:COT_REQUIRED_TRENDS],
+                            summary="",
+                            sources=[],
+                        )
+                        early_strategies.add(PromptStrategyType.COT)
+                        yield _sse_event(
+                            "prompt",
+                            prompt_generator.generate_cot(query.query, partial, intent),
+                        )
+                trends = collect_task.result()
+            finally:
+                collect_task.cancel()
+            yield _sse_event("trends", trends)
+
+            # 3. 확인 메시지
+            confirmation_msg = confirmation_module.generate_confirmation_message(
+                query.query, intent, trends
+            )
+            yield _sse_event("confirmation", {"message": confirmation_msg})
+
+            # 4. 전략별 프롬프트 (먼저 보낸 전략 제외)
+            for strategy_type, generator_func in prompt_generator.strategies.items():
+                if strategy_type in early_strategies:
+                    continue
+                yield _sse_event("prompt", generator_func(query.query, trends, intent))
+
+            yield _sse_event("done", {"status": "success"})
+
+        except Exception as e:
+            yield _sse_event("error", {"detail": f"파이프라인 실패: {str(e)}"})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.post("/api/pipeline/batch")
+async def batch_pipeline(batch: BatchPipelineRequest):
+    """
+    배치 파이프라인: 여러 쿼리를 한 번에 처리
+
+    의도 분석과 요약은 설정된 동시성 한도 안에서 병렬로 실행되고,
+    배치 전체에서 같은 검색어는 한 번만 검색합니다.
+    결과는 쿼리별로 완료되는 순서대로 NDJSON 한 줄씩 전송되며,
+    마지막 줄에 검색 중복 제거 통계가 포함됩니다.
+
+    Args:
+        batch: 쿼리 목록
+
+    Returns:
+        application/x-ndjson 응답
+    """
+    if len(batch.queries) > settings.batch_max_queries:
+        raise HTTPException(
+            status_code=400,
+            detail=f"배치 크기는 최대 {settings.batch_max_queries}개입니다",
+        )
+
+    intent_semaphore = asyncio.Semaphore(max(1, settings.batch_intent_concurrency))
+    summary_semaphore = asyncio.Semaphore(max(1, settings.batch_summary_concurrency))
+    dedup_search = SearchDeduplicator(trend_collector.search_web)
+
+    async def run_one(index: int, query: UserQuery) -> dict:
+        try:
+            # 배치 레인: 대화형 요청이 Gemini 속도 제한 슬롯을 먼저 가져감
+            with request_priority(Priority.BATCH):
+                async with intent_semaphore:
+                    intent = await intent_analyzer.analyze(query.query)
+
+                async with summary_semaphore:
+                    trends = await trend_collector.collect(
+                        intent.keywords, intent, search=dedup_search
+                    )
+
+            confirmation_msg = confirmation_module.generate_confirmation_message(
+                query.query, intent, trends
+            )
+            analysis = AnalysisResponse(
+                query=query.query,
+                intent=intent,
+                trends=trends,
+                confirmation_message=confirmation_msg,
+            )
+            prompts_result = await _build_prompts(query.query, trends, intent)
+
+            return {
+                "index": index,
+                "analysis": analysis.model_dump(mode="json"),
+                "prompts": prompts_result.model_dump(mode="json"),
+                "status": "success",
+            }
+
+        except Exception as e:
+            return {
+                "index": index,
+                "status": "error",
+                "detail": f"파이프라인 실패: {str(e)}",
+            }
+
+    async def line_stream():
+        tasks = [
+            asyncio.create_task(run_one(i, q)) for i, q in enumerate(batch.queries)
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                result = await next_done
+                yield json.dumps(result, ensure_ascii=False) + "\n"
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        yield json.dumps(
+            {
+                "status": "done",
+                "count": len(tasks),
+                "search_requests": dedup_search.requests,
+                "unique_searches": dedup_search.unique,
+            },
+            ensure_ascii=False,
+        ) + "\n"
+
+    return StreamingResponse(line_stream(), media_type="application/x-ndjson")
+
+
+# 관리용 엔드포인트
+
+
+def _cache_snapshots() -> dict:
+    return {
+        "sessions": analysis_sessions.stats(),
+        "intent": intent_analyzer.cache_stats(),
+        "search": trend_collector.cache_stats(),
+        "trends": trend_collector.trend_cache_stats(),
+    }
+
+
+# /metrics 수집 시점에 읽는 값 (요청 경로에는 추가 비용 없음)
+CACHE_RESULTS = ("hits", "misses", "exact_hits", "similar_hits", "fresh_hits", "stale_hits", "fast_path_hits")
+CIRCUIT_STATES = {"closed": 0, "half_open": 1, "open": 2}
+KEY_OUTCOMES = ("requests", "successes", "rate_limited", "forbidden", "errors")
+
+metrics_registry.callback(
+    "app_cache_lookups_total", "Cache lookups by result", ["cache", "result"],
+    lambda: {
+        (name, result): stats[result]
+        for name, stats in _cache_snapshots().items()
+        for result in CACHE_RESULTS if result in stats
+    },
+    kind="counter",
+)
+metrics_registry.callback(
+    "app_cache_hit_ratio", "Cache hit ratio since start", ["cache"],
+    lambda: {
+        (name,): stats["hit_ratio"]
+        for name, stats in _cache_snapshots().items() if "hit_ratio" in stats
+    },
+)
+metrics_registry.callback(
+    "app_cache_entries", "Cached entries", ["cache"],
+    lambda: {
+        (name,): stats["entries"]
+        for name, stats in _cache_snapshots().items() if "entries" in stats
+    },
+)
+metrics_registry.callback(
+    "app_singleflight_calls_total", "Singleflight executions and coalesced calls", ["stage", "result"],
+    lambda: {
+        (stage, result): stats[result]
+        for stage, stats in {
+            "intent": intent_analyzer.inflight.stats(), **trend_collector.inflight_stats()
+        }.items()
+        for result in ("executions", "coalesced")
+    },
+    kind="counter",
+)
+metrics_registry.callback(
+    "app_circuit_state", "Circuit breaker state (0=closed, 1=half_open, 2=open)", ["upstream"],
+    lambda: {(name,): CIRCUIT_STATES[b.state] for name, b in breakers.items()},
+)
+metrics_registry.callback(
+    "app_gemini_key_requests_total", "Gemini calls per API key by outcome", ["key", "outcome"],
+    lambda: {
+        (key_id, outcome): stats[outcome]
+        for key_id, stats in llm_client.keys.stats().items()
+        for outcome in KEY_OUTCOMES
+    },
+    kind="counter",
+)
+metrics_registry.callback(
+    "app_gemini_key_tokens_total", "Gemini tokens used per API key", ["key"],
+    lambda: {(key_id,): stats["tokens_used"] for key_id, stats in llm_client.keys.stats().items()},
+    kind="counter",
+)
+metrics_registry.callback(
+    "app_gemini_key_healthy", "1 if the API key is not quarantined", ["key"],
+    lambda: {(key_id,): int(stats["healthy"]) for key_id, stats in llm_client.keys.stats().items()},
+)
+metrics_registry.callback(
+    "app_gemini_key_inflight", "In-flight Gemini calls per API key", ["key"],
+    lambda: {(key_id,): stats["inflight"] for key_id, stats in llm_client.keys.stats().items()},
+)
+metrics_registry.callback(
+    "app_gemini_rate_limit_waiting", "Calls waiting for a rate-limit slot per API key", ["key"],
+    lambda: {
+        (key_id,): stats["limiter"]["waiting"] for key_id, stats in llm_client.keys.stats().items()
+    },
+)
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """
+    Prometheus 형식 메트릭
+
+    Returns:
+        단계별 지연 히스토그램, 폴백/업스트림 상태 코드 카운터, 캐시·키·서킷 상태
+    """
+    return PlainTextResponse(
+        metrics_registry.render(),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
+
+
+@app.get("/admin/cache")
+async def get_cache_stats():
+    """
+    캐시 상태 조회
+
+    Returns:
+        캐시별 히트/미스/축출 카운터
+    """
+    return _cache_snapshots()
+
+
+@app.get("/admin/inflight")
+async def get_inflight_stats():
+    """
+    요청 병합(singleflight) 상태 조회
+
+    Returns:
+        단계별 실행 수와 병합된 호출 수
+    """
+    return {
+        "intent": intent_analyzer.inflight.stats(),
+        **trend_collector.inflight_stats(),
+    }
+
+
+@app.get("/admin/breakers")
+async def get_breaker_stats():
+    """
+    업스트림별 서킷 브레이커 상태 조회
+
+    Returns:
+        업스트림 이름별 상태(closed/open/half_open)와 실패/차단 카운터
+    """
+    return {name: breaker.stats() for name, breaker in breakers.items()}
+
+
+@app.get("/admin/rate-limit")
+async def get_rate_limit_stats():
+    """
+    Gemini 키별 속도 제한/사용량 조회
+
+    Returns:
+        키 ID(끝 4자리)별 격리 상태, 요청/429/403 수, 사용 토큰, 버킷 잔량과 레인별 대기 수
+    """
+    return llm_client.keys.stats()
+
+
+@app.get("/admin/search")
+async def get_search_stats():
+    """
+    검색 엔진 상태 조회
+
+    Returns:
+        엔진별 지연 시간 분위수, 헤지 대기 시간, 헤지 요청/승리 수
+    """
+    return trend_collector.search_stats()
+
+
 # 개별 프롬프트 조회
 
 
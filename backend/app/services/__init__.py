@@ -2,13 +2,50 @@
 서비스 모듈 패키지
 """
 from .intent_analyzer import IntentAnalyzer
-from .trend_collector import TrendCollector
+from .trend_collector import TrendCollector, SearchDeduplicator, SpeculativeSearch
 from .prompt_generator import PromptGenerator
 from .confirmation_module import ConfirmationModule
+from .llm_client import LLMClient, llm_client
+from .cache import TTLCache, StaleWhileRevalidateCache
+from .intent_cache import IntentCache, normalize_korean_query
+from .singleflight import SingleFlight
+from .intent_classifier import IntentClassifier
+from .session_store import AnalysisSessionStore
+from .circuit_breaker import CircuitBreaker, CircuitOpenError, breakers
+from .metrics import registry as metrics_registry
+from .tracing import tracer
+from .rate_limiter import (
+    TokenBucketLimiter,
+    RateLimitTimeout,
+    Priority,
+    request_priority,
+    request_deadline,
+)
 
 __all__ = [
     "IntentAnalyzer",
     "TrendCollector",
+    "SearchDeduplicator",
+    "SpeculativeSearch",
     "PromptGenerator",
     "ConfirmationModule",
+    "LLMClient",
+    "llm_client",
+    "TTLCache",
+    "StaleWhileRevalidateCache",
+    "IntentCache",
+    "normalize_korean_query",
+    "SingleFlight",
+    "IntentClassifier",
+    "AnalysisSessionStore",
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "breakers",
+    "TokenBucketLimiter",
+    "RateLimitTimeout",
+    "Priority",
+    "request_priority",
+    "request_deadline",
+    "metrics_registry",
+    "tracer",
 ]
@@ -0,0 +1,224 @@
+"""
+인메모리 캐시
+항목별 TTL과 LRU 축출, 메모리 사용량 상한, stale-while-revalidate를 지원합니다.
+"""
+import asyncio
+import sys
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+
+def estimate_size(value: Any) -> int:
+    """
+    객체의 대략적인 메모리 크기(바이트)를 계산합니다.
+    dict/list/tuple/pydantic 모델은 내부 항목까지 합산합니다.
+    """
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(estimate_size(v) for v in value)
+    elif hasattr(value, "model_dump"):
+        size += estimate_size(value.model_dump())
+    return size
+
+
+class TTLCache:
+    """TTL + LRU 캐시 (항목 수와 메모리 사용량 상한)"""
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        max_bytes: int = 16 * 1024 * 1024,
+        ttl: float = 600.0,
+        on_evict: Optional[Callable[[Hashable, Any], None]] = None,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.on_evict = on_evict
+
+        # key -> (value, expires_at, size)
+        self._entries: "OrderedDict[Hashable, Tuple[Any, float, int]]" = OrderedDict()
+        self._bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        entry = self._entries.get(key)
+        return entry is not None and entry[1] > time.monotonic()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """캐시된 값을 반환하고 최근 사용으로 표시합니다."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+
+        value, expires_at, _ = entry
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return default
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """값을 저장하고 상한을 넘으면 가장 오래 사용되지 않은 항목부터 축출합니다."""
+        size = estimate_size(key) + estimate_size(value)
+        if size > self.max_bytes:
+            return
+
+        if key in self._entries:
+            self._remove(key)
+
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._entries[key] = (value, expires_at, size)
+        self._bytes += size
+
+        while self._entries and (
+            len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+        ):
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def delete(self, key: Hashable) -> None:
+        """항목을 삭제합니다."""
+        if key in self._entries:
+            self._remove(key)
+
+    def clear(self) -> None:
+        """모든 항목을 삭제합니다."""
+        for key in list(self._entries):
+            self._remove(key)
+
+    def _remove(self, key: Hashable) -> None:
+        value, _, size = self._entries.pop(key)
+        self._bytes -= size
+        if self.on_evict is not None:
+            self.on_evict(key, value)
+
+    def stats(self) -> Dict[str, Any]:
+        """히트/미스/축출 카운터를 반환합니다."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+
+class StaleWhileRevalidateCache:
+    """
+    stale-while-revalidate 캐시
+    신선 기간이 지난 항목은 즉시 반환하면서 백그라운드에서 한 번만 갱신하고,
+    만료 기간(hard TTL)이 지난 항목은 새로 로드될 때까지 기다립니다.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        max_bytes: int = 16 * 1024 * 1024,
+        fresh_ttl: float = 300.0,
+        hard_ttl: float = 3600.0,
+    ):
+        self.fresh_ttl = fresh_ttl
+        self._store = TTLCache(max_entries=max_entries, max_bytes=max_bytes, ttl=hard_ttl)
+        self._refreshing: Dict[Hashable, "asyncio.Task"] = {}
+
+        self.fresh_hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.refresh_errors = 0
+
+    async def get_or_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Tuple[Any, bool]]],
+        refresh_loader: Optional[Callable[[], Awaitable[Tuple[Any, bool]]]] = None,
+    ) -> Any:
+        """
+        캐시된 값을 반환하거나 loader로 새로 로드합니다.
+
+        Args:
+            key: 캐시 키
+            loader: (값, 캐시 가능 여부)를 반환하는 코루틴 함수
+            refresh_loader: 백그라운드 갱신에 쓸 함수 (기본값: loader)
+
+        Returns:
+            캐시되었거나 새로 로드된 값
+        """
+        entry = self._store.get(key)
+        if entry is not None:
+            value, fresh_until = entry
+            if time.monotonic() < fresh_until:
+                self.fresh_hits += 1
+            else:
+                self.stale_hits += 1
+                self._schedule_refresh(key, refresh_loader or loader)
+            return value
+
+        self.misses += 1
+        value, cacheable = await loader()
+        if cacheable:
+            self._put(key, value)
+        return value
+
+    def _put(self, key: Hashable, value: Any) -> None:
+        self._store.set(key, (value, time.monotonic() + self.fresh_ttl))
+
+    def _schedule_refresh(
+        self, key: Hashable, loader: Callable[[], Awaitable[Tuple[Any, bool]]]
+    ) -> None:
+        """키당 하나의 백그라운드 갱신 작업만 실행합니다."""
+        if key in self._refreshing:
+            return
+        self._refreshing[key] = asyncio.create_task(self._refresh(key, loader))
+
+    async def _refresh(
+        self, key: Hashable, loader: Callable[[], Awaitable[Tuple[Any, bool]]]
+    ) -> None:
+        try:
+            value, cacheable = await loader()
+            if cacheable:
+                self._put(key, value)
+                self.refreshes += 1
+        except Exception as e:
+            self.refresh_errors += 1
+            print(f"Cache refresh error: {e}")
+        finally:
+            self._refreshing.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """신선/오래된 히트, 미스, 갱신 카운터를 반환합니다."""
+        store = self._store.stats()
+        hits = self.fresh_hits + self.stale_hits
+        lookups = hits + self.misses
+        return {
+            "entries": store["entries"],
+            "bytes": store["bytes"],
+            "evictions": store["evictions"],
+            "fresh_hits": self.fresh_hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "refreshes": self.refreshes,
+            "refresh_errors": self.refresh_errors,
+            "refreshing": len(self._refreshing),
+            "hit_ratio": hits / lookups if lookups else 0.0,
+        }
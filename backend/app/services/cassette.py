@@ -0,0 +1,227 @@
+"""
+업스트림 트래픽 녹화/재생 (cassette)
+공유 HTTP 클라이언트의 transport를 바꿔 끼워 Gemini와 검색 요청/응답 쌍을
+원래 타이밍(헤더 도착 시각, 본문 조각별 도착 시각)과 함께 gzip JSONL 파일에 기록하고,
+재생 모드에서는 네트워크 없이 같은 응답을 원래 속도 또는 최대 속도로 돌려줍니다.
+
+- 요청은 (메서드, 경로+쿼리, 본문 해시)로 찾습니다. 호스트는 비교하지 않으므로
+  가짜 서버나 다른 업스트림 주소로 녹화한 cassette도 재생할 수 있습니다.
+- URL의 API 키(key 파라미터)는 저장하지 않습니다.
+- 같은 요청이 여러 번 녹화되어 있으면 녹화된 순서대로 돌려가며 재생합니다.
+- 소비자가 본문을 중간까지만 읽은 응답(DuckDuckGo 조기 중단 등)은 읽은 만큼만 기록됩니다.
+"""
+import asyncio
+import base64
+import gzip
+import hashlib
+import json
+import time
+import urllib.parse
+from collections import defaultdict
+from itertools import cycle
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+import httpx
+
+
+# 저장하지 않는 쿼리 파라미터 / 응답 헤더
+SECRET_PARAMS = {"key"}
+DROPPED_HEADERS = {"set-cookie", "date", "alt-svc"}
+
+CassetteKey = Tuple[str, str, str]
+
+
+class CassetteMiss(httpx.TransportError):
+    """재생 모드에서 녹화되지 않은 요청"""
+
+
+def redact_url(url: httpx.URL) -> str:
+    """비밀 쿼리 파라미터를 지운 URL 문자열"""
+    params = [
+        (name, value)
+        for name, value in urllib.parse.parse_qsl(url.query.decode("ascii"), keep_blank_values=True)
+        if name not in SECRET_PARAMS
+    ]
+    base = str(url.copy_with(query=None))
+    return f"{base}?{urllib.parse.urlencode(params)}" if params else base
+
+
+def _match_target(url: str) -> str:
+    """요청을 찾을 때 쓰는 URL 부분 (경로 + 쿼리)"""
+    parts = urllib.parse.urlsplit(url)
+    return f"{parts.path}?{parts.query}" if parts.query else parts.path
+
+
+def request_key(request: httpx.Request) -> CassetteKey:
+    body = request.content if request.content else b""
+    return (
+        request.method,
+        _match_target(redact_url(request.url)),
+        hashlib.sha1(body).hexdigest(),
+    )
+
+
+class _RecordingStream(httpx.AsyncByteStream):
+    """응답 본문을 넘겨주면서 조각과 도착 시각을 기록하는 스트림"""
+
+    def __init__(self, inner: httpx.AsyncByteStream, on_close):
+        self._inner = inner
+        self._on_close = on_close
+        self._start = time.perf_counter()
+        self.chunks: List[Tuple[float, bytes]] = []
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._inner:
+            self.chunks.append((time.perf_counter() - self._start, chunk))
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._inner.aclose()
+        finally:
+            self._on_close(self.chunks)
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """실제 transport로 요청을 보내고 요청/응답 쌍을 cassette 파일에 추가합니다."""
+
+    def __init__(self, inner: httpx.AsyncBaseTransport, path: str):
+        self._inner = inner
+        self._file = gzip.open(path, "at", encoding="utf-8")
+        self.recorded = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        body_sha1 = request_key(request)[2]
+        start = time.perf_counter()
+        response = await self._inner.handle_async_request(request)
+        headers_at = time.perf_counter() - start
+
+        def on_close(chunks: List[Tuple[float, bytes]]) -> None:
+            self._write({
+                "method": request.method,
+                "url": redact_url(request.url),
+                "body_sha1": body_sha1,
+                "status": response.status_code,
+                "headers": [
+                    [name, value] for name, value in response.headers.multi_items()
+                    if name.lower() not in DROPPED_HEADERS
+                ],
+                "headers_at": round(headers_at, 6),
+                "chunks": [
+                    [round(headers_at + offset, 6), base64.b64encode(data).decode("ascii")]
+                    for offset, data in chunks
+                ],
+                "recorded_at": time.time(),
+            })
+
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            stream=_RecordingStream(response.stream, on_close),
+            extensions=response.extensions,
+        )
+
+    def _write(self, entry: Dict[str, Any]) -> None:
+        self._file.write(json.dumps(entry, separators=(",", ":")) + "\n")
+        self.recorded += 1
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
+        self._file.close()
+
+
+class _ReplayStream(httpx.AsyncByteStream):
+    """녹화된 본문 조각을 (원래 속도면) 원래 간격으로 내보내는 스트림"""
+
+    def __init__(self, chunks: List[Tuple[float, bytes]], headers_at: float, realtime: bool):
+        self._chunks = chunks
+        self._headers_at = headers_at
+        self._realtime = realtime
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        start = time.perf_counter() - self._headers_at
+        for offset, data in self._chunks:
+            if self._realtime:
+                delay = offset - (time.perf_counter() - start)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            yield data
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """cassette 파일의 응답을 네트워크 없이 돌려주는 transport"""
+
+    def __init__(self, path: str, realtime: bool = True):
+        self.realtime = realtime
+        self.entries = load_cassette(path)
+        self._queues: Dict[CassetteKey, Iterator[Dict[str, Any]]] = {
+            key: cycle(entries) for key, entries in self.entries.items()
+        }
+        self.hits = 0
+        self.misses = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        key = request_key(request)
+        queue = self._queues.get(key)
+        if queue is None:
+            self.misses += 1
+            raise CassetteMiss(f"cassette에 없는 요청: {key[0]} {key[1]}", request=request)
+        self.hits += 1
+        entry = next(queue)
+
+        if self.realtime:
+            await asyncio.sleep(entry["headers_at"])
+        chunks = [(offset, base64.b64decode(data)) for offset, data in entry["chunks"]]
+        return httpx.Response(
+            status_code=entry["status"],
+            headers=entry["headers"],
+            stream=_ReplayStream(chunks, entry["headers_at"], self.realtime),
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "requests": sum(len(entries) for entries in self.entries.values()),
+            "unique": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+def load_cassette(path: str) -> Dict[CassetteKey, List[Dict[str, Any]]]:
+    """cassette 파일을 요청 키별 녹화 목록으로 읽습니다."""
+    entries: Dict[CassetteKey, List[Dict[str, Any]]] = defaultdict(list)
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                entry = json.loads(line)
+                key = (entry["method"], _match_target(entry["url"]), entry["body_sha1"])
+                entries[key].append(entry)
+    return dict(entries)
+
+
+def build_transport(
+    mode: str, path: str, inner: httpx.AsyncBaseTransport, replay_timing: str = "original"
+) -> Optional[httpx.AsyncBaseTransport]:
+    """
+    cassette 모드에 맞는 transport를 만듭니다.
+
+    Args:
+        mode: "off", "record", "replay"
+        path: cassette 파일 경로 (.jsonl.gz)
+        inner: 녹화 모드에서 실제 요청을 보낼 transport
+        replay_timing: "original"(녹화된 지연 재현) 또는 "fast"(대기 없음)
+
+    Returns:
+        transport (mode가 "off"면 None)
+    """
+    if mode == "off":
+        return None
+    if mode == "record":
+        print(f"Recording upstream traffic to {path}")
+        return RecordingTransport(inner, path)
+    if mode == "replay":
+        transport = ReplayTransport(path, realtime=replay_timing != "fast")
+        stats = transport.stats()
+        print(f"Replaying {stats['requests']} recorded response(s) from {path} ({replay_timing})")
+        return transport
+    raise ValueError(f"알 수 없는 cassette 모드: {mode}")
@@ -0,0 +1,202 @@
+"""
+업스트림별 서킷 브레이커
+연속 실패가 임계값에 닿으면 회로를 열고(open), 복구 대기 시간 동안은
+요청을 보내지 않고 즉시 CircuitOpenError를 발생시켜 호출부의 폴백 경로로 보냅니다.
+대기 시간이 지나면 시험 요청 하나만 통과시키고(half-open), 성공하면 다시 닫습니다.
+"""
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+
+import httpx
+
+from ..config import settings
+from .metrics import UPSTREAM_RESPONSES
+
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# 5xx 외에 업스트림 실패로 세는 상태 코드 (나머지 4xx는 요청 자체의 오류)
+UPSTREAM_FAILURE_STATUS = {403, 408, 429}
+
+
+class CircuitOpenError(Exception):
+    """회로가 열려 있어 요청을 보내지 않았음"""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"circuit '{name}' is open (retry in {retry_after:.1f}s)")
+        self.name = name
+        self.retry_after = retry_after
+
+
+def is_upstream_failure(
+    error: BaseException, failure_status: Set[int] = UPSTREAM_FAILURE_STATUS
+) -> bool:
+    """
+    업스트림 장애로 셀 예외인지 판별합니다.
+    연결/타임아웃 오류, 5xx, failure_status(기본: 차단·한도 초과 403/408/429)만 실패로 셉니다.
+    """
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+        return status >= 500 or status in failure_status
+    return isinstance(error, (httpx.TransportError, TimeoutError))
+
+
+class CircuitBreaker:
+    """closed / open / half-open 상태를 가지는 서킷 브레이커"""
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        enabled: bool = True,
+        failure_status: Set[int] = UPSTREAM_FAILURE_STATUS,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.enabled = enabled
+        self.failure_status = failure_status
+
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self._opened_at = 0.0
+        self._trial_inflight = False
+
+        self.successes = 0
+        self.failures = 0
+        self.short_circuited = 0
+        self.opened = 0
+        self.last_error: Optional[str] = None
+
+    def _retry_after(self) -> float:
+        return max(0.0, self._opened_at + self.recovery_timeout - time.monotonic())
+
+    def before_call(self) -> None:
+        """
+        요청 전에 호출합니다. 보낼 수 없으면 CircuitOpenError를 발생시킵니다.
+        half-open 상태에서는 동시에 하나의 시험 요청만 통과시킵니다.
+        """
+        if not self.enabled:
+            return
+        if self.state == OPEN:
+            if self._retry_after() > 0:
+                self.short_circuited += 1
+                UPSTREAM_RESPONSES.inc(self.name, "circuit_open")
+                raise CircuitOpenError(self.name, self._retry_after())
+            self.state = HALF_OPEN
+            print(f"Circuit '{self.name}' half-open: sending trial request")
+        if self.state == HALF_OPEN:
+            if self._trial_inflight:
+                self.short_circuited += 1
+                UPSTREAM_RESPONSES.inc(self.name, "circuit_open")
+                raise CircuitOpenError(self.name, 0.0)
+            self._trial_inflight = True
+
+    def record_success(self) -> None:
+        """요청 성공을 기록합니다. half-open이었다면 회로를 닫습니다."""
+        self.successes += 1
+        self.consecutive_failures = 0
+        self._trial_inflight = False
+        if self.state != CLOSED:
+            self.state = CLOSED
+            print(f"Circuit '{self.name}' closed")
+
+    def record_failure(self, error: BaseException) -> None:
+        """
+        요청 실패를 기록합니다.
+        업스트림 장애가 아닌 오류는 성공과 같이 취급해 연속 실패를 끊습니다.
+        """
+        if not is_upstream_failure(error, self.failure_status):
+            self.record_success()
+            return
+        if not isinstance(error, httpx.HTTPStatusError):
+            # 상태 코드가 있는 응답은 HTTP 클라이언트 훅에서 이미 셈
+            UPSTREAM_RESPONSES.inc(self.name, "error")
+
+        self.failures += 1
+        self.consecutive_failures += 1
+        self.last_error = f"{type(error).__name__}: {error}"
+        self._trial_inflight = False
+        if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            self._open()
+
+    def release(self) -> None:
+        """결과 없이 끝난(취소된) 요청의 시험 슬롯을 반환합니다."""
+        self._trial_inflight = False
+
+    def _open(self) -> None:
+        if self.state != OPEN:
+            self.opened += 1
+            print(
+                f"Circuit '{self.name}' opened after {self.consecutive_failures} "
+                f"failure(s): {self.last_error}"
+            )
+        self.state = OPEN
+        self._opened_at = time.monotonic()
+
+    async def call(self, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        브레이커를 거쳐 코루틴 함수를 실행합니다.
+
+        Args:
+            fn: 업스트림을 호출하는 코루틴 함수
+
+        Returns:
+            fn의 결과 (회로가 열려 있으면 CircuitOpenError)
+        """
+        self.before_call()
+        try:
+            result = await fn()
+        except Exception as e:
+            self.record_failure(e)
+            raise
+        except BaseException:
+            self.release()
+            raise
+        self.record_success()
+        return result
+
+    def reset(self) -> None:
+        """회로를 닫힌 상태로 되돌립니다."""
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self._trial_inflight = False
+
+    def stats(self) -> Dict[str, Any]:
+        """상태와 카운터를 반환합니다."""
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "retry_after": round(self._retry_after(), 2) if self.state == OPEN else 0.0,
+            "successes": self.successes,
+            "failures": self.failures,
+            "short_circuited": self.short_circuited,
+            "opened": self.opened,
+            "last_error": self.last_error,
+        }
+
+
+# 업스트림 이름별 브레이커 ("gemini", "brave", "duckduckgo")
+breakers: Dict[str, CircuitBreaker] = {}
+
+
+def get_breaker(name: str, failure_status: Set[int] = UPSTREAM_FAILURE_STATUS) -> CircuitBreaker:
+    """
+    업스트림 이름의 브레이커를 반환합니다. 없으면 설정값으로 생성합니다.
+
+    Args:
+        name: 업스트림 이름
+        failure_status: 5xx 외에 실패로 셀 상태 코드
+    """
+    if name not in breakers:
+        breakers[name] = CircuitBreaker(
+            name,
+            failure_threshold=settings.circuit_failure_threshold,
+            recovery_timeout=settings.circuit_recovery_timeout,
+            enabled=settings.circuit_breaker_enabled,
+            failure_status=failure_status,
+        )
+    return breakers[name]
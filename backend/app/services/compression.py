@@ -0,0 +1,139 @@
+"""
+응답 압축 미들웨어
+Accept-Encoding에 따라 brotli(설치되어 있으면) 또는 gzip으로 응답 본문을 압축합니다.
+
+- 한 번에 보내는 본문만 압축합니다. 스트리밍 응답(SSE, NDJSON, 큰 파일)은 조각을 모으지 않고 그대로 흘려보냅니다.
+- 이미 Content-Encoding이 있는 응답(사전 압축된 정적 파일 등)과 압축 효과가 없는 형식은 건드리지 않습니다.
+- minimum_size보다 작은 본문은 압축 비용이 이득보다 크므로 그대로 보냅니다.
+"""
+import gzip
+from typing import Dict, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import brotli
+except ImportError:  # 선택 의존성 (pip install brotli)
+    brotli = None
+
+
+# 압축할 Content-Type (text/event-stream은 한 조각이라도 스트림이므로 제외)
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/javascript",
+    "application/x-ndjson",
+    "image/svg+xml",
+    "text/",
+)
+
+
+def parse_accept_encoding(header: str) -> Dict[str, float]:
+    """Accept-Encoding 헤더를 {coding: q} 딕셔너리로 (잘못된 q는 0으로 취급)"""
+    codings: Dict[str, float] = {}
+    for item in header.split(","):
+        name, _, params = item.partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        codings[name] = q
+    return codings
+
+
+class CompressionMiddleware:
+    """
+    협상된 gzip/brotli 응답 압축 ASGI 미들웨어
+
+    Args:
+        app: ASGI 앱
+        minimum_size: 이 크기(바이트) 미만의 본문은 압축하지 않음
+        gzip_level: gzip 압축 레벨 (1-9)
+        brotli_quality: brotli 품질 (0-11, 동적 압축에는 5 안팎이 속도/크기 균형이 좋음)
+    """
+
+    def __init__(self, app, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 5):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    def choose_encoding(self, accept_encoding: str) -> Optional[str]:
+        """클라이언트가 받아들이는 coding 중 사용할 것 (br → gzip 순)"""
+        codings = parse_accept_encoding(accept_encoding)
+        wildcard = codings.get("*", 0.0)
+        if brotli is not None and codings.get("br", wildcard) > 0:
+            return "br"
+        if codings.get("gzip", wildcard) > 0:
+            return "gzip"
+        return None
+
+    def compress(self, encoding: str, body: bytes) -> bytes:
+        if encoding == "br":
+            return brotli.compress(body, quality=self.brotli_quality)
+        return gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
+
+    def _should_compress(self, headers: Headers, body: bytes) -> bool:
+        if "content-encoding" in headers or len(body) < self.minimum_size:
+            return False
+        content_type = headers.get("content-type", "").lower()
+        return content_type.startswith(COMPRESSIBLE_TYPES) and not content_type.startswith("text/event-stream")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = self.choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        # 첫 본문 조각을 볼 때까지 응답 시작 메시지를 보류
+        pending_start = None
+
+        async def send_compressed(message):
+            nonlocal pending_start
+            if message["type"] == "http.response.start":
+                pending_start = message
+                return
+            if pending_start is None:
+                await send(message)
+                return
+
+            start, pending_start = pending_start, None
+            body = message.get("body", b"")
+            headers = MutableHeaders(raw=list(start.get("headers", [])))
+            if (
+                message["type"] != "http.response.body"
+                or message.get("more_body", False)
+                or not self._should_compress(headers, body)
+            ):
+                await send(start)
+                await send(message)
+                return
+
+            compressed = self.compress(encoding, body)
+            if len(compressed) >= len(body):
+                await send(start)
+                await send(message)
+                return
+
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(compressed))
+            headers.add_vary_header("Accept-Encoding")
+            if "etag" in headers:
+                # 압축본은 원본과 바이트가 다르므로 강한 ETag를 약한 ETag로
+                etag = headers["etag"]
+                if not etag.startswith("W/"):
+                    headers["ETag"] = f"W/{etag}"
+            start["headers"] = headers.raw
+            await send(start)
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_compressed)
@@ -3,12 +3,14 @@
 트렌드 수집 후 사용자에게 확인 메시지를 생성합니다.
 """
 from ..models.schemas import IntentAnalysisResult, TrendResult
+from .metrics import timed_stage
 
 
 class ConfirmationModule:
     """사용자 확인 모듈"""
 
     @staticmethod
+    @timed_stage("confirmation")
     def generate_confirmation_message(
         query: str, intent: IntentAnalysisResult, trends: TrendResult
     ) -> str:
@@ -0,0 +1,269 @@
+"""
+DuckDuckGo HTML 결과 파서
+결과 페이지를 조각 단위로 받아 필요한 개수만큼 추출되면 즉시 멈춥니다.
+
+백엔드:
+    - "lxml": lxml HTMLPullParser로 결과 div가 닫힐 때마다 추출 (기본값)
+    - "stream": 표준 라이브러리 html.parser 토크나이저 상태 기계
+    - "bs4": 전체 문서를 BeautifulSoup 트리로 만든 뒤 CSS 선택 (기존 방식)
+"""
+from html.parser import HTMLParser
+from typing import Dict, List, Optional, Tuple
+
+from bs4 import BeautifulSoup
+
+try:
+    from lxml import etree
+except ImportError:  # pragma: no cover - lxml은 requirements에 포함
+    etree = None
+
+
+# 닫는 태그가 없는 HTML 요소
+VOID_ELEMENTS = frozenset({
+    "area", "base", "br", "col", "embed", "hr", "img", "input",
+    "link", "meta", "param", "source", "track", "wbr",
+})
+
+# 문자열 전체를 넘겼을 때 나눠 넣는 크기 (조기 종료 판정 단위)
+FEED_CHUNK_SIZE = 16 * 1024
+
+
+def _clean_text(text: str) -> str:
+    """연속 공백을 하나로 합치고 앞뒤 공백을 제거합니다."""
+    return " ".join(text.split())
+
+
+def _make_result(title: str, snippet: str, url: str) -> Optional[Dict]:
+    """제목과 스니펫이 모두 있으면 결과 항목을 만듭니다."""
+    title, snippet = _clean_text(title), _clean_text(snippet)
+    if not title or not snippet:
+        return None
+    return {"title": title, "snippet": snippet, "url": url}
+
+
+class DuckDuckGoParser:
+    """
+    파서 공통 인터페이스
+
+    feed()로 HTML 조각을 넣고, 필요한 개수가 모이면 done이 True가 됩니다.
+    close()는 남은 입력을 처리하고 추출한 결과를 반환합니다.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.results: List[Dict] = []
+
+    @property
+    def done(self) -> bool:
+        return len(self.results) >= self.limit
+
+    def _add(self, result: Optional[Dict]) -> None:
+        if result is not None and not self.done:
+            self.results.append(result)
+
+    def feed(self, data: str) -> bool:
+        """
+        HTML 조각을 처리합니다.
+
+        Args:
+            data: 디코딩된 HTML 조각
+
+        Returns:
+            필요한 개수를 모두 추출했는지 여부
+        """
+        raise NotImplementedError
+
+    def close(self) -> List[Dict]:
+        """입력을 마무리하고 추출한 결과를 반환합니다."""
+        return self.results[:self.limit]
+
+    def parse(self, html: str) -> List[Dict]:
+        """문자열 전체를 파싱합니다. 필요한 개수가 모이면 나머지는 읽지 않습니다."""
+        for start in range(0, len(html), FEED_CHUNK_SIZE):
+            if self.feed(html[start:start + FEED_CHUNK_SIZE]):
+                break
+        return self.close()
+
+
+class BeautifulSoupParser(DuckDuckGoParser):
+    """전체 문서를 모은 뒤 BeautifulSoup 트리에서 CSS 선택으로 추출"""
+
+    def __init__(self, limit: int):
+        super().__init__(limit)
+        self._chunks: List[str] = []
+
+    def feed(self, data: str) -> bool:
+        self._chunks.append(data)
+        return False
+
+    def close(self) -> List[Dict]:
+        soup = BeautifulSoup("".join(self._chunks), "html.parser")
+        for result_div in soup.select(".result"):
+            title_elem = result_div.select_one(".result__title")
+            snippet_elem = result_div.select_one(".result__snippet")
+            url_elem = result_div.select_one(".result__url")
+            if title_elem and snippet_elem:
+                self._add(_make_result(
+                    title_elem.get_text(),
+                    snippet_elem.get_text(),
+                    url_elem.get("href", "") if url_elem else "",
+                ))
+            if self.done:
+                break
+        return super().close()
+
+
+def _lxml_classes(element) -> List[str]:
+    return (element.get("class") or "").split()
+
+
+class LxmlParser(DuckDuckGoParser):
+    """lxml 풀 파서로 결과 div가 닫히는 즉시 추출하고 처리한 요소는 해제"""
+
+    def __init__(self, limit: int):
+        super().__init__(limit)
+        self._parser = etree.HTMLPullParser(events=("end",), tag="div")
+
+    def _drain(self) -> None:
+        for _, element in self._parser.read_events():
+            if self.done:
+                break
+            if "result" not in _lxml_classes(element):
+                continue
+
+            title = snippet = None
+            url = ""
+            for child in element.iter():
+                classes = _lxml_classes(child)
+                if title is None and "result__title" in classes:
+                    title = "".join(child.itertext())
+                elif snippet is None and "result__snippet" in classes:
+                    snippet = "".join(child.itertext())
+                elif not url and "result__url" in classes:
+                    url = child.get("href", "")
+            if title is not None and snippet is not None:
+                self._add(_make_result(title, snippet, url))
+            element.clear()
+
+    def feed(self, data: str) -> bool:
+        if not self.done:
+            self._parser.feed(data)
+            self._drain()
+        return self.done
+
+    def close(self) -> List[Dict]:
+        if not self.done:
+            try:
+                self._parser.close()
+            except etree.LxmlError:
+                pass
+            self._drain()
+        return super().close()
+
+
+class _ResultTokenizer(HTMLParser):
+    """html.parser 토큰 이벤트로 결과 블록을 조립하는 상태 기계"""
+
+    def __init__(self, on_result):
+        super().__init__(convert_charrefs=True)
+        self._on_result = on_result
+        self._stack: List[Tuple[str, Optional[str]]] = []  # 결과 div 안쪽 (태그, 역할)
+        self._in_result = False
+        self._fields: Dict[str, List[str]] = {}
+        self._url = ""
+
+    def handle_starttag(self, tag, attrs):
+        classes = (dict(attrs).get("class") or "").split()
+
+        if not self._in_result:
+            if tag == "div" and "result" in classes:
+                self._in_result = True
+                self._stack = [(tag, None)]
+                self._fields = {"title": [], "snippet": []}
+                self._url = ""
+            return
+
+        if tag in VOID_ELEMENTS:
+            return
+
+        role = None
+        if "result__title" in classes:
+            role = "title"
+        elif "result__snippet" in classes:
+            role = "snippet"
+        elif "result__url" in classes and not self._url:
+            self._url = dict(attrs).get("href") or ""
+        self._stack.append((tag, role))
+
+    def handle_startendtag(self, tag, attrs):
+        # <br/> 등은 텍스트 구조에 영향이 없음
+        pass
+
+    def handle_endtag(self, tag):
+        if not self._in_result or tag in VOID_ELEMENTS:
+            return
+        # 짝이 맞지 않는 닫는 태그는 무시하고, 닫히지 않은 안쪽 요소는 함께 닫음
+        for depth in range(len(self._stack) - 1, -1, -1):
+            if self._stack[depth][0] == tag:
+                del self._stack[depth:]
+                break
+        else:
+            return
+        if not self._stack:
+            self._in_result = False
+            title = "".join(self._fields["title"]) if self._fields["title"] else None
+            snippet = "".join(self._fields["snippet"]) if self._fields["snippet"] else None
+            if title is not None and snippet is not None:
+                self._on_result(_make_result(title, snippet, self._url))
+
+    def handle_data(self, data):
+        if not self._in_result:
+            return
+        for _, role in self._stack:
+            if role is not None:
+                self._fields[role].append(data)
+                break
+
+
+class StreamingParser(DuckDuckGoParser):
+    """표준 라이브러리 토크나이저로 트리 없이 추출"""
+
+    def __init__(self, limit: int):
+        super().__init__(limit)
+        self._tokenizer = _ResultTokenizer(self._add)
+
+    def feed(self, data: str) -> bool:
+        if not self.done:
+            self._tokenizer.feed(data)
+        return self.done
+
+    def close(self) -> List[Dict]:
+        if not self.done:
+            self._tokenizer.close()
+        return super().close()
+
+
+PARSER_BACKENDS = {
+    "bs4": BeautifulSoupParser,
+    "lxml": LxmlParser,
+    "stream": StreamingParser,
+}
+
+
+def create_parser(backend: str, limit: int) -> DuckDuckGoParser:
+    """
+    이름으로 파서를 생성합니다.
+    lxml을 쓸 수 없으면 stream 백엔드로 대체합니다.
+
+    Args:
+        backend: "lxml", "stream", "bs4" 중 하나
+        limit: 추출할 최대 결과 수
+
+    Returns:
+        DuckDuckGoParser
+    """
+    if backend not in PARSER_BACKENDS:
+        raise ValueError(f"Unknown DuckDuckGo parser backend: {backend}")
+    if backend == "lxml" and etree is None:
+        backend = "stream"
+    return PARSER_BACKENDS[backend](limit)
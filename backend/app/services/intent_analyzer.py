@@ -2,23 +2,45 @@
 의도 파악 엔진
 사용자의 쿼리를 분석하여 의도, 키워드, 대상 독자 등을 파악합니다.
 """
-import httpx
+from typing import List
 from ..config import settings
 from ..models.schemas import IntentAnalysisResult, IntentCategory, OutputType
-import json
+from .llm_client import llm_client
+from .intent_cache import IntentCache, normalize_korean_query
+from .intent_classifier import IntentClassifier
+from .singleflight import SingleFlight
+from .json_stream import extract_json
+from .metrics import FALLBACKS, STAGE_SECONDS
+from .tracing import tracer
 
 
 class IntentAnalyzer:
     """사용자 의도 분석기"""
 
     def __init__(self):
-        self.api_key = settings.google_gemini_api_key
-        self.model = settings.gemini_model
-        self.api_url = settings.gemini_api_url
+        # 유사 쿼리까지 재사용하는 분석 결과 캐시
+        self.cache = (
+            IntentCache(
+                max_entries=settings.intent_cache_max_entries,
+                ttl=settings.intent_cache_ttl,
+                similarity_threshold=settings.intent_cache_similarity_threshold,
+            )
+            if settings.intent_cache_enabled
+            else None
+        )
+
+        # 확실한 쿼리는 Gemini 없이 처리하는 로컬 분류기
+        self.classifier = IntentClassifier()
+        self.fast_path_hits = 0
+
+        # 동시에 들어온 동일 쿼리는 하나의 LLM 호출을 공유
+        self.inflight = SingleFlight(enabled=settings.singleflight_enabled)
 
     async def analyze(self, user_query: str) -> IntentAnalysisResult:
         """
         사용자 쿼리를 분석하여 의도를 파악합니다.
+        캐시에 같거나 유사한 쿼리가 있거나, 로컬 분류기의 신뢰도가
+        임계값 이상이면 LLM 호출 없이 반환합니다.
 
         Args:
             user_query: 사용자 입력 쿼리
@@ -26,6 +48,56 @@ class IntentAnalyzer:
         Returns:
             IntentAnalysisResult: 분석된 의도 결과
         """
+        with tracer.span("intent.analyze") as span:
+            if self.cache is not None:
+                cached = self.cache.get(user_query)
+                if cached is not None:
+                    span.set(source="cache")
+                    return cached.model_copy(deep=True)
+
+            if settings.intent_fast_path_enabled:
+                local = self.classifier.classify(user_query)
+                if local.confidence >= settings.intent_fast_path_threshold:
+                    self.fast_path_hits += 1
+                    span.set(source="fast_path", confidence=local.confidence)
+                    return local
+
+            flight_key = normalize_korean_query(user_query) or user_query
+            try:
+                result = await self.inflight.do(
+                    flight_key, lambda: self._analyze_with_llm(user_query)
+                )
+            except Exception as e:
+                # 에러 발생 시 기본값 반환 (캐시하지 않음)
+                print(f"Intent analysis error: {e}")
+                FALLBACKS.inc("default_intent")
+                span.set(source="default")
+                return IntentAnalysisResult(
+                    primary_intent=IntentCategory.INFO_SEARCH,
+                    keywords=[user_query],
+                    target_audience="일반 사용자",
+                    output_type=OutputType.GUIDE,
+                    domain="일반",
+                    confidence=0.5,
+                )
+
+            span.set(source="llm")
+            if self.cache is not None:
+                self.cache.set(user_query, result)
+            return result.model_copy(deep=True)
+
+    def quick_keywords(self, user_query: str) -> List[str]:
+        """LLM 없이 쿼리에서 핵심 키워드를 바로 추출합니다 (추측 검색용)."""
+        return self.classifier.extract_keywords(user_query)
+
+    def cache_stats(self) -> dict:
+        """의도 분석 캐시 카운터를 반환합니다."""
+        if self.cache is None:
+            return {"enabled": False, "fast_path_hits": self.fast_path_hits}
+        return {"enabled": True, **self.cache.stats(), "fast_path_hits": self.fast_path_hits}
+
+    async def _analyze_with_llm(self, user_query: str) -> IntentAnalysisResult:
+        """Gemini로 의도를 분석합니다. 실패 시 예외를 그대로 전달합니다."""
 
         prompt = f"""
 다음 사용자 쿼리를 분석하여 의도를 파악해주세요.
@@ -51,61 +123,20 @@ class IntentAnalyzer:
 JSON만 반환하고 다른 설명은 하지 마세요.
 """
 
-        try:
-            async with httpx.AsyncClient() as client:
-                url = f"{self.api_url}/{self.model}:generateContent?key={self.api_key}"
-
-                payload = {
-                    "contents": [{
-                        "parts": [{
-                            "text": prompt
-                        }]
-                    }],
-                    "generationConfig": {
-                        "temperature": 0.3,
-                        "maxOutputTokens": 1024,
-                    }
-                }
-
-                response = await client.post(url, json=payload, timeout=30.0)
-                response.raise_for_status()
-
-                result = response.json()
-
-                # Gemini 응답에서 텍스트 추출
-                text = result['candidates'][0]['content']['parts'][0]['text']
-
-                # JSON 추출 (마크다운 코드 블록 제거)
-                text = text.strip()
-                if text.startswith('```json'):
-                    text = text[7:]
-                if text.startswith('```'):
-                    text = text[3:]
-                if text.endswith('```'):
-                    text = text[:-3]
-                text = text.strip()
-
-                # JSON 파싱
-                result_dict = json.loads(text)
-
-            # IntentAnalysisResult 객체로 변환
-            return IntentAnalysisResult(
-                primary_intent=IntentCategory(result_dict["primary_intent"]),
-                keywords=result_dict["keywords"],
-                target_audience=result_dict["target_audience"],
-                output_type=OutputType(result_dict["output_type"]),
-                domain=result_dict["domain"],
-                confidence=result_dict["confidence"],
+        with tracer.span("intent_llm"), STAGE_SECONDS.time("intent_llm"):
+            text = await llm_client.generate_content(
+                prompt, temperature=0.3, max_output_tokens=1024, timeout=30.0
             )
 
-        except Exception as e:
-            # 에러 발생 시 기본값 반환
-            print(f"Intent analysis error: {e}")
-            return IntentAnalysisResult(
-                primary_intent=IntentCategory.INFO_SEARCH,
-                keywords=[user_query],
-                target_audience="일반 사용자",
-                output_type=OutputType.GUIDE,
-                domain="일반",
-                confidence=0.5,
-            )
+        # JSON 추출 (마크다운 코드 블록 제거) 및 파싱
+        result_dict = extract_json(text)
+
+        # IntentAnalysisResult 객체로 변환
+        return IntentAnalysisResult(
+            primary_intent=IntentCategory(result_dict["primary_intent"]),
+            keywords=result_dict["keywords"],
+            target_audience=result_dict["target_audience"],
+            output_type=OutputType(result_dict["output_type"]),
+            domain=result_dict["domain"],
+            confidence=result_dict["confidence"],
+        )
@@ -0,0 +1,243 @@
+"""
+의도 분석 캐시
+한국어 쿼리를 정규화하고 문자 n-gram 유사도 인덱스로
+표현만 조금 다른 쿼리도 같은 분석 결과를 재사용합니다.
+"""
+import math
+import re
+import unicodedata
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from ..models.schemas import IntentAnalysisResult
+from .cache import TTLCache
+
+
+# 쿼리 끝에 붙는 요청 표현 (긴 것부터 제거)
+REQUEST_SUFFIXES = sorted(
+    [
+        "추천해주세요", "추천해줘요", "추천해줘", "추천해", "추천 부탁드립니다",
+        "추천 부탁해요", "추천 부탁해", "알려주세요", "알려줘요", "알려줘",
+        "작성해주세요", "작성해줘요", "작성해줘", "써주세요", "써줘요", "써줘",
+        "만들어주세요", "만들어줘요", "만들어줘", "정리해주세요", "정리해줘",
+        "해주세요", "해줘요", "해줘", "부탁드립니다", "부탁드려요", "부탁해요",
+        "부탁해", "주세요", "줘", "좀",
+    ],
+    key=len,
+    reverse=True,
+)
+
+# 토큰 끝 조사 (긴 것부터 제거)
+PARTICLES = sorted(
+    [
+        "에서는", "에게서", "으로는", "에서", "에게", "한테", "으로", "까지",
+        "부터", "처럼", "보다", "이랑", "하고", "에는", "과", "와", "은",
+        "는", "을", "를", "이", "가", "에", "의", "로", "랑",
+    ],
+    key=len,
+    reverse=True,
+)
+
+# 의미 없는 토큰
+STOPWORDS = {"좀", "관련", "대한", "대해", "대해서", "관한", "그", "저", "꼭", "한번"}
+
+# 숫자 뒤에 붙는 단위 ("3 박" → "3박")
+COUNTER_UNITS = "박|일|월|년|시간|분|초|개월|개|명|살|대|주|회|가지|번|원|만원|층|위|편|권|곳"
+
+_PUNCT_RE = re.compile(r"[^\w\s]")
+_UNIT_JOIN_RE = re.compile(rf"(\d)\s+(?=(?:{COUNTER_UNITS}))")
+_DIGIT_SPLIT_RE = re.compile(r"(?<=[^\d\s])(?=\d)")
+
+
+def _strip_particle(token: str) -> str:
+    for particle in PARTICLES:
+        # 조사를 떼어도 두 글자 이상 남는 경우에만 제거
+        if token.endswith(particle) and len(token) - len(particle) >= 2:
+            return token[: -len(particle)]
+    return token
+
+
+def normalize_korean_query(query: str) -> str:
+    """
+    한국어 쿼리를 캐시 키로 정규화합니다.
+
+    - 유니코드 정규화, 소문자, 문장부호 제거
+    - 숫자/단위 띄어쓰기 통일 ("3박4일", "3 박 4 일" → "3박 4일")
+    - 끝의 요청 표현 제거 ("추천해줘", "알려주세요" 등)
+    - 토큰 끝 조사 및 불용어 제거
+
+    Args:
+        query: 사용자 쿼리
+
+    Returns:
+        정규화된 쿼리
+    """
+    text = unicodedata.normalize("NFKC", query).lower()
+    text = _PUNCT_RE.sub(" ", text)
+    text = _UNIT_JOIN_RE.sub(r"\1", text)
+    text = _DIGIT_SPLIT_RE.sub(" ", text)
+    text = " ".join(text.split())
+
+    # 요청 표현은 여러 개가 이어질 수 있으므로 더 이상 없을 때까지 제거
+    stripped = True
+    while stripped and text:
+        stripped = False
+        for suffix in REQUEST_SUFFIXES:
+            if text.endswith(suffix) and len(text) > len(suffix):
+                text = text[: -len(suffix)].rstrip()
+                stripped = True
+                break
+
+    tokens = [_strip_particle(t) for t in text.split() if t not in STOPWORDS]
+    return " ".join(t for t in tokens if t)
+
+
+def char_ngrams(text: str, n: int = 2) -> FrozenSet[str]:
+    """공백을 제외한 문자 n-gram 집합을 반환합니다."""
+    compact = text.replace(" ", "")
+    if len(compact) < n:
+        return frozenset([compact]) if compact else frozenset()
+    return frozenset(compact[i:i + n] for i in range(len(compact) - n + 1))
+
+
+def _tokens_compatible(a: str, b: str) -> bool:
+    """
+    모든 토큰이 상대 쪽에 같거나 접두어 관계인 토큰을 갖는지 확인합니다.
+    숫자가 들어간 토큰은 정확히 일치해야 합니다.
+    ("제주도"/"제주"는 허용, "강남"/"강북", "3박"/"30박"은 거부)
+    """
+    tokens_a, tokens_b = a.split(), b.split()
+
+    def matches(s: str, d: str) -> bool:
+        if s == d:
+            return True
+        if any(ch.isdigit() for ch in s + d):
+            return False
+        return s.startswith(d) or d.startswith(s)
+
+    def covered(src: List[str], dst: List[str]) -> bool:
+        return all(any(matches(s, d) for d in dst) for s in src)
+
+    return covered(tokens_a, tokens_b) and covered(tokens_b, tokens_a)
+
+
+class IntentCache:
+    """정규화 키 + n-gram 유사도 기반 의도 분석 캐시"""
+
+    def __init__(
+        self,
+        max_entries: int = 4096,
+        ttl: float = 3600.0,
+        similarity_threshold: float = 0.8,
+        ngram_size: int = 2,
+    ):
+        self.similarity_threshold = similarity_threshold
+        self.ngram_size = ngram_size
+
+        self._store = TTLCache(
+            max_entries=max_entries,
+            max_bytes=64 * 1024 * 1024,
+            ttl=ttl,
+            on_evict=self._unindex,
+        )
+        # n-gram → 정규화 키 집합 (역색인)
+        self._index: Dict[str, set] = {}
+        self._grams: Dict[str, FrozenSet[str]] = {}
+
+        self.exact_hits = 0
+        self.similar_hits = 0
+        self.misses = 0
+
+    def _unindex(self, key: str, value: IntentAnalysisResult) -> None:
+        for gram in self._grams.pop(key, ()):
+            keys = self._index.get(gram)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._index[gram]
+
+    def find_similar(self, normalized: str) -> Optional[Tuple[str, float]]:
+        """
+        임계값 이상으로 유사한 캐시 키를 찾습니다.
+
+        Args:
+            normalized: 정규화된 쿼리
+
+        Returns:
+            (키, Dice 유사도) 또는 None
+        """
+        grams = char_ngrams(normalized, self.ngram_size)
+        if not grams:
+            return None
+
+        # 접두 필터링: Dice >= t 이려면 공유 n-gram 수가 t*a/(2-t) 이상이어야 하므로
+        # 가장 드문 n-gram 중 (a - 최소 공유 수 + 1)개 안에 반드시 하나는 겹친다.
+        t = self.similarity_threshold
+        size = len(grams)
+        min_overlap = max(1, math.ceil(t * size / (2.0 - t)))
+        ordered = sorted(grams, key=lambda g: len(self._index.get(g, ())))
+        candidates = set()
+        for gram in ordered[: size - min_overlap + 1]:
+            candidates.update(self._index.get(gram, ()))
+
+        best: Optional[Tuple[str, float]] = None
+        for key in candidates:
+            other = self._grams[key]
+            # 길이 상한으로 먼저 걸러낸 뒤 실제 교집합 계산
+            if 2.0 * min(size, len(other)) / (size + len(other)) < t:
+                continue
+            score = 2.0 * len(grams & other) / (size + len(other))
+            if score < self.similarity_threshold:
+                continue
+            if best is not None and score <= best[1]:
+                continue
+            if _tokens_compatible(normalized, key):
+                best = (key, score)
+        return best
+
+    def get(self, query: str) -> Optional[IntentAnalysisResult]:
+        """정확히 같거나 유사한 쿼리의 분석 결과를 반환합니다."""
+        normalized = normalize_korean_query(query)
+        if not normalized:
+            return None
+
+        if normalized in self._store:
+            self.exact_hits += 1
+            return self._store.get(normalized)
+
+        match = self.find_similar(normalized)
+        result = self._store.get(match[0]) if match is not None else None
+        if result is None:
+            self.misses += 1
+        else:
+            self.similar_hits += 1
+        return result
+
+    def set(self, query: str, result: IntentAnalysisResult) -> None:
+        """분석 결과를 저장하고 n-gram 인덱스에 등록합니다."""
+        normalized = normalize_korean_query(query)
+        if not normalized:
+            return
+
+        self._store.set(normalized, result)
+        if normalized not in self._store:
+            return
+
+        grams = char_ngrams(normalized, self.ngram_size)
+        self._grams[normalized] = grams
+        for gram in grams:
+            self._index.setdefault(gram, set()).add(normalized)
+
+    def stats(self) -> Dict:
+        """캐시 카운터를 반환합니다."""
+        store = self._store.stats()
+        hits = self.exact_hits + self.similar_hits
+        lookups = hits + self.misses
+        return {
+            "entries": store["entries"],
+            "bytes": store["bytes"],
+            "evictions": store["evictions"],
+            "exact_hits": self.exact_hits,
+            "similar_hits": self.similar_hits,
+            "misses": self.misses,
+            "hit_ratio": hits / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,121 @@
+"""
+로컬 의도 분류기
+어휘 규칙(app/data/intent_lexicon.json)으로 의도/형식/분야를 판별하고,
+보정된 신뢰도가 충분히 높으면 Gemini 호출 없이 결과를 만듭니다.
+"""
+import json
+import math
+import unicodedata
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from ..models.schemas import IntentAnalysisResult, IntentCategory, OutputType
+from .intent_cache import normalize_korean_query
+
+
+DEFAULT_LEXICON_PATH = Path(__file__).resolve().parent.parent / "data" / "intent_lexicon.json"
+
+
+def _term_matches(term: str, text: str, tokens: List[str]) -> bool:
+    """'='로 시작하는 용어는 토큰 완전 일치, 나머지는 부분 문자열 일치"""
+    if term.startswith("="):
+        return term[1:] in tokens
+    return term in text
+
+
+class IntentClassifier:
+    """어휘 규칙 기반 의도 분류기"""
+
+    def __init__(self, lexicon_path: Optional[Path] = None):
+        self.lexicon_path = Path(lexicon_path or DEFAULT_LEXICON_PATH)
+        with open(self.lexicon_path, encoding="utf-8") as f:
+            lexicon = json.load(f)
+
+        self.output_types: Dict[str, List[str]] = lexicon["output_types"]
+        self.intents: Dict[str, List[str]] = lexicon["intents"]
+        self.domains: Dict[str, List[str]] = lexicon["domains"]
+        self.audiences: Dict[str, List[str]] = lexicon["audiences"]
+        self.format_terms = set(lexicon["format_terms"])
+        self.calibration_a = lexicon["calibration"]["a"]
+        self.calibration_b = lexicon["calibration"]["b"]
+
+    @staticmethod
+    def _score_labels(
+        labels: Dict[str, List[str]], text: str, tokens: List[str]
+    ) -> Tuple[Optional[str], float]:
+        """
+        레이블별로 일치한 용어 길이를 합산해 최고 레이블과 그 우세도를 반환합니다.
+        우세도 = 1위 점수 / (1위 + 2위 점수), 일치가 없으면 (None, 0.0)
+        """
+        scores = []
+        for label, terms in labels.items():
+            score = sum(len(t.lstrip("=")) for t in terms if _term_matches(t, text, tokens))
+            if score:
+                scores.append((score, label))
+        if not scores:
+            return None, 0.0
+
+        scores.sort(key=lambda x: -x[0])
+        top = scores[0][0]
+        second = scores[1][0] if len(scores) > 1 else 0
+        return scores[0][1], top / (top + second)
+
+    def raw_score(self, query: str) -> Tuple[Dict[str, Optional[str]], float]:
+        """
+        쿼리의 레이블 추정값과 보정 전 점수(0~3)를 반환합니다.
+        점수는 형식/의도/분야 각각의 우세도 합입니다.
+        """
+        text = unicodedata.normalize("NFKC", query).lower()
+        tokens = text.split()
+
+        output_type, ot_margin = self._score_labels(self.output_types, text, tokens)
+        intent, intent_margin = self._score_labels(self.intents, text, tokens)
+        domain, domain_margin = self._score_labels(self.domains, text, tokens)
+        audience, _ = self._score_labels(self.audiences, text, tokens)
+
+        labels = {
+            "output_type": output_type,
+            "primary_intent": intent,
+            "domain": domain,
+            "target_audience": audience,
+        }
+        return labels, ot_margin + intent_margin + domain_margin
+
+    def calibrate(self, raw: float) -> float:
+        """Platt 스케일링으로 보정 전 점수를 정답 확률로 변환합니다."""
+        return 1.0 / (1.0 + math.exp(-(self.calibration_a * raw + self.calibration_b)))
+
+    def extract_keywords(self, query: str, limit: int = 5) -> List[str]:
+        """형식 용어와 불용어를 뺀 핵심 키워드를 추출합니다."""
+        keywords: List[str] = []
+        for token in normalize_korean_query(query).split():
+            if token in self.format_terms:
+                continue
+            # "3박 4일"처럼 나뉜 숫자 토큰은 다시 붙임
+            if keywords and token[0].isdigit() and keywords[-1][0].isdigit():
+                keywords[-1] += token
+                continue
+            if token not in keywords:
+                keywords.append(token)
+        return keywords[:limit] or [query]
+
+    def classify(self, query: str) -> IntentAnalysisResult:
+        """
+        쿼리를 분류합니다. 판별하지 못한 항목은 기본값으로 채우고
+        그만큼 신뢰도가 낮아집니다.
+
+        Args:
+            query: 사용자 쿼리
+
+        Returns:
+            IntentAnalysisResult: 보정된 신뢰도를 포함한 분류 결과
+        """
+        labels, raw = self.raw_score(query)
+        return IntentAnalysisResult(
+            primary_intent=IntentCategory(labels["primary_intent"] or IntentCategory.INFO_SEARCH.value),
+            keywords=self.extract_keywords(query),
+            target_audience=labels["target_audience"] or "일반 사용자",
+            output_type=OutputType(labels["output_type"] or OutputType.GUIDE.value),
+            domain=labels["domain"] or "일반",
+            confidence=round(self.calibrate(raw), 4),
+        )
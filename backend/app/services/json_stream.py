@@ -0,0 +1,156 @@
+"""
+LLM 응답 JSON 파싱
+마크다운 코드 블록 제거와, 스트리밍 응답에서 배열 항목을
+완성되는 즉시 꺼내는 점진적(incremental) 파서를 제공합니다.
+"""
+import json
+import re
+from typing import Any, Dict, List, Optional
+
+
+def strip_code_fence(text: str) -> str:
+    """JSON 앞뒤의 마크다운 코드 블록(```json ... ```)을 제거합니다."""
+    text = text.strip()
+    if text.startswith('```json'):
+        text = text[7:]
+    if text.startswith('```'):
+        text = text[3:]
+    if text.endswith('```'):
+        text = text[:-3]
+    return text.strip()
+
+
+def extract_json(text: str) -> Any:
+    """LLM 응답 텍스트에서 JSON을 파싱합니다."""
+    return json.loads(strip_code_fence(text))
+
+
+def _scan_string(buf: str, i: int) -> Optional[int]:
+    """buf[i]가 '"'일 때 닫는 따옴표 다음 위치를 반환합니다. 미완성이면 None."""
+    j = i + 1
+    while j < len(buf):
+        ch = buf[j]
+        if ch == '\\':
+            j += 2
+            continue
+        if ch == '"':
+            return j + 1
+        j += 1
+    return None
+
+
+def _scan_value(buf: str, i: int) -> Optional[int]:
+    """buf[i]에서 시작하는 JSON 값의 끝 위치를 반환합니다. 미완성이면 None."""
+    ch = buf[i]
+    if ch == '"':
+        return _scan_string(buf, i)
+
+    if ch in '{[':
+        depth = 0
+        j = i
+        while j < len(buf):
+            ch = buf[j]
+            if ch == '"':
+                end = _scan_string(buf, j)
+                if end is None:
+                    return None
+                j = end
+                continue
+            if ch in '{[':
+                depth += 1
+            elif ch in '}]':
+                depth -= 1
+                if depth == 0:
+                    return j + 1
+            j += 1
+        return None
+
+    # 숫자/true/false/null: 구분자가 나올 때까지
+    j = i
+    while j < len(buf) and buf[j] not in ',]}':
+        j += 1
+    return j if j < len(buf) else None
+
+
+class IncrementalJSONArrayParser:
+    """
+    스트리밍 JSON에서 특정 키의 배열 항목을 점진적으로 꺼내는 파서
+
+    예: '{"trends": ["A", "B' 까지 받은 시점에 "A"를 반환하고,
+    이후 '", "C"]...' 를 받으면 "B", "C"를 반환합니다.
+    코드 블록 표기나 앞뒤 잡음은 무시합니다.
+    """
+
+    def __init__(self, key: str):
+        self.key = key
+        self._key_re = re.compile(r'"%s"\s*:\s*\[' % re.escape(key))
+        self._buf = ""
+        self._pos = 0
+        self._in_array = False
+        self._done = False
+        self.items: List[Any] = []
+
+    @property
+    def text(self) -> str:
+        """지금까지 받은 전체 텍스트"""
+        return self._buf
+
+    def feed(self, chunk: str) -> List[Any]:
+        """
+        텍스트 조각을 추가하고 새로 완성된 배열 항목을 반환합니다.
+
+        Args:
+            chunk: 새로 받은 텍스트 조각
+
+        Returns:
+            이번 조각으로 완성된 항목 리스트
+        """
+        self._buf += chunk
+        if self._done:
+            return []
+
+        if not self._in_array:
+            match = self._key_re.search(self._buf)
+            if match is None:
+                return []
+            self._pos = match.end()
+            self._in_array = True
+
+        new_items = []
+        buf = self._buf
+        while self._pos < len(buf):
+            ch = buf[self._pos]
+            if ch in ' \t\r\n,':
+                self._pos += 1
+                continue
+            if ch == ']':
+                self._done = True
+                self._pos += 1
+                break
+
+            end = _scan_value(buf, self._pos)
+            if end is None:
+                break
+            try:
+                item = json.loads(buf[self._pos:end])
+            except ValueError:
+                # 깨진 항목은 건너뜀
+                item = None
+            self._pos = end
+            if item is not None:
+                self.items.append(item)
+                new_items.append(item)
+        return new_items
+
+    def result(self) -> Dict[str, Any]:
+        """
+        전체 텍스트를 파싱합니다.
+        응답이 잘려 JSON이 완성되지 않았다면 지금까지 꺼낸 배열 항목만 담아 반환합니다.
+        """
+        try:
+            parsed = extract_json(self._buf)
+            if isinstance(parsed, dict):
+                return parsed
+        except ValueError:
+            pass
+        return {self.key: list(self.items)}
@@ -0,0 +1,207 @@
+"""
+Gemini API 키 풀
+키마다 자체 할당량(RPM/TPM) 토큰 버킷을 두고, 호출마다 가장 한가한 정상 키로 보냅니다.
+429/403을 받은 키는 일정 시간 격리(quarantine)해 다른 키로 우회합니다.
+"""
+import asyncio
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..config import settings
+from .rate_limiter import RateLimitTimeout, TokenBucketLimiter, current_deadline
+
+
+def parse_api_keys(spec: str) -> List[Tuple[str, Optional[int], Optional[int]]]:
+    """
+    "키[:RPM[:TPM]]"를 쉼표로 나열한 설정값을 파싱합니다.
+    할당량을 생략하면 None(기본 할당량 사용)입니다.
+
+    예: "AIza...a:1000:1000000,AIza...b:15"
+    """
+    keys = []
+    for item in spec.split(","):
+        parts = item.strip().split(":")
+        if not parts[0]:
+            continue
+        rpm = int(parts[1]) if len(parts) > 1 and parts[1] else None
+        tpm = int(parts[2]) if len(parts) > 2 and parts[2] else None
+        keys.append((parts[0], rpm, tpm))
+    return keys
+
+
+class KeyQuarantined(RateLimitTimeout):
+    """모든 키가 격리 중이고 마감 시각 안에 격리가 끝나지 않음"""
+
+
+class ApiKey:
+    """키 하나의 할당량, 격리 상태, 사용량 카운터"""
+
+    def __init__(self, key_id: str, key: str, requests_per_minute: int, tokens_per_minute: int):
+        self.key_id = key_id
+        self.key = key
+        self.limiter = TokenBucketLimiter(requests_per_minute, tokens_per_minute)
+
+        self.inflight = 0
+        self.quarantined_until = 0.0
+
+        self.requests = 0
+        self.successes = 0
+        self.rate_limited = 0
+        self.forbidden = 0
+        self.errors = 0
+        self.quarantines = 0
+        self.tokens_used = 0
+
+    @property
+    def healthy(self) -> bool:
+        return time.monotonic() >= self.quarantined_until
+
+    def load(self) -> Tuple[float, float]:
+        """
+        정렬용 부하 지표 (작을수록 한가함)
+        1순위: 할당량 대비 진행 중 + 대기 중 요청 수, 2순위: 버킷 잔량 비율(클수록 우선)
+        """
+        limiter = self.limiter
+        stats = limiter.stats()
+        capacity = max(limiter.requests_per_minute, 1)
+        busy = (self.inflight + stats["waiting"]) / capacity
+        if limiter.requests_per_minute > 0:
+            available = stats["available_requests"] / limiter.requests_per_minute
+        else:
+            available = 1.0
+        if limiter.tokens_per_minute > 0:
+            available = min(available, stats["available_tokens"] / limiter.tokens_per_minute)
+        return busy, -available
+
+    def quarantine(self, seconds: float) -> None:
+        self.quarantines += 1
+        self.quarantined_until = max(self.quarantined_until, time.monotonic() + seconds)
+        print(f"Gemini key {self.key_id} quarantined for {seconds:.0f}s")
+
+    def stats(self) -> Dict[str, Any]:
+        remaining = max(0.0, self.quarantined_until - time.monotonic())
+        return {
+            "healthy": remaining == 0.0,
+            "quarantine_remaining": round(remaining, 1),
+            "inflight": self.inflight,
+            "requests": self.requests,
+            "successes": self.successes,
+            "rate_limited": self.rate_limited,
+            "forbidden": self.forbidden,
+            "errors": self.errors,
+            "quarantines": self.quarantines,
+            "tokens_used": self.tokens_used,
+            "limiter": self.limiter.stats(),
+        }
+
+
+class GeminiKeyPool:
+    """최소 부하 라우팅과 429/403 격리를 하는 API 키 풀"""
+
+    def __init__(self, keys: List[ApiKey]):
+        if not keys:
+            raise ValueError("Gemini API 키가 하나 이상 필요합니다")
+        self.keys = keys
+
+    @classmethod
+    def from_settings(cls) -> "GeminiKeyPool":
+        """GOOGLE_GEMINI_API_KEYS(없으면 GOOGLE_GEMINI_API_KEY)로 풀을 만듭니다."""
+        specs = parse_api_keys(settings.google_gemini_api_keys)
+        if not specs and settings.google_gemini_api_key:
+            specs = [(settings.google_gemini_api_key, None, None)]
+
+        keys = []
+        for index, (key, rpm, tpm) in enumerate(specs):
+            keys.append(ApiKey(
+                # 키 원문은 노출하지 않고 끝 4자리만 식별용으로 사용
+                key_id=f"key{index}-{key[-4:]}",
+                key=key,
+                requests_per_minute=settings.gemini_requests_per_minute if rpm is None else rpm,
+                tokens_per_minute=settings.gemini_tokens_per_minute if tpm is None else tpm,
+            ))
+        return cls(keys)
+
+    def has_healthy(self, exclude: Optional[ApiKey] = None) -> bool:
+        """exclude 외에 격리되지 않은 키가 있는지 여부"""
+        return any(k.healthy and k is not exclude for k in self.keys)
+
+    def quarantine_remaining(self) -> float:
+        """격리되지 않은 키가 생길 때까지 남은 시간(초, 지금 있으면 0)"""
+        return max(0.0, min(k.quarantined_until for k in self.keys) - time.monotonic())
+
+    def pick(self) -> ApiKey:
+        """
+        가장 한가한 정상 키를 고릅니다.
+        모든 키가 격리 중이면 격리가 가장 먼저 끝나는 키를 고릅니다.
+        """
+        healthy = [k for k in self.keys if k.healthy]
+        if not healthy:
+            return min(self.keys, key=lambda k: k.quarantined_until)
+        return min(healthy, key=ApiKey.load)
+
+    async def acquire(self, tokens: int, deadline: Optional[float] = None) -> ApiKey:
+        """
+        키를 골라 그 키의 속도 제한 슬롯을 예약하고 진행 중으로 표시합니다.
+        모든 키가 격리 중이면 격리가 가장 먼저 끝나는 키를 그때까지 기다립니다.
+        호출이 끝나면 release()를 호출해야 합니다.
+
+        Args:
+            tokens: 예약할 토큰 수
+            deadline: 대기 마감 시각 (기본값: 현재 컨텍스트의 마감 시각)
+
+        Returns:
+            예약한 ApiKey
+
+        Raises:
+            KeyQuarantined: 모든 키가 격리 중이고 마감 시각 안에 풀리지 않을 때
+            RateLimitTimeout: 마감 시각 안에 예약하지 못했을 때
+        """
+        deadline = current_deadline() if deadline is None else deadline
+        key = self.pick()
+        while not key.healthy:
+            # 모든 키가 격리 중: 격리가 끝나기 전에는 같은 키로 보내지 않음
+            if deadline is not None and key.quarantined_until >= deadline:
+                raise KeyQuarantined(
+                    f"Gemini API keys quarantined for "
+                    f"{key.quarantined_until - time.monotonic():.0f}s"
+                )
+            await asyncio.sleep(key.quarantined_until - time.monotonic())
+            key = self.pick()
+        key.inflight += 1
+        try:
+            await key.limiter.acquire(tokens, deadline=deadline)
+        except BaseException:
+            key.inflight -= 1
+            raise
+        key.requests += 1
+        return key
+
+    def release(self, key: ApiKey, status: Optional[int] = None, tokens_used: int = 0) -> None:
+        """
+        호출 결과를 기록합니다. 429/403이면 키를 격리합니다.
+
+        Args:
+            key: acquire()로 받은 키
+            status: 실패한 경우 HTTP 상태 코드 (성공이면 None, 상태 코드 없는 오류면 0)
+            tokens_used: 실제 사용 토큰 수
+        """
+        key.inflight -= 1
+        key.tokens_used += tokens_used
+        if status is None:
+            key.successes += 1
+        elif status == 429:
+            key.rate_limited += 1
+            key.quarantine(settings.gemini_key_quarantine)
+        elif status == 403:
+            key.forbidden += 1
+            key.quarantine(settings.gemini_key_forbidden_quarantine)
+        else:
+            key.errors += 1
+
+    def cancel(self, key: ApiKey) -> None:
+        """결과 없이 끝난(취소된) 호출의 진행 중 표시를 해제합니다."""
+        key.inflight -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        """키별 사용량 카운터를 반환합니다."""
+        return {key.key_id: key.stats() for key in self.keys}
@@ -0,0 +1,66 @@
+"""
+지연 시간 히스토그램
+최근 N개 요청의 지연 시간을 로그 스케일 버킷에 모아 분위수를 추정합니다.
+헤지(hedged) 검색의 대기 시간을 업스트림별로 정하는 데 사용합니다.
+"""
+import bisect
+import math
+from collections import deque
+from typing import Deque, Dict, List
+
+
+def _log_buckets(low: float, high: float, per_decade: int) -> List[float]:
+    """low~high 구간을 10배마다 per_decade개로 나눈 버킷 상한 목록"""
+    count = int(math.ceil(math.log10(high / low) * per_decade))
+    return [low * 10 ** (i / per_decade) for i in range(count + 1)]
+
+
+# 1ms ~ 60s, 10배마다 20개 버킷 (버킷 간 약 12% 간격)
+DEFAULT_BUCKETS = _log_buckets(0.001, 60.0, 20)
+
+
+class LatencyHistogram:
+    """최근 window개 관측값에 대한 롤링 히스토그램"""
+
+    def __init__(self, window: int = 200, buckets: List[float] = DEFAULT_BUCKETS):
+        self.window = window
+        self.bounds = buckets
+        self._counts = [0] * (len(buckets) + 1)  # 마지막 칸은 상한 초과
+        self._recent: Deque[int] = deque()
+
+    @property
+    def count(self) -> int:
+        return len(self._recent)
+
+    def record(self, seconds: float) -> None:
+        """관측값을 추가하고, 창을 벗어난 가장 오래된 값은 뺍니다."""
+        index = bisect.bisect_left(self.bounds, seconds)
+        self._counts[index] += 1
+        self._recent.append(index)
+        if len(self._recent) > self.window:
+            self._counts[self._recent.popleft()] -= 1
+
+    def quantile(self, q: float) -> float:
+        """
+        q 분위수의 추정값(해당 버킷 상한)을 반환합니다.
+        관측값이 없으면 0.0을 반환합니다.
+        """
+        total = len(self._recent)
+        if not total:
+            return 0.0
+        rank = q * total
+        seen = 0
+        for index, bucket_count in enumerate(self._counts):
+            seen += bucket_count
+            if seen >= rank and bucket_count:
+                return self.bounds[min(index, len(self.bounds) - 1)]
+        return self.bounds[-1]
+
+    def stats(self) -> Dict[str, float]:
+        """관측 수와 주요 분위수를 반환합니다."""
+        return {
+            "count": self.count,
+            "p50": round(self.quantile(0.5), 4),
+            "p90": round(self.quantile(0.9), 4),
+            "p99": round(self.quantile(0.99), 4),
+        }
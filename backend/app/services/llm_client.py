@@ -0,0 +1,377 @@
+"""
+공유 LLM 클라이언트
+앱 수명 동안 하나의 커넥션 풀(HTTP/2, keep-alive)을 유지하며
+Gemini 호출과 웹 검색 요청이 이를 함께 사용합니다.
+"""
+import asyncio
+import itertools
+import json
+import os
+import random
+import time
+import urllib.parse
+from typing import AsyncIterator, Optional
+
+import httpx
+
+from ..config import settings
+from .cassette import build_transport
+from .circuit_breaker import get_breaker
+from .key_pool import ApiKey, GeminiKeyPool
+from .rate_limiter import current_deadline, estimate_tokens
+from .metrics import UPSTREAM_RESPONSES, upstream_of
+from .tracing import tracer
+
+
+# 부팅 시 DNS/TLS 워밍업 대상 (부하 테스트에서는 로컬 가짜 서버로 교체)
+BRAVE_SEARCH_URL = settings.brave_search_url
+DUCKDUCKGO_SEARCH_URL = settings.duckduckgo_search_url
+
+
+def _status_of(error: BaseException) -> Optional[int]:
+    """HTTP 상태 오류의 상태 코드 (그 외 예외는 None)"""
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code
+    return None
+
+
+class LLMClient:
+    """앱 수명 동안 공유되는 HTTP 클라이언트"""
+
+    def __init__(self):
+        self.model = settings.gemini_model
+        self.api_url = settings.gemini_api_url
+        self._client: Optional[httpx.AsyncClient] = None
+        # 녹화/재생 중인 cassette transport (CASSETTE_MODE=off면 None)
+        self.cassette: Optional[httpx.AsyncBaseTransport] = None
+        # 429/403은 키 단위 문제이므로 키 풀이 격리로 처리하고 회로 실패로 세지 않음
+        self.breaker = get_breaker("gemini", failure_status={408})
+        self.keys = GeminiKeyPool.from_settings()
+
+    def _build_client(self) -> httpx.AsyncClient:
+        """
+        커넥션 풀 설정으로 AsyncClient를 생성합니다.
+        CASSETTE_MODE가 record/replay면 녹화/재생 transport를 끼웁니다.
+        """
+        limits = httpx.Limits(
+            max_connections=settings.http_max_connections,
+            max_keepalive_connections=settings.http_max_keepalive_connections,
+            keepalive_expiry=settings.http_keepalive_expiry,
+        )
+        self.cassette = None
+        if settings.cassette_mode != "off":
+            directory = os.path.dirname(settings.cassette_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self.cassette = build_transport(
+                settings.cassette_mode,
+                settings.cassette_path,
+                httpx.AsyncHTTPTransport(http2=settings.http2_enabled, limits=limits),
+                settings.cassette_replay_timing,
+            )
+        return httpx.AsyncClient(
+            http2=settings.http2_enabled,
+            limits=limits,
+            timeout=httpx.Timeout(30.0, connect=settings.http_connect_timeout),
+            event_hooks={"response": [self._count_response]},
+            transport=self.cassette,
+        )
+
+    @staticmethod
+    async def _count_response(response: httpx.Response) -> None:
+        """업스트림별 응답 상태 코드를 셉니다 (헤더 수신 시점)."""
+        UPSTREAM_RESPONSES.inc(
+            upstream_of(response.request.url.netloc.decode("ascii")),
+            str(response.status_code),
+        )
+
+    @property
+    def http(self) -> httpx.AsyncClient:
+        """
+        공유 AsyncClient를 반환합니다.
+        lifespan 밖(스크립트 등)에서 호출되면 지연 생성합니다.
+        """
+        if self._client is None or self._client.is_closed:
+            self._client = self._build_client()
+        return self._client
+
+    async def start(self) -> None:
+        """클라이언트를 생성하고 업스트림 연결을 미리 맺어둡니다."""
+        client = self.http
+        # 녹화/재생 중에는 워밍업 요청을 보내지 않음 (cassette에 섞이지 않도록)
+        if settings.http_warmup and settings.cassette_mode == "off":
+            await self.warmup(client)
+
+    async def close(self) -> None:
+        """커넥션 풀을 정리합니다."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def warmup(self, client: httpx.AsyncClient) -> None:
+        """
+        DNS 조회와 TCP/TLS 핸드셰이크를 부팅 시점에 끝내 둡니다.
+        응답 상태는 중요하지 않으며, 실패해도 부팅을 막지 않습니다.
+        """
+        origins = [self.api_url, DUCKDUCKGO_SEARCH_URL]
+        if settings.brave_search_api_key:
+            origins.append(BRAVE_SEARCH_URL)
+
+        async def touch(origin: str) -> None:
+            parsed = urllib.parse.urlsplit(origin)
+            try:
+                await client.head(
+                    f"{parsed.scheme}://{parsed.netloc}/",
+                    timeout=settings.http_connect_timeout,
+                )
+            except Exception as e:
+                print(f"Warm-up error ({parsed.netloc}): {e}")
+
+        await asyncio.gather(*(touch(origin) for origin in origins))
+
+    def _call_deadline(self, timeout: float) -> float:
+        """요청 마감 시각과 호출 타임아웃 중 이른 시각을 반환합니다."""
+        end = time.monotonic() + timeout
+        deadline = current_deadline()
+        return end if deadline is None else min(end, deadline)
+
+    def _retry_delay(self, error: BaseException, attempt: int, end: float) -> Optional[float]:
+        """
+        429/403 응답을 재시도할 대기 시간을 반환합니다.
+        격리되지 않은 다른 키가 있으면 바로(0초) 그 키로 재시도합니다.
+        없으면 429만 지수 백오프에 지터를 더해 기다리고, Retry-After 헤더나 키 격리가 더 길면 그것을 따릅니다.
+        재시도 횟수를 넘었거나 마감 시각 안에 다시 시도할 수 없으면 None.
+        """
+        status = _status_of(error)
+        if status not in (403, 429) or attempt >= settings.gemini_max_retries:
+            return None
+        if self.keys.has_healthy():
+            return 0.0
+        if status != 429:
+            return None
+
+        backoff = min(
+            settings.gemini_retry_max_delay,
+            settings.gemini_retry_base_delay * (2 ** attempt),
+        )
+        delay = backoff / 2 + random.uniform(0, backoff / 2)
+        try:
+            delay = max(delay, float(error.response.headers.get("retry-after", 0)))
+        except ValueError:
+            pass
+        # 격리가 풀리기 전에는 어느 키로도 다시 보낼 수 없음
+        delay = max(delay, self.keys.quarantine_remaining())
+
+        if time.monotonic() + delay >= end:
+            return None
+        return delay
+
+    @staticmethod
+    async def _wait_retry(key: ApiKey, error: BaseException, delay: float, attempt: int) -> None:
+        """재시도 전 로그를 남기고 필요한 만큼 기다립니다."""
+        if delay:
+            print(f"Gemini {_status_of(error)} on {key.key_id}, "
+                  f"retrying in {delay:.2f}s (attempt {attempt + 1})")
+            await asyncio.sleep(delay)
+        else:
+            print(f"Gemini {_status_of(error)} on {key.key_id}, retrying on another key")
+
+    async def _acquire_key(self, reserved: int, end: float) -> ApiKey:
+        """
+        회로 상태를 먼저 확인한 뒤 키의 속도 제한 슬롯을 예약합니다.
+        회로가 열려 있으면 슬롯을 기다리거나 키 오류로 세지 않고 바로 실패합니다.
+        반환 후에는 호출 결과를 브레이커에 기록(record_success/record_failure/release)해야 합니다.
+
+        Raises:
+            CircuitOpenError: Gemini 회로가 열려 있을 때
+            RateLimitTimeout: 마감 시각 안에 속도 제한 슬롯을 얻지 못했을 때
+        """
+        self.breaker.before_call()
+        try:
+            return await self.keys.acquire(reserved, deadline=end)
+        except BaseException:
+            self.breaker.release()
+            raise
+
+    async def generate_content(
+        self,
+        prompt: str,
+        temperature: float,
+        max_output_tokens: int,
+        timeout: float = 30.0,
+    ) -> str:
+        """
+        Gemini generateContent를 호출하고 응답 텍스트를 반환합니다.
+        가장 한가한 키의 속도 제한 슬롯을 얻은 뒤 호출하며,
+        429/403 응답은 마감 시각 안에서 다른 키로, 또는 백오프 후 재시도합니다.
+
+        Args:
+            prompt: 프롬프트 텍스트
+            temperature: 샘플링 온도
+            max_output_tokens: 최대 출력 토큰 수
+            timeout: 요청 타임아웃(초, 대기와 재시도를 포함한 전체 시간)
+
+        Returns:
+            첫 번째 후보의 텍스트
+
+        Raises:
+            CircuitOpenError: 최근 연속 실패로 Gemini 회로가 열려 있을 때
+            RateLimitTimeout: 마감 시각 안에 속도 제한 슬롯을 얻지 못했을 때
+        """
+        payload = self._build_payload(prompt, temperature, max_output_tokens)
+        reserved = estimate_tokens(prompt, max_output_tokens)
+        end = self._call_deadline(timeout)
+
+        for attempt in itertools.count():
+            # 시도마다 span 하나 (속도 제한 대기 포함, 재시도 백오프 대기 제외)
+            with tracer.span("gemini.generate", attempt=attempt) as span:
+                key = await self._acquire_key(reserved, end)
+                span.set(key_id=key.key_id)
+                url = f"{self.api_url}/{self.model}:generateContent?key={key.key}"
+
+                try:
+                    response = await self.http.post(
+                        url, json=payload, timeout=max(0.1, end - time.monotonic())
+                    )
+                    response.raise_for_status()
+                except Exception as e:
+                    self.breaker.record_failure(e)
+                    key.limiter.adjust(reserved)
+                    self.keys.release(key, status=_status_of(e) or 0)
+                    span.set(status=_status_of(e) or 0)
+                    delay = self._retry_delay(e, attempt, end)
+                    if delay is None:
+                        raise
+                    error = e
+                except BaseException:
+                    self.breaker.release()
+                    key.limiter.adjust(reserved)
+                    self.keys.cancel(key)
+                    raise
+                else:
+                    self.breaker.record_success()
+                    result = response.json()
+                    used = self._settle_tokens(key, reserved, result)
+                    self.keys.release(key, tokens_used=used)
+                    span.set(status=response.status_code, tokens=used)
+
+                    # Gemini 응답에서 텍스트 추출
+                    return result['candidates'][0]['content']['parts'][0]['text']
+
+            await self._wait_retry(key, error, delay, attempt)
+
+    async def stream_generate_content(
+        self,
+        prompt: str,
+        temperature: float,
+        max_output_tokens: int,
+        timeout: float = 30.0,
+    ) -> AsyncIterator[str]:
+        """
+        Gemini streamGenerateContent(SSE)를 호출하고 텍스트 조각을 순서대로 내보냅니다.
+        첫 조각을 내보내기 전의 429/403 응답만 재시도합니다.
+
+        Args:
+            prompt: 프롬프트 텍스트
+            temperature: 샘플링 온도
+            max_output_tokens: 최대 출력 토큰 수
+            timeout: 요청 타임아웃(초, 대기와 재시도를 포함한 전체 시간)
+
+        Yields:
+            생성된 텍스트 조각
+
+        Raises:
+            CircuitOpenError: 최근 연속 실패로 Gemini 회로가 열려 있을 때
+            RateLimitTimeout: 마감 시각 안에 속도 제한 슬롯을 얻지 못했을 때
+        """
+        payload = self._build_payload(prompt, temperature, max_output_tokens)
+        reserved = estimate_tokens(prompt, max_output_tokens)
+        end = self._call_deadline(timeout)
+
+        for attempt in itertools.count():
+            # yield 너머로 현재 span이 새지 않도록 activate=False
+            with tracer.span("gemini.stream", activate=False, attempt=attempt) as span:
+                start = time.perf_counter()
+                key = await self._acquire_key(reserved, end)
+                span.set(key_id=key.key_id)
+                url = (
+                    f"{self.api_url}/{self.model}:streamGenerateContent"
+                    f"?alt=sse&key={key.key}"
+                )
+
+                started = False
+                usage = None
+                try:
+                    async with self.http.stream(
+                        "POST", url, json=payload,
+                        timeout=max(0.1, end - time.monotonic()),
+                    ) as response:
+                        response.raise_for_status()
+                        async for line in response.aiter_lines():
+                            if not line.startswith("data:"):
+                                continue
+                            chunk = json.loads(line[5:].strip())
+                            usage = chunk.get("usageMetadata", usage)
+                            for candidate in chunk.get("candidates", [])[:1]:
+                                for part in candidate.get("content", {}).get("parts", []):
+                                    if part.get("text"):
+                                        if not started:
+                                            started = True
+                                            span.set(first_chunk_ms=round(
+                                                (time.perf_counter() - start) * 1000, 3
+                                            ))
+                                        yield part["text"]
+                except Exception as e:
+                    self.breaker.record_failure(e)
+                    key.limiter.adjust(reserved)
+                    self.keys.release(key, status=_status_of(e) or 0)
+                    span.set(status=_status_of(e) or 0)
+                    delay = None if started else self._retry_delay(e, attempt, end)
+                    if delay is None:
+                        raise
+                    error = e
+                except BaseException:
+                    # 소비자가 스트림을 중간에 닫음(GeneratorExit) 또는 취소
+                    self.breaker.release()
+                    key.limiter.adjust(reserved)
+                    self.keys.cancel(key)
+                    raise
+                else:
+                    self.breaker.record_success()
+                    used = self._settle_tokens(key, reserved, {"usageMetadata": usage or {}})
+                    self.keys.release(key, tokens_used=used)
+                    span.set(status=response.status_code, tokens=used)
+                    return
+
+            await self._wait_retry(key, error, delay, attempt)
+
+    @staticmethod
+    def _settle_tokens(key: ApiKey, reserved: int, result: dict) -> int:
+        """
+        응답의 실제 토큰 사용량으로 키의 예약분을 정산하고 사용량을 반환합니다.
+        사용량 정보가 없으면 예약분을 사용량으로 봅니다.
+        """
+        used = result.get("usageMetadata", {}).get("totalTokenCount")
+        if used is None:
+            return reserved
+        key.limiter.adjust(reserved - int(used))
+        return int(used)
+
+    @staticmethod
+    def _build_payload(prompt: str, temperature: float, max_output_tokens: int) -> dict:
+        """generateContent 요청 본문을 만듭니다."""
+        return {
+            "contents": [{
+                "parts": [{
+                    "text": prompt
+                }]
+            }],
+            "generationConfig": {
+                "temperature": temperature,
+                "maxOutputTokens": max_output_tokens,
+            }
+        }
+
+
+# 전역 클라이언트 인스턴스 (FastAPI lifespan에서 start/close)
+llm_client = LLMClient()
@@ -0,0 +1,260 @@
+"""
+Prometheus 형식 메트릭
+외부 의존성 없이 카운터/히스토그램과, 수집 시점에 값을 읽는 콜백 게이지를 제공합니다.
+기록은 딕셔너리 조회와 덧셈(히스토그램은 이진 탐색 한 번)뿐이라 요청 경로 부담이 거의 없습니다.
+캐시 적중률처럼 이미 다른 곳에서 세고 있는 값은 /metrics 수집 시점에만 읽습니다.
+"""
+import bisect
+import functools
+import inspect
+import time
+import urllib.parse
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Sequence, Tuple
+
+from ..config import settings
+from .tracing import tracer
+
+
+# 100µs ~ 60s (HTML 파싱부터 LLM 호출까지 한 히스토그램에 담기 위한 범위)
+DEFAULT_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{n}="{_escape(str(v))}"' for n, v in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Counter:
+    """단조 증가 카운터"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def get(self, *labels: str) -> float:
+        return self._values.get(labels, 0.0)
+
+    def render(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+            for labels, value in sorted(self._values.items())
+        ]
+
+
+class Histogram:
+    """누적 버킷 히스토그램"""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        # 라벨별 [버킷별 개수..., 상한 초과 개수], 합계
+        self._counts: Dict[LabelValues, List[int]] = {}
+        self._sums: Dict[LabelValues, float] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        counts = self._counts.get(labels)
+        if counts is None:
+            counts = self._counts[labels] = [0] * (len(self.buckets) + 1)
+            self._sums[labels] = 0.0
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        self._sums[labels] += value
+
+    @contextmanager
+    def time(self, *labels: str) -> Iterator[None]:
+        """블록 실행 시간을 기록합니다 (예외로 끝나도 기록)."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *labels)
+
+    def count(self, *labels: str) -> int:
+        return sum(self._counts.get(labels, ()))
+
+    def render(self) -> List[str]:
+        lines = []
+        for labels, counts in sorted(self._counts.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                label_str = _format_labels(
+                    self.labelnames + ("le",), labels + (_format_value(bound),)
+                )
+                lines.append(f"{self.name}_bucket{label_str} {cumulative}")
+            label_str = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_str} {_format_value(self._sums[labels])}")
+            lines.append(f"{self.name}_count{label_str} {cumulative}")
+        return lines
+
+
+class CallbackMetric:
+    """수집 시점에 callback()이 돌려준 {라벨 튜플: 값}을 내보내는 게이지/카운터"""
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str],
+        callback: Callable[[], Dict[LabelValues, float]],
+        kind: str = "gauge",
+    ):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.callback = callback
+        self.kind = kind
+
+    def render(self) -> List[str]:
+        try:
+            values = self.callback()
+        except Exception as e:
+            print(f"Metric collection error ({self.name}): {e}")
+            return []
+        return [
+            f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+            for labels, value in sorted(values.items())
+        ]
+
+
+class MetricsRegistry:
+    """메트릭 모음과 텍스트 형식(0.0.4) 출력"""
+
+    def __init__(self):
+        self._metrics: Dict[str, Any] = {}
+
+    def _register(self, metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"Duplicate metric: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, help, labelnames, buckets))
+
+    def callback(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str],
+        callback: Callable[[], Dict[LabelValues, float]],
+        kind: str = "gauge",
+    ) -> CallbackMetric:
+        """이미 존재하면 콜백만 교체합니다 (앱 재생성 시 중복 등록 방지)."""
+        existing = self._metrics.get(name)
+        if isinstance(existing, CallbackMetric):
+            existing.callback = callback
+            return existing
+        return self._register(CallbackMetric(name, help, labelnames, callback, kind))
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# 전역 레지스트리
+registry = MetricsRegistry()
+
+STAGE_SECONDS = registry.histogram(
+    "app_stage_duration_seconds",
+    "Pipeline stage latency",
+    ["stage"],
+)
+SEARCH_SECONDS = registry.histogram(
+    "app_search_duration_seconds",
+    "Web search latency by provider and outcome (ok, error, circuit_open, cancelled)",
+    ["provider", "outcome"],
+)
+FALLBACKS = registry.counter(
+    "app_fallback_total",
+    "Fallback activations",
+    ["kind"],
+)
+UPSTREAM_RESPONSES = registry.counter(
+    "app_upstream_responses_total",
+    "Upstream responses by status code (error = transport failure, circuit_open = short-circuited)",
+    ["upstream", "status"],
+)
+
+# 업스트림 호스트[:포트] → 메트릭 라벨 (URL 설정을 로컬 가짜 서버로 바꿔도 구분되도록 포트 포함)
+UPSTREAM_HOSTS = {
+    urllib.parse.urlsplit(settings.gemini_api_url).netloc: "gemini",
+    urllib.parse.urlsplit(settings.brave_search_url).netloc: "brave",
+    urllib.parse.urlsplit(settings.duckduckgo_search_url).netloc: "duckduckgo",
+}
+
+
+def upstream_of(netloc: str) -> str:
+    return UPSTREAM_HOSTS.get(netloc, netloc)
+
+
+def timed_stage(stage: str):
+    """
+    함수(동기/비동기) 실행 시간을 app_stage_duration_seconds{stage}에 기록하는 데코레이터
+    추적 중인 요청이면 같은 이름의 span도 남깁니다.
+    """
+
+    def decorator(fn):
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with tracer.span(stage), STAGE_SECONDS.time(stage):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with tracer.span(stage), STAGE_SECONDS.time(stage):
+                return fn(*args, **kwargs)
+        return wrapper
+
+    return decorator
@@ -10,6 +10,7 @@ from ..models.schemas import (
     IntentAnalysisResult,
     TrendResult,
 )
+from .metrics import timed_stage
 
 
 class PromptGenerator:
@@ -24,6 +25,7 @@ class PromptGenerator:
             PromptStrategyType.STRUCTURED: self.generate_structured,
         }
 
+    @timed_stage("prompt_generation")
     async def generate_all(
         self, query: str, trends: TrendResult, intent: IntentAnalysisResult
     ) -> GeneratedPrompts:
@@ -0,0 +1,270 @@
+"""
+Gemini 클라이언트 측 속도 제한
+분당 요청 수(RPM)와 분당 토큰 수(TPM) 두 토큰 버킷으로 호출을 조절합니다.
+대기열은 우선순위 레인으로 나뉘어, 대화형 요청이 배치/백그라운드 작업보다 먼저 나갑니다.
+
+우선순위와 요청 마감 시각은 contextvars로 전달되므로 호출 경로 중간의
+함수 시그니처를 바꿀 필요가 없습니다.
+"""
+import asyncio
+import heapq
+import itertools
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+class Priority(IntEnum):
+    """우선순위 레인 (값이 작을수록 먼저 처리)"""
+    INTERACTIVE = 0  # /api/analyze 등 사용자가 기다리는 요청
+    BATCH = 1  # /api/pipeline/batch
+    BACKGROUND = 2  # 캐시 백그라운드 갱신 등
+
+
+_priority: ContextVar[Priority] = ContextVar("gemini_priority", default=Priority.INTERACTIVE)
+_deadline: ContextVar[Optional[float]] = ContextVar("request_deadline", default=None)
+
+
+@contextmanager
+def request_priority(priority: Priority) -> Iterator[None]:
+    """이 블록 안의 Gemini 호출 우선순위를 지정합니다."""
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+@contextmanager
+def request_deadline(seconds: Optional[float]) -> Iterator[None]:
+    """
+    이 블록 안의 Gemini 호출(대기, 재시도 포함)이 끝나야 하는 시각을 지정합니다.
+    None이면 마감 시각을 해제합니다. 바깥 블록의 마감이 더 이르면 그것을 유지합니다.
+    """
+    deadline = None if seconds is None else time.monotonic() + seconds
+    outer = _deadline.get()
+    if deadline is not None and outer is not None:
+        deadline = min(deadline, outer)
+    token = _deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def current_priority() -> Priority:
+    return _priority.get()
+
+
+def current_deadline() -> Optional[float]:
+    """현재 요청의 마감 시각(time.monotonic 기준). 없으면 None."""
+    return _deadline.get()
+
+
+def estimate_tokens(prompt: str, max_output_tokens: int) -> int:
+    """
+    호출 전 예약할 토큰 수를 추정합니다.
+    입력은 2자당 1토큰(한국어 비중을 고려한 보수적 추정), 출력은 최대치로 잡고
+    응답의 usageMetadata로 나중에 정산합니다.
+    """
+    return len(prompt) // 2 + max_output_tokens
+
+
+class RateLimitTimeout(TimeoutError):
+    """마감 시각 안에 속도 제한 슬롯을 얻지 못함"""
+
+
+class TokenBucketLimiter:
+    """RPM/TPM 토큰 버킷과 우선순위 대기열"""
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.enabled = requests_per_minute > 0 or tokens_per_minute > 0
+
+        # 버킷 용량은 1분치 할당량
+        self._requests = float(requests_per_minute)
+        self._tokens = float(tokens_per_minute)
+        self._updated = time.monotonic()
+
+        # (우선순위, 순번, 토큰 수, future)
+        self._waiters: List[Tuple[int, int, int, "asyncio.Future"]] = []
+        self._seq = itertools.count()
+        self._dispatcher: Optional["asyncio.Task"] = None
+        self._wakeup: Optional["asyncio.Future"] = None
+
+        self.granted = {p.name.lower(): 0 for p in Priority}
+        self.queued = {p.name.lower(): 0 for p in Priority}
+        self.timeouts = 0
+        self.wait_seconds = 0.0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._updated
+        self._updated = now
+        if self.requests_per_minute > 0:
+            self._requests = min(
+                float(self.requests_per_minute),
+                self._requests + elapsed * self.requests_per_minute / 60.0,
+            )
+        if self.tokens_per_minute > 0:
+            self._tokens = min(
+                float(self.tokens_per_minute),
+                self._tokens + elapsed * self.tokens_per_minute / 60.0,
+            )
+
+    def _cap(self, tokens: int) -> int:
+        # 1분 할당량보다 큰 요청도 언젠가는 통과하도록 상한을 둠
+        return min(tokens, self.tokens_per_minute) if self.tokens_per_minute > 0 else 0
+
+    def _fits(self, tokens: int) -> bool:
+        if self.requests_per_minute > 0 and self._requests < 1.0:
+            return False
+        return self._tokens >= self._cap(tokens)
+
+    def _take(self, tokens: int) -> None:
+        if self.requests_per_minute > 0:
+            self._requests -= 1.0
+        self._tokens -= self._cap(tokens)
+
+    def _time_until_fits(self, tokens: int) -> float:
+        wait = 0.0
+        if self.requests_per_minute > 0 and self._requests < 1.0:
+            wait = (1.0 - self._requests) * 60.0 / self.requests_per_minute
+        if self.tokens_per_minute > 0:
+            missing = self._cap(tokens) - self._tokens
+            if missing > 0:
+                wait = max(wait, missing * 60.0 / self.tokens_per_minute)
+        return max(wait, 0.001)
+
+    async def acquire(
+        self,
+        tokens: int,
+        priority: Optional[Priority] = None,
+        deadline: Optional[float] = None,
+    ) -> None:
+        """
+        요청 1건과 토큰을 예약합니다. 여유가 없으면 우선순위 순서대로 기다립니다.
+
+        Args:
+            tokens: 예약할 토큰 수
+            priority: 우선순위 (기본값: 현재 컨텍스트의 우선순위)
+            deadline: 대기 마감 시각 (기본값: 현재 컨텍스트의 마감 시각)
+
+        Raises:
+            RateLimitTimeout: 마감 시각 안에 예약하지 못했을 때
+        """
+        if not self.enabled:
+            return
+        priority = current_priority() if priority is None else priority
+        deadline = current_deadline() if deadline is None else deadline
+        lane = priority.name.lower()
+
+        self._refill()
+        if not self._waiters and self._fits(tokens):
+            self._take(tokens)
+            self.granted[lane] += 1
+            return
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        heapq.heappush(self._waiters, (int(priority), next(self._seq), tokens, future))
+        self.queued[lane] += 1
+        self._kick(loop)
+
+        start = time.monotonic()
+        timeout = None if deadline is None else max(0.0, deadline - start)
+        try:
+            # future를 직접 취소하지 않도록 shield: 마감/취소와 배정이 겹쳤는지 아래에서 확인
+            await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.TimeoutError:
+            # 마감과 같은 순간에 배정되었으면 슬롯은 이미 차감되었으므로 배정으로 처리
+            if not (future.done() and not future.cancelled()):
+                future.cancel()
+                self.timeouts += 1
+                raise RateLimitTimeout(
+                    f"Gemini rate limit: no slot within deadline ({lane})"
+                ) from None
+        except BaseException:
+            # 취소와 배정이 겹쳤으면 쓰지 않을 슬롯을 버킷에 돌려줌
+            if future.done() and not future.cancelled():
+                self._give_back(tokens)
+            else:
+                future.cancel()
+            raise
+        finally:
+            self.wait_seconds += time.monotonic() - start
+        self.granted[lane] += 1
+
+    def _give_back(self, tokens: int) -> None:
+        """배정했지만 쓰이지 않은 요청 1건과 토큰을 버킷에 돌려줍니다."""
+        self._refill()
+        if self.requests_per_minute > 0:
+            self._requests = min(float(self.requests_per_minute), self._requests + 1.0)
+        if self.tokens_per_minute > 0:
+            self._tokens = min(float(self.tokens_per_minute), self._tokens + self._cap(tokens))
+        self._kick()
+
+    def adjust(self, tokens: int) -> None:
+        """
+        예약과 실제 사용량의 차이를 정산합니다.
+        양수는 반환(예약 > 실제), 음수는 추가 차감입니다.
+        """
+        if self.tokens_per_minute > 0:
+            self._refill()
+            self._tokens = min(float(self.tokens_per_minute), self._tokens + tokens)
+            self._kick()
+
+    def _kick(self, loop: Optional[asyncio.AbstractEventLoop] = None) -> None:
+        """대기열 처리 작업을 깨우거나 시작합니다."""
+        if self._wakeup is not None and not self._wakeup.done():
+            self._wakeup.set_result(None)
+        if self._waiters and (self._dispatcher is None or self._dispatcher.done()):
+            loop = loop or asyncio.get_running_loop()
+            self._dispatcher = loop.create_task(self._dispatch())
+
+    async def _dispatch(self) -> None:
+        """맨 앞(가장 높은 우선순위, 가장 오래된) 대기자부터 버킷이 허락할 때 통과시킵니다."""
+        loop = asyncio.get_running_loop()
+        while self._waiters:
+            _, _, tokens, future = self._waiters[0]
+            if future.done():
+                # 마감으로 포기한 대기자
+                heapq.heappop(self._waiters)
+                continue
+
+            self._refill()
+            if self._fits(tokens):
+                heapq.heappop(self._waiters)
+                self._take(tokens)
+                future.set_result(None)
+                continue
+
+            # 버킷이 찰 때까지 자되, 새 대기자가 오면 맨 앞이 바뀌었을 수 있으니 깨어남
+            self._wakeup = loop.create_future()
+            try:
+                await asyncio.wait_for(
+                    asyncio.shield(self._wakeup), self._time_until_fits(tokens)
+                )
+            except asyncio.TimeoutError:
+                pass
+            finally:
+                self._wakeup = None
+
+    def stats(self) -> Dict[str, Any]:
+        """버킷 잔량과 레인별 카운터를 반환합니다."""
+        self._refill()
+        return {
+            "enabled": self.enabled,
+            "requests_per_minute": self.requests_per_minute,
+            "tokens_per_minute": self.tokens_per_minute,
+            "available_requests": round(self._requests, 2),
+            "available_tokens": int(self._tokens),
+            "waiting": sum(1 for *_, f in self._waiters if not f.done()),
+            "granted": dict(self.granted),
+            "queued": dict(self.queued),
+            "timeouts": self.timeouts,
+            "wait_seconds": round(self.wait_seconds, 3),
+        }
@@ -0,0 +1,22 @@
+"""
+빠른 JSON 응답
+response_model이 없는 엔드포인트는 FastAPI가 반환값 전체를 jsonable_encoder로 dict/list로 바꾼 뒤
+json.dumps로 다시 직렬화합니다. pydantic 모델이 많이 들어 있는 응답(/api/pipeline)에서는 이 변환이
+직렬화 비용의 대부분이므로, pydantic-core의 직렬화기로 모델을 곧바로 UTF-8 JSON 바이트로 씁니다.
+"""
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic_core import to_json
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    pydantic 모델, dict, list, Enum이 섞인 값을 중간 dict 없이 바로 직렬화하는 JSON 응답
+    (출력은 기본 JSONResponse와 같은 compact UTF-8 JSON)
+
+    jsonable_encoder를 건너뛰려면 엔드포인트가 이 응답 객체를 직접 반환해야 합니다.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return to_json(content)
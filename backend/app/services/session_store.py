@@ -0,0 +1,43 @@
+"""
+분석 세션 저장소
+1단계 분석 결과를 서버에 보관하고 analysis_id로 다시 찾습니다.
+2단계 요청이 전체 분석 결과 대신 ID만 보내도 되도록 합니다.
+"""
+import secrets
+from typing import Any, Dict, Optional
+
+from .cache import TTLCache
+
+
+class AnalysisSessionStore:
+    """TTL과 용량 상한이 있는 분석 세션 저장소"""
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl: float = 1800.0,
+    ):
+        self._store = TTLCache(max_entries=max_entries, max_bytes=max_bytes, ttl=ttl)
+
+    def create(self, analysis: Any) -> str:
+        """
+        분석 결과를 저장하고 새 analysis_id를 발급합니다.
+
+        Args:
+            analysis: 저장할 분석 결과
+
+        Returns:
+            analysis_id
+        """
+        analysis_id = secrets.token_urlsafe(16)
+        self._store.set(analysis_id, analysis)
+        return analysis_id
+
+    def get(self, analysis_id: str) -> Optional[Any]:
+        """analysis_id의 분석 결과를 반환합니다. 없거나 만료되었으면 None."""
+        return self._store.get(analysis_id)
+
+    def stats(self) -> Dict[str, Any]:
+        """저장소 카운터를 반환합니다."""
+        return self._store.stats()
@@ -0,0 +1,59 @@
+"""
+요청 병합 (singleflight)
+같은 키로 동시에 진행 중인 작업이 있으면 새로 실행하지 않고
+진행 중인 작업의 결과를 함께 기다립니다.
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """진행 중인 동일 작업 병합기"""
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._inflight: Dict[Hashable, "asyncio.Future"] = {}
+
+        self.executions = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        key에 대한 작업을 한 번만 실행하고 결과를 공유합니다.
+        한 호출자가 취소되어도 공유 작업은 계속 진행됩니다.
+
+        Args:
+            key: 작업 식별 키
+            fn: 실행할 코루틴 함수
+
+        Returns:
+            작업 결과 (예외도 모든 대기자에게 그대로 전달)
+        """
+        if not self.enabled:
+            return await fn()
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+            return await asyncio.shield(task)
+
+        self.executions += 1
+        task = asyncio.ensure_future(fn())
+        self._inflight[key] = task
+        task.add_done_callback(lambda t: self._done(key, t))
+        return await asyncio.shield(task)
+
+    def _done(self, key: Hashable, task: "asyncio.Future") -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # 모든 대기자가 취소된 경우에도 예외 미회수 경고가 나지 않도록 회수
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict[str, int]:
+        """실행/병합 카운터를 반환합니다."""
+        return {
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "inflight": len(self._inflight),
+        }
@@ -0,0 +1,257 @@
+"""
+요청 추적 (tracing)
+요청마다 trace_id를 두고, 서비스 구간(span)의 시작/종료 시각과 부모 관계를 기록해
+로컬 JSONL 파일로 내보냅니다. 겹치는 시간 구간으로 동시에 실행된 작업을 볼 수 있습니다.
+
+- trace 문맥은 W3C traceparent 헤더로 Flask 프론트엔드에서 전달받습니다.
+- 현재 span은 contextvars로 전달되므로 asyncio 작업에도 부모 관계가 이어집니다.
+- 파일 쓰기는 QueueHandler/QueueListener로 별도 스레드에서 처리해 이벤트 루프를 막지 않습니다.
+- 비활성화되어 있으면 span()은 아무것도 기록하지 않습니다.
+"""
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from ..config import settings
+
+
+TRACEPARENT_RE = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+
+
+def new_trace_id() -> str:
+    return "%032x" % random.getrandbits(128)
+
+
+def new_span_id() -> str:
+    return "%016x" % random.getrandbits(64)
+
+
+def parse_traceparent(header: Optional[str]) -> Optional[Tuple[str, str]]:
+    """traceparent 헤더에서 (trace_id, 부모 span_id)를 꺼냅니다. 형식이 틀리면 None."""
+    if not header:
+        return None
+    match = TRACEPARENT_RE.match(header.strip().lower())
+    if match is None or match.group(1) == "0" * 32:
+        return None
+    return match.group(1), match.group(2)
+
+
+class Span:
+    """시간 구간 하나"""
+
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "start", "_t0", "attributes", "error")
+
+    def __init__(self, trace_id: str, parent_id: Optional[str], name: str, attributes: Dict[str, Any]):
+        self.trace_id = trace_id
+        self.span_id = new_span_id()
+        self.parent_id = parent_id
+        self.name = name
+        self.start = time.time()
+        self._t0 = time.perf_counter()
+        self.attributes = attributes
+        self.error: Optional[str] = None
+
+    def set(self, **attributes: Any) -> None:
+        """속성을 추가합니다."""
+        self.attributes.update(attributes)
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def to_record(self) -> Dict[str, Any]:
+        record = {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start": round(self.start, 6),
+            "duration_ms": round((time.perf_counter() - self._t0) * 1000, 3),
+        }
+        if self.attributes:
+            record["attributes"] = self.attributes
+        if self.error:
+            record["error"] = self.error
+        return record
+
+
+class _NoopSpan:
+    """추적하지 않는 요청에서 쓰는 빈 span"""
+
+    trace_id = None
+    span_id = None
+
+    def set(self, **attributes: Any) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+_current: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+def current_span() -> Optional[Span]:
+    return _current.get()
+
+
+def current_trace_id() -> Optional[str]:
+    span = _current.get()
+    return span.trace_id if span is not None else None
+
+
+class JsonlSpanExporter:
+    """span을 한 줄에 하나씩 회전(rotating) JSONL 파일로 내보내는 exporter"""
+
+    def __init__(self, path: str, max_bytes: int, backup_count: int):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        file_handler = logging.handlers.RotatingFileHandler(
+            path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8"
+        )
+        file_handler.setFormatter(logging.Formatter("%(message)s"))
+
+        self._queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._listener = logging.handlers.QueueListener(self._queue, file_handler)
+        self._logger = logging.getLogger("app.tracing")
+        self._logger.propagate = False
+        self._logger.setLevel(logging.INFO)
+        self._logger.handlers = [logging.handlers.QueueHandler(self._queue)]
+        self._listener.start()
+
+    def export(self, span: Span) -> None:
+        self._logger.info(json.dumps(span.to_record(), ensure_ascii=False, default=str))
+
+    def shutdown(self) -> None:
+        """남은 span을 파일에 쓰고 쓰기 스레드를 멈춥니다."""
+        self._listener.stop()
+
+
+class Tracer:
+    """span 생성과 내보내기"""
+
+    def __init__(self):
+        self.enabled = settings.tracing_enabled
+        self.sample_rate = settings.tracing_sample_rate
+        self._exporter: Optional[JsonlSpanExporter] = None
+
+    @property
+    def exporter(self) -> JsonlSpanExporter:
+        if self._exporter is None:
+            self._exporter = JsonlSpanExporter(
+                settings.tracing_file,
+                max_bytes=settings.tracing_max_bytes,
+                backup_count=settings.tracing_backup_count,
+            )
+        return self._exporter
+
+    def shutdown(self) -> None:
+        if self._exporter is not None:
+            self._exporter.shutdown()
+            self._exporter = None
+
+    @contextmanager
+    def request_span(self, name: str, traceparent: Optional[str] = None, **attributes: Any) -> Iterator[Any]:
+        """
+        요청의 최상위 span을 시작합니다.
+        traceparent 헤더가 있으면 그 trace에 이어 붙이고, 없으면 샘플링 비율에 따라 새 trace를 만듭니다.
+        """
+        if not self.enabled:
+            yield NOOP_SPAN
+            return
+
+        parent = parse_traceparent(traceparent)
+        if parent is None:
+            if random.random() >= self.sample_rate:
+                yield NOOP_SPAN
+                return
+            parent = (new_trace_id(), None)
+
+        with self._span(parent[0], parent[1], name, attributes) as span:
+            yield span
+
+    @contextmanager
+    def span(self, name: str, activate: bool = True, **attributes: Any) -> Iterator[Any]:
+        """
+        현재 span의 자식 span을 시작합니다. 추적 중인 요청이 아니면 아무것도 하지 않습니다.
+
+        Args:
+            name: span 이름
+            activate: 블록 안에서 이 span을 현재 span으로 둘지 여부
+                (async generator 안에서는 yield 너머로 문맥이 새므로 False)
+            **attributes: span 속성
+        """
+        parent = _current.get()
+        if parent is None:
+            yield NOOP_SPAN
+            return
+        with self._span(parent.trace_id, parent.span_id, name, attributes, activate) as span:
+            yield span
+
+    @contextmanager
+    def _span(
+        self,
+        trace_id: str,
+        parent_id: Optional[str],
+        name: str,
+        attributes: Dict[str, Any],
+        activate: bool = True,
+    ) -> Iterator[Span]:
+        span = Span(trace_id, parent_id, name, attributes)
+        token = _current.set(span) if activate else None
+        try:
+            yield span
+        except BaseException as e:
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            if token is not None:
+                _current.reset(token)
+            self.exporter.export(span)
+
+
+# 전역 tracer
+tracer = Tracer()
+
+
+class TracingMiddleware:
+    """
+    HTTP 요청마다 최상위 span을 여는 ASGI 미들웨어
+    스트리밍 응답도 본문 전송이 끝날 때까지 같은 span 안에서 실행되며,
+    응답 헤더에 traceparent와 X-Trace-Id를 붙여 돌려줍니다.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not tracer.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        traceparent = headers.get(b"traceparent", b"").decode("latin-1")
+
+        with tracer.request_span(
+            f"{scope['method']} {scope['path']}", traceparent=traceparent or None
+        ) as span:
+            async def send_with_trace(message):
+                if message["type"] == "http.response.start":
+                    span.set(status=message["status"])
+                    if span.trace_id is not None:
+                        message["headers"] = list(message.get("headers", [])) + [
+                            (b"traceparent", span.traceparent.encode("latin-1")),
+                            (b"x-trace-id", span.trace_id.encode("latin-1")),
+                        ]
+                await send(message)
+
+            await self.app(scope, receive, send_with_trace)
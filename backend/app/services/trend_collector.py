@@ -3,29 +3,272 @@
 웹 검색을 통해 최신 트렌드 정보를 수집합니다.
 Brave Search API 또는 DuckDuckGo 자동 선택
 """
-import httpx
-from typing import List, Dict
-from bs4 import BeautifulSoup
+import asyncio
+from typing import Awaitable, Callable, List, Dict, Optional, Tuple
 from ..config import settings
 from ..models.schemas import TrendResult, IntentAnalysisResult
-import json
+from .llm_client import llm_client, BRAVE_SEARCH_URL, DUCKDUCKGO_SEARCH_URL
+from .cache import TTLCache, StaleWhileRevalidateCache
+from .singleflight import SingleFlight
+from .json_stream import IncrementalJSONArrayParser, extract_json
+from .ddg_parser import create_parser
+from .latency import LatencyHistogram
+from .circuit_breaker import CircuitOpenError, get_breaker
+from .rate_limiter import Priority, request_deadline, request_priority
+from .metrics import FALLBACKS, SEARCH_SECONDS, STAGE_SECONDS
+from .tracing import current_span, tracer
+import time
+import unicodedata
 import urllib.parse
 
 
+# 키워드 검색 완료 콜백: (키워드, 검색 결과)
+SearchResultCallback = Callable[[str, List[Dict]], None]
+
+# 트렌드 항목 완성 콜백: (순번, 트렌드)
+TrendCallback = Callable[[int, str], None]
+
+# 검색 함수: (검색어, 결과 수) → 검색 결과
+SearchFunction = Callable[[str, int], Awaitable[List[Dict]]]
+
+
+def normalize_search_query(query: str) -> str:
+    """캐시 키용 검색어 정규화 (유니코드 정규화, 소문자, 공백 정리)"""
+    return " ".join(unicodedata.normalize("NFKC", query).lower().split())
+
+
+class SearchDeduplicator:
+    """
+    배치 범위 검색 중복 제거기
+    배치 안에서 같은 검색어(정규화 기준)는 한 번만 검색하고 결과를 공유합니다.
+    """
+
+    def __init__(self, search: SearchFunction):
+        self._search = search
+        self._tasks: Dict[Tuple[str, int], "asyncio.Task"] = {}
+        self.requests = 0
+
+    @property
+    def unique(self) -> int:
+        """실제로 실행된 고유 검색 수"""
+        return len(self._tasks)
+
+    async def __call__(self, query: str, num_results: int) -> List[Dict]:
+        self.requests += 1
+        key = (normalize_search_query(query), num_results)
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._search(query, num_results))
+            self._tasks[key] = task
+        # 한 쿼리의 마감 시간 초과가 공유 검색을 취소하지 않도록 보호
+        return [dict(r) for r in await asyncio.shield(task)]
+
+
+def _keywords_match(a: str, b: str) -> bool:
+    """정규화 후 같거나 한쪽이 다른 쪽을 포함하면 같은 키워드로 봅니다."""
+    a, b = normalize_search_query(a), normalize_search_query(b)
+    return a == b or a in b or b in a
+
+
+class SpeculativeSearch:
+    """
+    의도 분석과 병렬로 미리 시작한 검색
+    LLM 키워드와 충분히 겹치면 결과를 재사용하고, 아니면 폐기합니다.
+    """
+
+    def __init__(self, tasks: Dict[str, "asyncio.Future"]):
+        self._tasks = tasks
+
+    @property
+    def keywords(self) -> List[str]:
+        return list(self._tasks)
+
+    def _match(self, keyword: str) -> Optional[str]:
+        for speculative in self._tasks:
+            if _keywords_match(keyword, speculative):
+                return speculative
+        return None
+
+    def overlap(self, keywords: List[str]) -> float:
+        """LLM 키워드 중 추측 검색과 겹치는 비율"""
+        if not keywords:
+            return 0.0
+        return sum(1 for k in keywords if self._match(k) is not None) / len(keywords)
+
+    def search_for(
+        self, keywords: List[str], fallback: SearchFunction, min_overlap: float
+    ) -> Optional[SearchFunction]:
+        """
+        LLM 키워드에 맞는 검색 함수를 만듭니다.
+        겹치는 비율이 min_overlap 미만이면 추측 검색을 모두 취소하고 None을 반환합니다.
+
+        Args:
+            keywords: LLM이 추출한 키워드 (상위 3개 사용)
+            fallback: 추측 결과가 없는 키워드에 쓸 검색 함수
+            min_overlap: 재사용에 필요한 최소 겹침 비율
+
+        Returns:
+            추측 결과를 우선 사용하는 검색 함수 또는 None
+        """
+        keywords = keywords[:3]
+        if self.overlap(keywords) < min_overlap:
+            self.cancel()
+            return None
+
+        reuse: Dict[str, "asyncio.Future"] = {}
+        for keyword in keywords:
+            speculative = self._match(keyword)
+            if speculative is not None:
+                query = TrendCollector.build_search_query(keyword)
+                reuse[normalize_search_query(query)] = self._tasks[speculative]
+
+        async def search(query: str, num_results: int) -> List[Dict]:
+            task = reuse.get(normalize_search_query(query))
+            if task is None:
+                return await fallback(query, num_results)
+            return [dict(r) for r in await asyncio.shield(task)]
+
+        return search
+
+    def cancel(self) -> None:
+        """아직 끝나지 않은 추측 검색을 모두 취소합니다."""
+        for task in self._tasks.values():
+            task.cancel()
+
+
 class TrendCollector:
     """트렌드 수집기"""
 
     def __init__(self):
-        self.api_key = settings.google_gemini_api_key
-        self.model = settings.gemini_model
-        self.api_url = settings.gemini_api_url
         self.brave_api_key = settings.brave_search_api_key
         self.search_engine = settings.search_engine
 
+        # 검색 결과 캐시 (정규화된 쿼리, 엔진, 결과 수 기준)
+        self.search_cache = (
+            TTLCache(
+                max_entries=settings.search_cache_max_entries,
+                max_bytes=settings.search_cache_max_bytes,
+                ttl=settings.search_cache_ttl,
+            )
+            if settings.search_cache_enabled
+            else None
+        )
+
+        # 트렌드 요약 캐시 (도메인, 키워드 집합 기준 stale-while-revalidate)
+        self.trend_cache = (
+            StaleWhileRevalidateCache(
+                max_entries=settings.trend_cache_max_entries,
+                fresh_ttl=settings.trend_cache_fresh_ttl,
+                hard_ttl=settings.trend_cache_hard_ttl,
+            )
+            if settings.trend_cache_enabled
+            else None
+        )
+
+        # 동시에 진행 중인 동일 검색/요약 병합
+        self.search_inflight = SingleFlight(enabled=settings.singleflight_enabled)
+        self.summary_inflight = SingleFlight(enabled=settings.singleflight_enabled)
+
+        # 검색 엔진별 지연 시간 (헤지 대기 시간 산정용)
+        self.search_latency = {
+            engine: LatencyHistogram(window=settings.search_latency_window)
+            for engine in ("brave", "duckduckgo")
+        }
+        self.hedged_requests = 0
+        self.hedge_wins = 0
+
+        # 검색 엔진별 서킷 브레이커
+        self.search_breakers = {
+            engine: get_breaker(engine) for engine in ("brave", "duckduckgo")
+        }
+
+    def cache_stats(self) -> Dict:
+        """검색 캐시 카운터를 반환합니다."""
+        if self.search_cache is None:
+            return {"enabled": False}
+        return {"enabled": True, **self.search_cache.stats()}
+
+    def trend_cache_stats(self) -> Dict:
+        """트렌드 요약 캐시 카운터를 반환합니다."""
+        if self.trend_cache is None:
+            return {"enabled": False}
+        return {"enabled": True, **self.trend_cache.stats()}
+
+    @staticmethod
+    def build_search_query(keyword: str) -> str:
+        """키워드로 트렌드 검색어를 만듭니다."""
+        return f"{keyword} 최신 트렌드 2025"
+
+    def start_speculative_search(self, keywords: List[str]) -> "SpeculativeSearch":
+        """
+        의도 분석을 기다리지 않고 추정 키워드로 검색을 미리 시작합니다.
+
+        Args:
+            keywords: 쿼리에서 바로 추출한 추정 키워드
+
+        Returns:
+            SpeculativeSearch: 진행 중인 추측 검색
+        """
+        tasks = {
+            keyword: asyncio.ensure_future(
+                self.search_web(self.build_search_query(keyword), 3)
+            )
+            for keyword in keywords[:3]
+        }
+        return SpeculativeSearch(tasks)
+
+    def inflight_stats(self) -> Dict:
+        """검색/요약 단계 요청 병합 카운터를 반환합니다."""
+        return {
+            "search": self.search_inflight.stats(),
+            "summary": self.summary_inflight.stats(),
+        }
+
+    def search_stats(self) -> Dict:
+        """검색 엔진별 지연 시간과 헤지 카운터를 반환합니다."""
+        return {
+            "engine": self._resolve_engine(),
+            "hedging": self._hedging_available(),
+            "hedged_requests": self.hedged_requests,
+            "hedge_wins": self.hedge_wins,
+            "latency": {
+                engine: {**histogram.stats(), "hedge_delay": round(self.hedge_delay(engine), 4)}
+                for engine, histogram in self.search_latency.items()
+            },
+        }
+
+    def _hedging_available(self) -> bool:
+        """헤지 검색은 두 엔진을 모두 쓸 수 있을 때만 동작합니다."""
+        return settings.search_hedging_enabled and bool(self.brave_api_key)
+
+    def hedge_delay(self, engine: str) -> float:
+        """
+        백업 요청을 보내기 전 기다릴 시간을 반환합니다.
+        관측값이 충분하면 해당 엔진의 p90(설정 분위수), 아니면 기본값입니다.
+        """
+        histogram = self.search_latency[engine]
+        if histogram.count < settings.search_hedge_min_samples:
+            return settings.search_hedge_default_delay
+        return max(
+            settings.search_hedge_min_delay,
+            histogram.quantile(settings.search_hedge_quantile),
+        )
+
+    def _resolve_engine(self) -> str:
+        """설정과 API 키를 바탕으로 실제 사용할 검색 엔진을 결정합니다."""
+        if self.search_engine == "auto":
+            return "brave" if self.brave_api_key else "duckduckgo"
+        elif self.search_engine == "brave":
+            return "brave"
+        else:
+            # 기본값: DuckDuckGo
+            return "duckduckgo"
+
     async def search_web(self, query: str, num_results: int = 3) -> List[Dict]:
         """
         웹 검색을 수행합니다.
         자동으로 Brave API 또는 DuckDuckGo 선택
+        실제 검색 결과는 캐시되며, 시뮬레이션 데이터는 캐시하지 않습니다.
 
         Args:
             query: 검색 쿼리
@@ -34,100 +277,195 @@ class TrendCollector:
         Returns:
             검색 결과 리스트
         """
-        # 검색 엔진 자동 선택
-        if self.search_engine == "auto":
-            if self.brave_api_key:
-                return await self._search_brave(query, num_results)
-            else:
+        engine = self._resolve_engine()
+        cache_key = (normalize_search_query(query), engine, num_results)
+
+        with tracer.span("search.web", query=query, engine=engine) as span:
+            if self.search_cache is not None:
+                cached = self.search_cache.get(cache_key)
+                if cached is not None:
+                    span.set(cache="hit", results=len(cached))
+                    return [dict(r) for r in cached]
+
+            # (결과, 시뮬레이션 데이터 여부): 표시는 결과 항목 밖에 두어 응답에 섞이지 않게 함
+            async def fetch() -> Tuple[List[Dict], bool]:
+                if self._hedging_available():
+                    return await self._search_hedged(query, num_results, engine)
+                if engine == "brave":
+                    return await self._search_brave(query, num_results)
                 return await self._search_duckduckgo(query, num_results)
-        elif self.search_engine == "brave":
-            return await self._search_brave(query, num_results)
-        elif self.search_engine == "duckduckgo":
-            return await self._search_duckduckgo(query, num_results)
-        else:
-            # 기본값: DuckDuckGo
-            return await self._search_duckduckgo(query, num_results)
 
-    async def _search_brave(self, query: str, num_results: int) -> List[Dict]:
-        """Brave Search API 사용"""
+            results, simulated = await self.search_inflight.do(cache_key, fetch)
+            span.set(cache="miss", results=len(results), simulated=simulated)
+
+            if self.search_cache is not None and results and not simulated:
+                self.search_cache.set(cache_key, [dict(r) for r in results])
+
+            return results
+
+    async def _search_hedged(
+        self, query: str, num_results: int, primary: str
+    ) -> Tuple[List[Dict], bool]:
+        """
+        주 엔진이 관측된 p90 안에 응답하지 않으면 다른 엔진에 백업 요청을 보내고
+        먼저 성공한 결과를 사용합니다. 진 쪽 요청은 취소합니다.
+
+        Args:
+            query: 검색 쿼리
+            num_results: 결과 개수
+            primary: 주 검색 엔진
+
+        Returns:
+            (검색 결과 리스트, 시뮬레이션 데이터 여부) - 모두 실패하면 시뮬레이션 데이터
+        """
+        backup = "duckduckgo" if primary == "brave" else "brave"
+        primary_task = asyncio.ensure_future(self._fetch(primary, query, num_results))
+        tasks = [primary_task]
+        errors = []
+
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    "https://api.search.brave.com/res/v1/web/search",
-                    headers={"X-Subscription-Token": self.brave_api_key},
-                    params={"q": query, "count": num_results},
-                    timeout=10.0
-                )
-                response.raise_for_status()
-                data = response.json()
+            await asyncio.wait(tasks, timeout=self.hedge_delay(primary))
+            if primary_task.done():
+                if not primary_task.exception() and primary_task.result():
+                    return primary_task.result(), False
+                errors.append(f"{primary}: {primary_task.exception() or 'no results'}")
+            else:
+                self.hedged_requests += 1
 
-                results = []
-                for r in data.get("web", {}).get("results", []):
-                    results.append({
-                        "title": r.get("title", ""),
-                        "snippet": r.get("description", ""),
-                        "url": r.get("url", "")
-                    })
+            backup_task = asyncio.ensure_future(self._fetch(backup, query, num_results))
+            tasks.append(backup_task)
 
-                return results[:num_results]
+            pending = {task for task in tasks if not task.done()}
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if not task.exception() and task.result():
+                        if task is backup_task and not primary_task.done():
+                            self.hedge_wins += 1
+                        return task.result(), False
+                    engine = primary if task is primary_task else backup
+                    errors.append(f"{engine}: {task.exception() or 'no results'}")
+
+            print(f"Hedged search error: {'; '.join(errors)}, using simulation data")
+            return self._get_simulation_data(query, num_results), True
+
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _fetch(self, engine: str, query: str, num_results: int) -> List[Dict]:
+        """
+        엔진별 검색을 실행하고 지연 시간을 기록합니다. 실패하면 예외를 그대로 올립니다.
+        헤지로 취소된 요청도 취소 시점까지의 시간을 기록합니다(하한값).
+        이를 빼면 느린 요청이 관측에서 사라져 p90이 계속 낮아집니다.
+        메트릭에는 실패와 회로 차단까지 결과(outcome) 라벨을 붙여 모든 호출을 기록합니다.
+        """
+        fetchers = {"brave": self._fetch_brave, "duckduckgo": self._fetch_duckduckgo}
+        with tracer.span("search.fetch", provider=engine) as span:
+            start = time.perf_counter()
+            outcome = "error"
+            try:
+                # 회로가 열려 있으면 요청 없이 CircuitOpenError → 호출부 폴백
+                results = await self.search_breakers[engine].call(
+                    lambda: fetchers[engine](query, num_results)
+                )
+                outcome = "ok"
+            except CircuitOpenError:
+                outcome = "circuit_open"
+                raise
+            except asyncio.CancelledError:
+                outcome = "cancelled"
+                raise
+            finally:
+                elapsed = time.perf_counter() - start
+                SEARCH_SECONDS.observe(elapsed, engine, outcome)
+                # 헤지 지연 계산용 분포에는 응답을 받았거나 헤지로 취소된 요청만
+                if outcome in ("ok", "cancelled"):
+                    self.search_latency[engine].record(elapsed)
+            span.set(results=len(results))
+            return results
+
+    async def _search_brave(self, query: str, num_results: int) -> Tuple[List[Dict], bool]:
+        """Brave Search API 사용 (결과, 시뮬레이션 데이터 여부)"""
+        try:
+            return await self._fetch("brave", query, num_results), False
 
         except Exception as e:
             print(f"Brave Search error: {e}, falling back to DuckDuckGo")
+            FALLBACKS.inc("brave_to_duckduckgo")
             return await self._search_duckduckgo(query, num_results)
 
-    async def _search_duckduckgo(self, query: str, num_results: int) -> List[Dict]:
-        """DuckDuckGo HTML 스크래핑 (무료)"""
+    async def _search_duckduckgo(self, query: str, num_results: int) -> Tuple[List[Dict], bool]:
+        """DuckDuckGo HTML 스크래핑 (무료, 결과와 시뮬레이션 데이터 여부)"""
         try:
-            async with httpx.AsyncClient() as client:
-                # DuckDuckGo HTML 검색
-                encoded_query = urllib.parse.quote(query)
-                url = f"https://html.duckduckgo.com/html/?q={encoded_query}"
-
-                headers = {
-                    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-                }
-
-                response = await client.get(url, headers=headers, timeout=10.0)
-                response.raise_for_status()
-
-                soup = BeautifulSoup(response.text, 'html.parser')
-                results = []
-
-                # DuckDuckGo 결과 파싱
-                for result_div in soup.select('.result'):
-                    try:
-                        title_elem = result_div.select_one('.result__title')
-                        snippet_elem = result_div.select_one('.result__snippet')
-                        url_elem = result_div.select_one('.result__url')
-
-                        if title_elem and snippet_elem:
-                            title = title_elem.get_text(strip=True)
-                            snippet = snippet_elem.get_text(strip=True)
-                            url = url_elem.get('href', '') if url_elem else ''
-
-                            results.append({
-                                "title": title,
-                                "snippet": snippet,
-                                "url": url
-                            })
-
-                            if len(results) >= num_results:
-                                break
-                    except:
-                        continue
-
-                # 결과가 없으면 시뮬레이션 데이터 반환
-                if not results:
-                    results = self._get_simulation_data(query, num_results)
-
-                return results[:num_results]
+            results = await self._fetch("duckduckgo", query, num_results)
+
+            # 결과가 없으면 시뮬레이션 데이터 반환
+            if not results:
+                return self._get_simulation_data(query, num_results), True
+
+            return results[:num_results], False
 
         except Exception as e:
             print(f"DuckDuckGo search error: {e}, using simulation data")
-            return self._get_simulation_data(query, num_results)
+            return self._get_simulation_data(query, num_results), True
+
+    async def _fetch_brave(self, query: str, num_results: int) -> List[Dict]:
+        """Brave Search API 호출 (실패 시 예외)"""
+        response = await llm_client.http.get(
+            BRAVE_SEARCH_URL,
+            headers={"X-Subscription-Token": self.brave_api_key},
+            params={"q": query, "count": num_results},
+            timeout=10.0
+        )
+        response.raise_for_status()
+        data = response.json()
+
+        results = []
+        for r in data.get("web", {}).get("results", []):
+            results.append({
+                "title": r.get("title", ""),
+                "snippet": r.get("description", ""),
+                "url": r.get("url", "")
+            })
+
+        return results[:num_results]
+
+    async def _fetch_duckduckgo(self, query: str, num_results: int) -> List[Dict]:
+        """DuckDuckGo HTML 검색 결과 파싱 (실패 시 예외, 결과가 없으면 빈 리스트)"""
+        encoded_query = urllib.parse.quote(query)
+        url = f"{DUCKDUCKGO_SEARCH_URL}?q={encoded_query}"
+
+        headers = {
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+        }
+
+        parser = create_parser(settings.ddg_parser_backend, num_results)
+        parse_seconds = 0.0
+
+        # 필요한 결과 수가 모이거나 수신 상한에 닿으면 나머지 본문은 받지 않음
+        async with llm_client.http.stream(
+            "GET", url, headers=headers, timeout=10.0
+        ) as response:
+            response.raise_for_status()
+            async for chunk in response.aiter_text():
+                start = time.perf_counter()
+                done = parser.feed(chunk)
+                parse_seconds += time.perf_counter() - start
+                if done or response.num_bytes_downloaded >= settings.ddg_max_bytes:
+                    break
+
+        # 다운로드와 겹쳐 진행되므로 파싱에 쓴 CPU 시간만 합산해 기록
+        start = time.perf_counter()
+        results = parser.close()
+        STAGE_SECONDS.observe(parse_seconds + time.perf_counter() - start, "html_parse")
+        return results
 
     def _get_simulation_data(self, query: str, num_results: int) -> List[Dict]:
         """시뮬레이션 데이터 (fallback)"""
+        FALLBACKS.inc("simulated_search")
         return [
             {
                 "title": f"{query}에 대한 최신 트렌드 {i+1}",
@@ -137,30 +475,188 @@ class TrendCollector:
             for i in range(num_results)
         ]
 
+    async def search_keywords(
+        self,
+        keywords: List[str],
+        on_results: Optional[SearchResultCallback] = None,
+        search: Optional[SearchFunction] = None,
+    ) -> List[List[Dict]]:
+        """
+        키워드별 검색을 동시성 제한 하에 병렬로 수행합니다.
+        단계 마감 시간 안에 끝나지 않은 검색은 취소하고 제외합니다.
+
+        Args:
+            keywords: 검색할 키워드 리스트
+            on_results: 검색이 끝날 때마다 (키워드, 결과)로 호출되는 콜백
+            search: 검색 함수 (기본값: self.search_web)
+
+        Returns:
+            키워드 순서대로 정렬된 검색 결과 리스트 (시간 초과분 제외)
+        """
+        if not keywords:
+            return []
+
+        semaphore = asyncio.Semaphore(max(1, settings.trend_search_concurrency))
+        search = search or self.search_web
+
+        async def run(keyword: str) -> List[Dict]:
+            async with semaphore:
+                results = await search(self.build_search_query(keyword), 3)
+            if on_results is not None:
+                on_results(keyword, results)
+            return results
+
+        with tracer.span("search.keywords", keywords=len(keywords)) as span:
+            # 작업은 span 안에서 만들어야 키워드별 검색 span이 이 span의 자식이 됨
+            tasks = [asyncio.create_task(run(keyword)) for keyword in keywords]
+            done, pending = await asyncio.wait(
+                tasks, timeout=settings.trend_search_deadline
+            )
+
+            for task in pending:
+                task.cancel()
+            if pending:
+                span.set(cancelled=len(pending))
+                print(f"Trend search deadline exceeded: {len(pending)} search(es) cancelled")
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        # 키워드 순서를 유지하여 결정적인 병합 순서 보장
+        ordered = []
+        for task in tasks:
+            if task in done and not task.cancelled() and task.exception() is None:
+                ordered.append(task.result())
+            elif task in done and not task.cancelled():
+                print(f"Trend search error: {task.exception()}")
+        return ordered
+
     async def collect(
-        self, keywords: List[str], intent: IntentAnalysisResult
+        self,
+        keywords: List[str],
+        intent: IntentAnalysisResult,
+        on_results: Optional[SearchResultCallback] = None,
+        on_trend: Optional[TrendCallback] = None,
+        search: Optional[SearchFunction] = None,
     ) -> TrendResult:
         """
         키워드를 기반으로 트렌드를 수집하고 정리합니다.
+        (도메인, 키워드 집합)이 같은 결과는 캐시에서 즉시 반환하고,
+        오래된 항목은 백그라운드에서 갱신합니다.
 
         Args:
             keywords: 검색할 키워드 리스트
             intent: 의도 분석 결과
+            on_results: 검색이 끝날 때마다 호출되는 콜백
+            on_trend: 요약 스트리밍 중 트렌드 항목이 완성될 때마다 호출되는 콜백
+                (두 콜백 모두 캐시 히트나 병합된 요청에서는 호출되지 않음)
+            search: 검색 함수 (기본값: self.search_web, 백그라운드 갱신에는 쓰지 않음)
 
         Returns:
             TrendResult: 수집된 트렌드 결과
         """
+        cache_key = (intent.domain, tuple(sorted(set(keywords[:3]))))
+        cache_hit = True
+
+        def load() -> Awaitable[Tuple[TrendResult, bool]]:
+            nonlocal cache_hit
+            cache_hit = False
+            return self.summary_inflight.do(
+                cache_key,
+                lambda: self._collect_fresh(
+                    keywords, intent, on_results, on_trend, search
+                ),
+            )
+
+        async def refresh() -> Tuple[TrendResult, bool]:
+            # 백그라운드 갱신은 최저 우선순위, 원래 요청의 마감 시각과 무관
+            # (span은 캐시 히트를 낸 요청의 trace에 별도 구간으로 남음)
+            # 요청이 끝난 뒤에도 실행되므로 요청 범위의 콜백과 검색 함수(추측 검색은
+            # 요청 종료 시 취소됨)는 넘기지 않고 기본 검색을 사용
+            with request_priority(Priority.BACKGROUND), request_deadline(None), \
+                    tracer.span("trend.refresh"):
+                return await self.summary_inflight.do(
+                    cache_key,
+                    lambda: self._collect_fresh(keywords, intent),
+                )
+
+        with tracer.span("trend.collect", domain=intent.domain) as span:
+            if self.trend_cache is None:
+                result, _ = await load()
+            else:
+                result = await self.trend_cache.get_or_load(cache_key, load, refresh)
+            span.set(cache="hit" if cache_hit else "miss")
+        return result.model_copy(deep=True)
+
+    async def _collect_fresh(
+        self,
+        keywords: List[str],
+        intent: IntentAnalysisResult,
+        on_results: Optional[SearchResultCallback] = None,
+        on_trend: Optional[TrendCallback] = None,
+        search: Optional[SearchFunction] = None,
+    ) -> Tuple[TrendResult, bool]:
+        """검색과 요약을 수행합니다. (결과, 캐시 가능 여부)를 반환합니다."""
 
         all_results = []
         sources = []
 
-        # 각 키워드로 검색
-        for keyword in keywords[:3]:  # 상위 3개 키워드만 사용
-            search_query = f"{keyword} 최신 트렌드 2025"
-            results = await self.search_web(search_query, num_results=3)
+        # 각 키워드로 동시 검색 (상위 3개 키워드만 사용)
+        for results in await self.search_keywords(keywords[:3], on_results, search):
             all_results.extend(results)
             sources.extend([r["url"] for r in results if r["url"]])
 
+        return await self.summarize(all_results, sources, keywords, intent, on_trend)
+
+    async def _summarize_streaming(
+        self, prompt: str, on_trend: Optional[TrendCallback]
+    ) -> Dict:
+        """
+        streamGenerateContent로 요약을 받으며 trends 항목을 완성되는 즉시 전달합니다.
+        응답이 중간에 끊겨도 이미 받은 trends가 있으면 그것만 담아 반환합니다 (summary 없음).
+        """
+        parser = IncrementalJSONArrayParser("trends")
+        try:
+            async for chunk in llm_client.stream_generate_content(
+                prompt, temperature=0.7, max_output_tokens=2048, timeout=30.0
+            ):
+                for trend in parser.feed(chunk):
+                    if on_trend is not None and len(parser.items) <= 10:
+                        on_trend(len(parser.items) - 1, str(trend))
+        except Exception as e:
+            if not parser.items:
+                raise
+            # 클라이언트가 이미 받은 trend 이벤트와 최종 결과가 어긋나지 않도록 받은 항목을 사용
+            FALLBACKS.inc("partial_trends")
+            span = current_span()
+            if span is not None:
+                span.set(interrupted=str(e), partial_trends=len(parser.items))
+            return {"trends": list(parser.items)}
+
+        return parser.result()
+
+    async def summarize(
+        self,
+        all_results: List[Dict],
+        sources: List[str],
+        keywords: List[str],
+        intent: IntentAnalysisResult,
+        on_trend: Optional[TrendCallback] = None,
+    ) -> Tuple[TrendResult, bool]:
+        """
+        Gemini를 사용하여 검색 결과를 트렌드로 정리합니다.
+        스트리밍 모드에서는 trends 항목이 완성될 때마다 on_trend를 호출합니다.
+
+        Args:
+            all_results: 검색 결과 리스트
+            sources: 출처 URL 리스트
+            keywords: 검색 키워드 리스트
+            intent: 의도 분석 결과
+            on_trend: (순번, 트렌드)로 호출되는 콜백
+
+        Returns:
+            (TrendResult, 캐시 가능 여부) - 실패 시 기본값과 False,
+            스트림이 끊겨 일부 trends만 받았으면 그 trends와 False
+        """
+
         # Gemini를 사용하여 검색 결과 정리
         search_results_text = "\n\n".join(
             [
@@ -192,52 +688,32 @@ JSON만 반환하고 다른 설명은 하지 마세요.
 """
 
         try:
-            async with httpx.AsyncClient() as client:
-                url = f"{self.api_url}/{self.model}:generateContent?key={self.api_key}"
-
-                payload = {
-                    "contents": [{
-                        "parts": [{
-                            "text": prompt
-                        }]
-                    }],
-                    "generationConfig": {
-                        "temperature": 0.7,
-                        "maxOutputTokens": 2048,
-                    }
-                }
-
-                response = await client.post(url, json=payload, timeout=30.0)
-                response.raise_for_status()
-
-                result = response.json()
-
-                # Gemini 응답에서 텍스트 추출
-                text = result['candidates'][0]['content']['parts'][0]['text']
-
-                # JSON 추출 (마크다운 코드 블록 제거)
-                text = text.strip()
-                if text.startswith('```json'):
-                    text = text[7:]
-                if text.startswith('```'):
-                    text = text[3:]
-                if text.endswith('```'):
-                    text = text[:-3]
-                text = text.strip()
-
-                result_dict = json.loads(text)
-
-                return TrendResult(
-                    trends=result_dict["trends"][:10],  # 최대 10개
-                    summary=result_dict["summary"],
-                    sources=list(set(sources))[:10],  # 중복 제거 후 최대 10개
-                )
+            streaming = settings.gemini_streaming or on_trend is not None
+            with tracer.span("summary_llm", streaming=streaming, results=len(all_results)), \
+                    STAGE_SECONDS.time("summary_llm"):
+                if streaming:
+                    result_dict = await self._summarize_streaming(prompt, on_trend)
+                else:
+                    text = await llm_client.generate_content(
+                        prompt, temperature=0.7, max_output_tokens=2048, timeout=30.0
+                    )
+                    # JSON 추출 (마크다운 코드 블록 제거) 및 파싱
+                    result_dict = extract_json(text)
+
+            # summary가 없으면(스트림이 중간에 끊김) 받은 trends로 결과를 만들되 캐시하지 않음
+            complete = "summary" in result_dict
+            return TrendResult(
+                trends=result_dict["trends"][:10],  # 최대 10개
+                summary=result_dict.get("summary") or f"{intent.domain} 분야의 최신 트렌드입니다.",
+                sources=list(set(sources))[:10],  # 중복 제거 후 최대 10개
+            ), complete
 
         except Exception as e:
             print(f"Trend collection error: {e}")
+            FALLBACKS.inc("placeholder_trends")
             # 에러 발생 시 기본값 반환
             return TrendResult(
                 trends=[f"{k} 관련 최신 트렌드" for k in keywords[:10]],
                 summary=f"{intent.domain} 분야의 최신 트렌드입니다.",
                 sources=sources[:10],
-            )
+            ), False
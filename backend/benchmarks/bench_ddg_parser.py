@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+DuckDuckGo 결과 파서 마이크로 벤치마크
+저장된 결과 페이지(benchmarks/data/ddg/*.html)로 백엔드별 파싱 CPU 시간과
+최대 메모리(tracemalloc)를 측정하고, 백엔드 간 추출 결과가 같은지 확인합니다.
+
+사용법 (backend 디렉터리에서):
+    python benchmarks/bench_ddg_parser.py
+    python benchmarks/bench_ddg_parser.py --limit 10 --repeats 200
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+os.environ.setdefault("GOOGLE_GEMINI_API_KEY", "benchmark")
+
+from app.services.ddg_parser import PARSER_BACKENDS, create_parser  # noqa: E402
+
+DEFAULT_PAGES_DIR = Path(__file__).resolve().parent / "data" / "ddg"
+
+
+def measure_cpu(backend: str, html: str, limit: int, repeats: int):
+    """파싱 1회당 CPU 시간(µs) 목록"""
+    timings = []
+    for _ in range(repeats):
+        start = time.process_time_ns()
+        create_parser(backend, limit).parse(html)
+        timings.append((time.process_time_ns() - start) / 1000)
+    return timings
+
+
+def measure_peak_memory(backend: str, html: str, limit: int) -> int:
+    """파싱 1회의 최대 추가 메모리(바이트)"""
+    tracemalloc.start()
+    try:
+        create_parser(backend, limit).parse(html)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DuckDuckGo 결과 파서 벤치마크")
+    parser.add_argument("--pages", type=Path, default=DEFAULT_PAGES_DIR)
+    parser.add_argument("--limit", type=int, default=3, help="추출할 결과 수")
+    parser.add_argument("--repeats", type=int, default=100)
+    args = parser.parse_args()
+
+    pages = sorted(args.pages.glob("*.html"))
+    if not pages:
+        sys.exit(f"결과 페이지가 없습니다: {args.pages}")
+
+    print(f"결과 {args.limit}개 추출, 페이지당 {args.repeats}회 반복\n")
+    print(f"{'페이지':<18} {'백엔드':<7} {'p50 CPU':>10} {'평균 CPU':>10} "
+          f"{'최대 메모리':>11} {'결과':>4} {'bs4 대비':>8}")
+
+    for page in pages:
+        html = page.read_text(encoding="utf-8")
+        baseline = create_parser("bs4", args.limit).parse(html)
+        baseline_p50 = None
+
+        for backend in PARSER_BACKENDS:
+            results = create_parser(backend, args.limit).parse(html)
+            if results != baseline:
+                print(f"  ! {page.name} {backend}: bs4 결과와 다름")
+
+            timings = sorted(measure_cpu(backend, html, args.limit, args.repeats))
+            p50 = timings[len(timings) // 2]
+            if backend == "bs4":
+                baseline_p50 = p50
+            peak = measure_peak_memory(backend, html, args.limit)
+            print(f"{page.name:<18} {backend:<7} {p50:>8.0f}µs {statistics.mean(timings):>8.0f}µs "
+                  f"{peak / 1024:>9.0f}KB {len(results):>4} {baseline_p50 / p50:>7.1f}x")
+        print(f"{'':<18} ({len(html.encode('utf-8')) / 1024:.0f}KB)")
+
+
+if __name__ == "__main__":
+    main()
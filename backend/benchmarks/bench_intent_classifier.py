@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+로컬 의도 분류기 오프라인 벤치마크
+레이블된 쿼리 세트로 정확도, 신뢰도 보정(ECE), 임계값별 처리율, 지연 시간을 측정합니다.
+
+사용법 (backend 디렉터리에서):
+    python benchmarks/bench_intent_classifier.py
+    python benchmarks/bench_intent_classifier.py --fit --write   # Platt 계수 재학습 후 저장
+"""
+import argparse
+import json
+import math
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+os.environ.setdefault("GOOGLE_GEMINI_API_KEY", "benchmark")
+
+from app.services.intent_classifier import IntentClassifier  # noqa: E402
+
+DEFAULT_DATASET = Path(__file__).resolve().parent / "data" / "labelled_queries.jsonl"
+FIELDS = ("primary_intent", "output_type", "domain")
+
+
+def load_dataset(path: Path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def evaluate(classifier: IntentClassifier, rows):
+    """(raw 점수, 보정 신뢰도, 전체 정답 여부, 필드별 정답) 목록을 반환합니다."""
+    samples = []
+    for row in rows:
+        _, raw = classifier.raw_score(row["query"])
+        result = classifier.classify(row["query"])
+        predicted = {
+            "primary_intent": result.primary_intent.value,
+            "output_type": result.output_type.value,
+            "domain": result.domain,
+        }
+        field_ok = {f: predicted[f] == row[f] for f in FIELDS}
+        samples.append((raw, result.confidence, all(field_ok.values()), field_ok))
+    return samples
+
+
+def dump_lexicon(lexicon) -> str:
+    """어휘 파일을 레이블당 한 줄 형식으로 직렬화합니다."""
+    def compact(value):
+        return json.dumps(value, ensure_ascii=False, separators=(", ", ": "))
+
+    sections = []
+    for key, value in lexicon.items():
+        if isinstance(value, dict) and all(isinstance(v, list) for v in value.values()):
+            body = ",\n".join(f"    {compact(k)}: {compact(v)}" for k, v in value.items())
+            sections.append(f"  {compact(key)}: {{\n{body}\n  }}")
+        else:
+            sections.append(f"  {compact(key)}: {compact(value)}")
+    return "{\n" + ",\n".join(sections) + "\n}\n"
+
+
+def fit_platt(samples, iterations: int = 5000, lr: float = 0.1):
+    """보정 전 점수 → 정답 확률 로지스틱 회귀 (경사 하강)"""
+    a, b = 1.0, 0.0
+    n = len(samples)
+    for _ in range(iterations):
+        grad_a = grad_b = 0.0
+        for raw, _, correct, _ in samples:
+            p = 1.0 / (1.0 + math.exp(-(a * raw + b)))
+            err = p - (1.0 if correct else 0.0)
+            grad_a += err * raw
+            grad_b += err
+        a -= lr * grad_a / n
+        b -= lr * grad_b / n
+    return round(a, 4), round(b, 4)
+
+
+def report_calibration(samples, bins: int = 10):
+    print("\n[신뢰도 보정]")
+    print(f"{'구간':>12} {'건수':>5} {'평균 신뢰도':>10} {'정답률':>8}")
+    ece = 0.0
+    for i in range(bins):
+        lo, hi = i / bins, (i + 1) / bins
+        bucket = [s for s in samples if lo <= s[1] < hi or (i == bins - 1 and s[1] == 1.0)]
+        if not bucket:
+            continue
+        conf = statistics.mean(s[1] for s in bucket)
+        acc = statistics.mean(1.0 if s[2] else 0.0 for s in bucket)
+        ece += len(bucket) / len(samples) * abs(conf - acc)
+        print(f"{lo:>5.1f}-{hi:<5.1f} {len(bucket):>5} {conf:>10.3f} {acc:>8.3f}")
+    brier = statistics.mean((s[1] - (1.0 if s[2] else 0.0)) ** 2 for s in samples)
+    print(f"ECE: {ece:.4f}  Brier: {brier:.4f}")
+
+
+def report_thresholds(samples):
+    print("\n[임계값별 로컬 처리율 / 처리분 정확도]")
+    print(f"{'임계값':>6} {'처리율':>8} {'정확도':>8}")
+    for threshold in (0.5, 0.6, 0.7, 0.8, 0.85, 0.9, 0.95):
+        accepted = [s for s in samples if s[1] >= threshold]
+        coverage = len(accepted) / len(samples)
+        accuracy = (
+            statistics.mean(1.0 if s[2] else 0.0 for s in accepted) if accepted else float("nan")
+        )
+        print(f"{threshold:>6.2f} {coverage:>8.1%} {accuracy:>8.1%}")
+
+
+def report_latency(classifier: IntentClassifier, rows, repeats: int):
+    timings = []
+    for _ in range(repeats):
+        for row in rows:
+            start = time.perf_counter()
+            classifier.classify(row["query"])
+            timings.append((time.perf_counter() - start) * 1e6)
+    timings.sort()
+    p50 = timings[len(timings) // 2]
+    p99 = timings[int(len(timings) * 0.99) - 1]
+    print("\n[지연 시간]")
+    print(f"호출 {len(timings)}회  평균 {statistics.mean(timings):.1f}µs  "
+          f"p50 {p50:.1f}µs  p99 {p99:.1f}µs")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 의도 분류기 벤치마크")
+    parser.add_argument("--dataset", type=Path, default=DEFAULT_DATASET)
+    parser.add_argument("--repeats", type=int, default=50, help="지연 시간 측정 반복 횟수")
+    parser.add_argument("--fit", action="store_true", help="Platt 보정 계수 재학습")
+    parser.add_argument("--write", action="store_true", help="학습한 계수를 어휘 파일에 저장")
+    args = parser.parse_args()
+
+    classifier = IntentClassifier()
+    rows = load_dataset(args.dataset)
+
+    if args.fit:
+        a, b = fit_platt(evaluate(classifier, rows))
+        print(f"Platt 계수: a={a} b={b} (기존 a={classifier.calibration_a} b={classifier.calibration_b})")
+        classifier.calibration_a, classifier.calibration_b = a, b
+        if args.write:
+            with open(classifier.lexicon_path, encoding="utf-8") as f:
+                lexicon = json.load(f)
+            lexicon["calibration"] = {"a": a, "b": b}
+            with open(classifier.lexicon_path, "w", encoding="utf-8") as f:
+                f.write(dump_lexicon(lexicon))
+            print(f"저장: {classifier.lexicon_path}")
+
+    samples = evaluate(classifier, rows)
+
+    print(f"[정확도] 쿼리 {len(rows)}개")
+    for field in FIELDS:
+        acc = statistics.mean(1.0 if s[3][field] else 0.0 for s in samples)
+        print(f"  {field:<15} {acc:.1%}")
+    print(f"  {'전체 일치':<15} {statistics.mean(1.0 if s[2] else 0.0 for s in samples):.1%}")
+
+    report_calibration(samples)
+    report_thresholds(samples)
+    report_latency(classifier, rows, args.repeats)
+
+
+if __name__ == "__main__":
+    main()
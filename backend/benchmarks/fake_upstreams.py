@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+부하 테스트용 가짜 업스트림 서버
+Gemini(generateContent / streamGenerateContent), Brave Search, DuckDuckGo HTML을 흉내 내며
+업스트림별로 지연 분포(로그 정규), 오류(5xx) 비율, 429 비율을 설정할 수 있습니다.
+받은 요청 수는 업스트림/상태 코드별로 셉니다 (GET /_stats).
+
+단독 실행 (backend 디렉터리에서):
+    python benchmarks/fake_upstreams.py --port 9100 --gemini 0.8:0.4:0.01:0.02
+    # 백엔드는 다음 환경 변수로 실행
+    GEMINI_API_URL=http://127.0.0.1:9100/v1beta/models \\
+    BRAVE_SEARCH_URL=http://127.0.0.1:9100/brave/res/v1/web/search \\
+    DUCKDUCKGO_SEARCH_URL=http://127.0.0.1:9100/ddg/html/ \\
+    uvicorn app.main:app
+"""
+import argparse
+import asyncio
+import json
+import math
+import random
+import re
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import HTMLResponse, JSONResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+DDG_PAGE = Path(__file__).resolve().parent / "data" / "ddg" / "typical.html"
+
+INTENTS = ["정보 검색", "콘텐츠 생성", "문제 해결", "학습/교육", "창작"]
+OUTPUT_TYPES = ["블로그", "리포트", "에세이", "분석", "가이드", "튜토리얼"]
+
+
+@dataclass
+class UpstreamProfile:
+    """업스트림 하나의 응답 특성"""
+
+    median: float = 0.2  # 지연 중앙값(초)
+    sigma: float = 0.3  # 로그 정규 분포의 표준편차 (0이면 고정 지연)
+    error_rate: float = 0.0  # 503 응답 비율
+    rate_limit_rate: float = 0.0  # 429 응답 비율
+
+    @classmethod
+    def parse(cls, spec: str) -> "UpstreamProfile":
+        """
+        "중앙값[:sigma[:오류율[:429 비율]]]" 형식을 파싱합니다.
+
+        예: "0.8:0.4:0.01:0.02"
+        """
+        defaults = cls()
+        values = [float(v) if v else None for v in spec.split(":")]
+        values += [None] * (4 - len(values))
+        return cls(
+            median=defaults.median if values[0] is None else values[0],
+            sigma=defaults.sigma if values[1] is None else values[1],
+            error_rate=defaults.error_rate if values[2] is None else values[2],
+            rate_limit_rate=defaults.rate_limit_rate if values[3] is None else values[3],
+        )
+
+    def latency(self, rng: random.Random) -> float:
+        return self.median * math.exp(self.sigma * rng.gauss(0.0, 1.0))
+
+    def failure(self, rng: random.Random) -> Optional[int]:
+        """이번 요청에 주입할 실패 상태 코드 (없으면 None)"""
+        roll = rng.random()
+        if roll < self.rate_limit_rate:
+            return 429
+        if roll < self.rate_limit_rate + self.error_rate:
+            return 503
+        return None
+
+
+def _intent_json(prompt: str, rng: random.Random) -> Dict:
+    match = re.search(r'사용자 쿼리:\s*"?([^"\n]+)', prompt)
+    words = (match.group(1) if match else "테스트 쿼리").split()
+    return {
+        "primary_intent": rng.choice(INTENTS),
+        "keywords": words[:5] or ["테스트"],
+        "target_audience": "일반 사용자",
+        "output_type": rng.choice(OUTPUT_TYPES),
+        "domain": "일반",
+        "confidence": round(rng.uniform(0.7, 0.95), 2),
+    }
+
+
+def _trends_json(rng: random.Random) -> Dict:
+    return {
+        "trends": [f"가짜 트렌드 {i + 1} ({rng.randint(100, 999)})" for i in range(10)],
+        "summary": "부하 테스트용 가짜 요약입니다. 실제 검색 결과를 반영하지 않습니다.",
+    }
+
+
+class FakeUpstreams:
+    """가짜 업스트림 서버 앱과 요청 카운터"""
+
+    def __init__(
+        self,
+        gemini: UpstreamProfile,
+        brave: UpstreamProfile,
+        duckduckgo: UpstreamProfile,
+        seed: Optional[int] = None,
+    ):
+        self.profiles = {"gemini": gemini, "brave": brave, "duckduckgo": duckduckgo}
+        self.rng = random.Random(seed)
+        self.counts: Counter = Counter()
+        self.ddg_page = DDG_PAGE.read_text(encoding="utf-8")
+        self.app = Starlette(routes=[
+            Route("/v1beta/models/{model}:generateContent", self.generate, methods=["POST"]),
+            Route("/v1beta/models/{model}:streamGenerateContent", self.stream, methods=["POST"]),
+            Route("/brave/res/v1/web/search", self.brave),
+            Route("/ddg/html/", self.duckduckgo),
+            Route("/_stats", self.stats),
+            Route("/_reset", self.reset, methods=["POST"]),
+        ])
+
+    def urls(self, base: str) -> Dict[str, str]:
+        """백엔드에 넘길 URL 설정 (환경 변수 이름 → 값)"""
+        return {
+            "GEMINI_API_URL": f"{base}/v1beta/models",
+            "BRAVE_SEARCH_URL": f"{base}/brave/res/v1/web/search",
+            "DUCKDUCKGO_SEARCH_URL": f"{base}/ddg/html/",
+        }
+
+    async def _simulate(self, upstream: str) -> Optional[Response]:
+        """지연을 기다린 뒤, 실패를 주입할 차례면 오류 응답을 반환합니다."""
+        profile = self.profiles[upstream]
+        await asyncio.sleep(profile.latency(self.rng))
+        status = profile.failure(self.rng)
+        if status is None:
+            self.counts[(upstream, "200")] += 1
+            return None
+        self.counts[(upstream, str(status))] += 1
+        headers = {"Retry-After": "1"} if status == 429 else None
+        return JSONResponse({"error": {"code": status}}, status_code=status, headers=headers)
+
+    async def _gemini_text(self, request: Request) -> str:
+        body = await request.json()
+        prompt = body["contents"][0]["parts"][0]["text"]
+        if '"trends"' in prompt:
+            return json.dumps(_trends_json(self.rng), ensure_ascii=False)
+        return json.dumps(_intent_json(prompt, self.rng), ensure_ascii=False)
+
+    async def generate(self, request: Request) -> Response:
+        failure = await self._simulate("gemini")
+        if failure is not None:
+            return failure
+        text = await self._gemini_text(request)
+        return JSONResponse({
+            "candidates": [{"content": {"parts": [{"text": text}]}}],
+            "usageMetadata": {"totalTokenCount": len(text) // 2 + 200},
+        })
+
+    async def stream(self, request: Request) -> Response:
+        # 지연은 첫 조각까지의 시간으로 적용
+        failure = await self._simulate("gemini")
+        if failure is not None:
+            return failure
+        text = await self._gemini_text(request)
+
+        async def events():
+            size = max(1, len(text) // 8)
+            for start in range(0, len(text), size):
+                chunk = {"candidates": [{"content": {"parts": [{"text": text[start:start + size]}]}}]}
+                yield f"data: {json.dumps(chunk, ensure_ascii=False)}\r\n\r\n"
+                await asyncio.sleep(0.01)
+            usage = {"usageMetadata": {"totalTokenCount": len(text) // 2 + 200}}
+            yield f"data: {json.dumps(usage)}\r\n\r\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    async def brave(self, request: Request) -> Response:
+        failure = await self._simulate("brave")
+        if failure is not None:
+            return failure
+        query = request.query_params.get("q", "")
+        count = int(request.query_params.get("count", 3))
+        return JSONResponse({"web": {"results": [
+            {
+                "title": f"{query} 결과 {i + 1}",
+                "description": f"{query}에 대한 가짜 검색 결과 {i + 1}",
+                "url": f"https://example.com/brave/{i + 1}",
+            }
+            for i in range(count)
+        ]}})
+
+    async def duckduckgo(self, request: Request) -> Response:
+        failure = await self._simulate("duckduckgo")
+        if failure is not None:
+            return failure
+        return HTMLResponse(self.ddg_page)
+
+    async def stats(self, request: Request) -> Response:
+        return JSONResponse(self.snapshot())
+
+    async def reset(self, request: Request) -> Response:
+        self.counts.clear()
+        return JSONResponse({"reset": True})
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        """업스트림별 상태 코드별 요청 수"""
+        result: Dict[str, Dict[str, int]] = {}
+        for (upstream, status), count in sorted(self.counts.items()):
+            result.setdefault(upstream, {})[status] = count
+        return result
+
+
+def add_profile_arguments(parser: argparse.ArgumentParser) -> None:
+    """업스트림 프로필 옵션 (load_test.py와 공유)"""
+    spec = "중앙값[:sigma[:오류율[:429 비율]]]"
+    parser.add_argument("--gemini", default="0.8:0.4", help=f"Gemini 응답 특성 ({spec})")
+    parser.add_argument("--brave", default="0.3:0.3", help=f"Brave 응답 특성 ({spec})")
+    parser.add_argument("--duckduckgo", default="0.5:0.5", help=f"DuckDuckGo 응답 특성 ({spec})")
+    parser.add_argument("--seed", type=int, default=None, help="지연/실패 난수 시드")
+
+
+def build_upstreams(args: argparse.Namespace) -> FakeUpstreams:
+    return FakeUpstreams(
+        gemini=UpstreamProfile.parse(args.gemini),
+        brave=UpstreamProfile.parse(args.brave),
+        duckduckgo=UpstreamProfile.parse(args.duckduckgo),
+        seed=args.seed,
+    )
+
+
+def main() -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="가짜 Gemini / Brave / DuckDuckGo 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    upstreams = build_upstreams(args)
+    for name, value in upstreams.urls(f"http://{args.host}:{args.port}").items():
+        print(f"{name}={value}")
+    uvicorn.run(upstreams.app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
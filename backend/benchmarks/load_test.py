@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+파이프라인 부하 테스트
+가짜 업스트림 서버(fake_upstreams.py)와 그 서버를 바라보는 백엔드를 각각 별도 프로세스로 띄우고,
+지정한 동시성으로 엔드포인트를 호출해 처리량, 엔드포인트별 p50/p95/p99 지연, 업스트림 호출 수를 보고합니다.
+실제 API 키나 네트워크 없이 같은 조건으로 반복 실행할 수 있습니다.
+
+사용법 (backend 디렉터리에서):
+    python benchmarks/load_test.py --concurrency 20 --duration 30
+    python benchmarks/load_test.py --endpoint analyze --endpoint pipeline --gemini 1.0:0.5:0.02:0.05
+    python benchmarks/load_test.py --output result.json
+    python benchmarks/load_test.py --compare result.json --tolerance 0.2   # 회귀 시 종료 코드 1
+
+캐시 모드:
+    cold (기본) - 의도/검색/트렌드 캐시와 로컬 분류기를 끄고 매 요청이 업스트림까지 가게 함
+    warm        - 기본 설정 그대로, 소수의 쿼리를 반복해 캐시 적중 경로를 측정
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+BENCH_DIR = Path(__file__).resolve().parent
+BACKEND_DIR = BENCH_DIR.parent
+sys.path.insert(0, str(BENCH_DIR))
+
+from fake_upstreams import add_profile_arguments  # noqa: E402
+
+ENDPOINTS = {
+    "analyze": "/api/analyze",
+    "pipeline": "/api/pipeline",
+    "stream": "/api/pipeline/stream",
+}
+
+QUERIES = [
+    "겨울 서울 데이트 코스 추천 글 써야 해",
+    "2025년 반도체 산업 투자 전망 정리",
+    "파이썬 비동기 프로그래밍 튜토리얼 작성",
+    "중학생 대상 기후 변화 수업 자료",
+    "스타트업 마케팅 전략 보고서",
+    "제주도 3박 4일 가족 여행 계획",
+    "재택근무 생산성 향상 방법",
+    "AI 이미지 생성 도구 비교 분석",
+]
+
+COLD_ENV = {
+    "INTENT_CACHE_ENABLED": "false",
+    "INTENT_FAST_PATH_ENABLED": "false",
+    "SEARCH_CACHE_ENABLED": "false",
+    "TREND_CACHE_ENABLED": "false",
+}
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """최근접 순위 백분위수"""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, round(q * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def wait_ready(url: str, process: subprocess.Popen, timeout: float = 30.0) -> None:
+    end = time.monotonic() + timeout
+    while time.monotonic() < end:
+        if process.poll() is not None:
+            raise RuntimeError(f"프로세스가 종료됨 (코드 {process.returncode}): {url}")
+        try:
+            httpx.get(url, timeout=1.0)
+            return
+        except httpx.TransportError:
+            time.sleep(0.1)
+    raise RuntimeError(f"준비 시간 초과: {url}")
+
+
+def start_processes(args: argparse.Namespace) -> Tuple[str, str, List[subprocess.Popen]]:
+    """가짜 업스트림과 백엔드를 띄우고 (백엔드 URL, 업스트림 URL, 프로세스 목록)을 반환합니다."""
+    upstream_port, backend_port = free_port(), free_port()
+    upstream_url = f"http://127.0.0.1:{upstream_port}"
+    backend_url = f"http://127.0.0.1:{backend_port}"
+    processes = []
+
+    upstream_cmd = [
+        sys.executable, str(BENCH_DIR / "fake_upstreams.py"),
+        "--port", str(upstream_port),
+        "--gemini", args.gemini, "--brave", args.brave, "--duckduckgo", args.duckduckgo,
+    ]
+    if args.seed is not None:
+        upstream_cmd += ["--seed", str(args.seed)]
+    processes.append(subprocess.Popen(upstream_cmd, stdout=subprocess.DEVNULL))
+    wait_ready(f"{upstream_url}/_stats", processes[-1])
+
+    env = {
+        **os.environ,
+        "GOOGLE_GEMINI_API_KEY": "loadtest",
+        "HTTP_WARMUP": "false",
+        "GEMINI_API_URL": f"{upstream_url}/v1beta/models",
+        "BRAVE_SEARCH_URL": f"{upstream_url}/brave/res/v1/web/search",
+        "DUCKDUCKGO_SEARCH_URL": f"{upstream_url}/ddg/html/",
+        "SEARCH_ENGINE": args.search_engine,
+    }
+    if args.search_engine == "brave" or args.hedging:
+        env["BRAVE_SEARCH_API_KEY"] = "loadtest"
+    if args.hedging:
+        env["SEARCH_HEDGING_ENABLED"] = "true"
+    if args.cache_mode == "cold":
+        env.update(COLD_ENV)
+    for item in args.env:
+        name, _, value = item.partition("=")
+        env[name] = value
+
+    backend_cmd = [
+        sys.executable, "-m", "uvicorn", "app.main:app",
+        "--host", "127.0.0.1", "--port", str(backend_port),
+        "--log-level", "warning", "--no-access-log",
+    ]
+    output = None if args.verbose else subprocess.DEVNULL
+    processes.append(subprocess.Popen(
+        backend_cmd, cwd=BACKEND_DIR, env=env, stdout=output, stderr=output
+    ))
+    wait_ready(f"{backend_url}/health", processes[-1])
+    return backend_url, upstream_url, processes
+
+
+async def drive(
+    backend_url: str,
+    endpoints: List[str],
+    concurrency: int,
+    duration: float,
+    max_requests: Optional[int],
+    cache_mode: str,
+) -> Tuple[List[Tuple[str, int, float]], float]:
+    """
+    closed-loop 부하: 작업자마다 응답을 받으면 곧바로 다음 요청을 보냅니다.
+    Returns: ([(엔드포인트, 상태 코드, 지연 초)], 경과 시간)
+    """
+    samples: List[Tuple[str, int, float]] = []
+    counter = iter(range(sys.maxsize))
+    end = time.monotonic() + duration
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=backend_url, limits=limits, timeout=120.0) as client:
+        async def worker() -> None:
+            while time.monotonic() < end:
+                n = next(counter)
+                if max_requests is not None and n >= max_requests:
+                    return
+                endpoint = endpoints[n % len(endpoints)]
+                query = QUERIES[n % len(QUERIES)]
+                if cache_mode == "cold":
+                    query = f"{query} #{n}"
+
+                start = time.perf_counter()
+                try:
+                    async with client.stream(
+                        "POST", ENDPOINTS[endpoint], json={"query": query}
+                    ) as response:
+                        await response.aread()
+                        status = response.status_code
+                except httpx.HTTPError:
+                    status = 0
+                samples.append((endpoint, status, time.perf_counter() - start))
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return samples, time.perf_counter() - started
+
+
+def summarize(samples: List[Tuple[str, int, float]], elapsed: float) -> Dict:
+    by_endpoint: Dict[str, List[Tuple[int, float]]] = defaultdict(list)
+    for endpoint, status, latency in samples:
+        by_endpoint[endpoint].append((status, latency))
+
+    endpoints = {}
+    for endpoint, rows in sorted(by_endpoint.items()):
+        latencies = sorted(latency for _, latency in rows)
+        endpoints[endpoint] = {
+            "requests": len(rows),
+            "errors": sum(1 for status, _ in rows if status != 200),
+            "throughput": round(len(rows) / elapsed, 3),
+            "p50": round(percentile(latencies, 0.50), 4),
+            "p95": round(percentile(latencies, 0.95), 4),
+            "p99": round(percentile(latencies, 0.99), 4),
+            "max": round(latencies[-1], 4),
+        }
+    return {
+        "elapsed": round(elapsed, 3),
+        "requests": len(samples),
+        "throughput": round(len(samples) / elapsed, 3) if elapsed else 0.0,
+        "endpoints": endpoints,
+    }
+
+
+def backend_fallbacks(backend_url: str) -> Dict[str, float]:
+    """백엔드 /metrics의 app_fallback_total 값"""
+    fallbacks = {}
+    for line in httpx.get(f"{backend_url}/metrics", timeout=5.0).text.splitlines():
+        if line.startswith("app_fallback_total{"):
+            labels, value = line.rsplit(" ", 1)
+            fallbacks[labels.split('"')[1]] = float(value)
+    return fallbacks
+
+
+def print_report(report: Dict) -> None:
+    config = report["config"]
+    print(f"동시성 {config['concurrency']}, 캐시 모드 {config['cache_mode']}, "
+          f"{report['requests']}건 / {report['elapsed']:.1f}s "
+          f"= {report['throughput']:.2f} req/s")
+    print()
+    print(f"{'endpoint':<10} {'요청':>6} {'오류':>5} {'req/s':>8} "
+          f"{'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}")
+    for endpoint, row in report["endpoints"].items():
+        print(f"{endpoint:<10} {row['requests']:>6} {row['errors']:>5} {row['throughput']:>8.2f} "
+              f"{row['p50']:>8.3f} {row['p95']:>8.3f} {row['p99']:>8.3f} {row['max']:>8.3f}")
+    print()
+    print("업스트림 호출 (상태 코드별):")
+    for upstream, counts in report["upstream_calls"].items():
+        total = sum(counts.values())
+        detail = ", ".join(f"{status}: {count}" for status, count in counts.items())
+        per_request = total / report["requests"] if report["requests"] else 0.0
+        print(f"  {upstream:<11} {total:>6}  ({detail})  요청당 {per_request:.2f}")
+    if report["fallbacks"]:
+        print("폴백:", ", ".join(f"{k}={v:.0f}" for k, v in report["fallbacks"].items()))
+
+
+def compare(report: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """기준 결과 대비 처리량 감소나 p95 증가가 허용치를 넘은 항목"""
+    regressions = []
+    for endpoint, row in report["endpoints"].items():
+        base = baseline.get("endpoints", {}).get(endpoint)
+        if base is None:
+            continue
+        if row["throughput"] < base["throughput"] * (1 - tolerance):
+            regressions.append(
+                f"{endpoint} 처리량 {base['throughput']:.2f} → {row['throughput']:.2f} req/s"
+            )
+        if row["p95"] > base["p95"] * (1 + tolerance):
+            regressions.append(f"{endpoint} p95 {base['p95']:.3f} → {row['p95']:.3f}s")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="가짜 업스트림을 이용한 파이프라인 부하 테스트")
+    parser.add_argument("--endpoint", action="append", choices=sorted(ENDPOINTS),
+                        help="호출할 엔드포인트 (여러 번 지정하면 번갈아 호출, 기본: analyze)")
+    parser.add_argument("--concurrency", type=int, default=10, help="동시 요청 수")
+    parser.add_argument("--duration", type=float, default=20.0, help="측정 시간(초)")
+    parser.add_argument("--requests", type=int, default=None, help="최대 요청 수")
+    parser.add_argument("--warmup", type=int, default=5, help="측정 전 버리는 요청 수")
+    parser.add_argument("--cache-mode", choices=["cold", "warm"], default="cold")
+    parser.add_argument("--search-engine", choices=["duckduckgo", "brave"], default="duckduckgo")
+    parser.add_argument("--hedging", action="store_true", help="헤지 검색 사용")
+    parser.add_argument("--env", action="append", default=[], metavar="KEY=VALUE",
+                        help="백엔드 환경 변수 추가 (예: GEMINI_REQUESTS_PER_MINUTE=100000)")
+    parser.add_argument("--output", type=Path, help="결과 JSON 저장 경로")
+    parser.add_argument("--compare", type=Path, help="비교할 기준 결과 JSON")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="허용 회귀 비율")
+    parser.add_argument("--verbose", action="store_true", help="백엔드 로그 출력")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    endpoints = args.endpoint or ["analyze"]
+
+    backend_url, upstream_url, processes = start_processes(args)
+    try:
+        if args.warmup:
+            asyncio.run(drive(backend_url, endpoints, min(args.concurrency, args.warmup),
+                              3600.0, args.warmup, args.cache_mode))
+            httpx.post(f"{upstream_url}/_reset")
+
+        samples, elapsed = asyncio.run(drive(
+            backend_url, endpoints, args.concurrency, args.duration,
+            args.requests, args.cache_mode,
+        ))
+        report = summarize(samples, elapsed)
+        report["upstream_calls"] = httpx.get(f"{upstream_url}/_stats").json()
+        report["fallbacks"] = backend_fallbacks(backend_url)
+        report["config"] = {
+            "endpoints": endpoints,
+            "concurrency": args.concurrency,
+            "cache_mode": args.cache_mode,
+            "search_engine": args.search_engine,
+            "hedging": args.hedging,
+            "gemini": args.gemini,
+            "brave": args.brave,
+            "duckduckgo": args.duckduckgo,
+            "env": args.env,
+        }
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.wait(timeout=10)
+
+    print_report(report)
+
+    if args.output:
+        args.output.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"\n결과 저장: {args.output}")
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        regressions = compare(report, baseline, args.tolerance)
+        if regressions:
+            print(f"\n회귀 감지 (허용치 {args.tolerance:.0%}):")
+            for line in regressions:
+                print(f"  - {line}")
+            return 1
+        print(f"\n기준 대비 회귀 없음 (허용치 {args.tolerance:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
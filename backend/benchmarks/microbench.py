@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+요청당 CPU 비용 마이크로 벤치마크
+프롬프트 템플릿 5종, 확인 메시지 렌더링, LLM 응답 JSON 추출, DuckDuckGo HTML 파싱,
+GeneratedPrompts / AnalysisResponse 검증·직렬화, /api/pipeline 응답 렌더링을 고정 입력(benchmarks/data)으로 측정합니다.
+
+측정값:
+    ops/s       - timeit 자동 반복 횟수로 여러 번 돌린 뒤 회차별 시간의 중앙값 기준
+    peak alloc  - 1회 실행 중 최대 추가 메모리 (tracemalloc, 바이트)
+
+기준값(benchmarks/baselines/microbench.json)과 비교해 허용치를 넘는 회귀가 있으면 종료 코드 1을 반환합니다.
+ops/s는 머신에 따라 달라지므로 기준값은 같은 머신에서 --update로 갱신해 쓰세요.
+1회 10µs 미만의 항목은 타이머/캐시 잡음이 커서 속도 허용치를 따로(--max-slowdown-fast) 둡니다.
+허용치를 넘은 항목은 --confirm 횟수만큼 다시 측정해 매번 느릴 때만 회귀로 판정합니다.
+
+사용법 (backend 디렉터리에서):
+    python benchmarks/microbench.py
+    python benchmarks/microbench.py --filter prompt. --repeats 30
+    python benchmarks/microbench.py --update                        # 기준값 갱신
+    python benchmarks/microbench.py --max-slowdown 0.3 --max-alloc-growth 0.1
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import timeit
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+os.environ.setdefault("GOOGLE_GEMINI_API_KEY", "benchmark")
+os.environ.setdefault("HTTP_WARMUP", "false")
+
+from app.main import AnalysisResponse, PromptsResponse, pipeline_payload  # noqa: E402
+from app.models.schemas import GeneratedPrompts, IntentAnalysisResult, TrendResult  # noqa: E402
+from app.services.confirmation_module import ConfirmationModule  # noqa: E402
+from app.services.ddg_parser import PARSER_BACKENDS, create_parser  # noqa: E402
+from app.services.json_stream import IncrementalJSONArrayParser, extract_json  # noqa: E402
+from app.services.prompt_generator import PromptGenerator  # noqa: E402
+from app.services.serialization import FastJSONResponse  # noqa: E402
+
+DATA_DIR = Path(__file__).resolve().parent / "data"
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baselines" / "microbench.json"
+
+# 이보다 빠른(1회 10µs 미만) 항목은 --max-slowdown-fast 적용
+FAST_CASE_OPS_PER_SEC = 100_000
+
+
+def run_sync(coroutine) -> Any:
+    """await 지점이 없는 코루틴을 이벤트 루프 없이 실행합니다."""
+    try:
+        coroutine.send(None)
+    except StopIteration as stop:
+        return stop.value
+    raise RuntimeError("코루틴이 대기 상태로 멈췄습니다")
+
+
+def build_cases() -> Dict[str, Callable[[], Any]]:
+    """측정할 함수 목록 (이름 → 인자 없는 함수)"""
+    fixture = json.loads((DATA_DIR / "pipeline_fixture.json").read_text(encoding="utf-8"))
+    query = fixture["query"]
+    intent = IntentAnalysisResult(**fixture["intent"])
+    trends = TrendResult(**fixture["trends"])
+    generator = PromptGenerator()
+
+    prompts = run_sync(generator.generate_all(query, trends, intent))
+    prompts_dict = prompts.model_dump(mode="json")
+    analysis = AnalysisResponse(
+        query=query,
+        intent=intent,
+        trends=trends,
+        confirmation_message=ConfirmationModule.generate_confirmation_message(query, intent, trends),
+        analysis_id="benchmark",
+    )
+    analysis_dict = analysis.model_dump(mode="json")
+    pipeline = pipeline_payload(analysis, PromptsResponse(
+        prompts=prompts,
+        selection_message=ConfirmationModule.generate_strategy_selection_message(len(prompts.prompts)),
+    ))
+    pipeline_response = FastJSONResponse(None)
+
+    trends_text = fixture["llm_trends_text"]
+    trend_chunks = [trends_text[i:i + 24] for i in range(0, len(trends_text), 24)]
+
+    def incremental_trends() -> Dict:
+        parser = IncrementalJSONArrayParser("trends")
+        for chunk in trend_chunks:
+            parser.feed(chunk)
+        return parser.result()
+
+    cases: Dict[str, Callable[[], Any]] = {}
+    for strategy_type, generate in generator.strategies.items():
+        cases[f"prompt.{strategy_type.value}"] = (
+            lambda generate=generate: generate(query, trends, intent)
+        )
+    cases["prompt.generate_all"] = lambda: run_sync(generator.generate_all(query, trends, intent))
+    cases["confirmation.render"] = (
+        lambda: ConfirmationModule.generate_confirmation_message(query, intent, trends)
+    )
+    cases["json.extract_intent"] = lambda: extract_json(fixture["llm_intent_text"])
+    cases["json.extract_trends"] = lambda: extract_json(trends_text)
+    cases["json.incremental_trends"] = incremental_trends
+
+    html = (DATA_DIR / "ddg" / "typical.html").read_text(encoding="utf-8")
+    for backend in PARSER_BACKENDS:
+        cases[f"ddg.parse.{backend}"] = lambda backend=backend: create_parser(backend, 3).parse(html)
+
+    cases["schema.generated_prompts.validate"] = lambda: GeneratedPrompts.model_validate(prompts_dict)
+    cases["schema.generated_prompts.dump_json"] = prompts.model_dump_json
+    cases["schema.analysis_response.validate"] = lambda: AnalysisResponse.model_validate(analysis_dict)
+    cases["schema.analysis_response.dump_json"] = analysis.model_dump_json
+    cases["response.pipeline.render"] = lambda: pipeline_response.render(pipeline)
+    return cases
+
+
+def measure_speed(fn: Callable[[], Any], repeats: int) -> float:
+    """초당 실행 횟수 (회차별 시간의 중앙값 기준, 한두 회차의 튀는 값에 흔들리지 않음)"""
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    return number / statistics.median(timer.repeat(repeat=repeats, number=number))
+
+
+def measure_peak_alloc(fn: Callable[[], Any]) -> int:
+    """1회 실행의 최대 추가 메모리(바이트)"""
+    fn()  # 지연 초기화/캐시를 측정에서 제외
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak - base
+
+
+def min_allowed_ops(base: Dict[str, float], max_slowdown: float, max_slowdown_fast: float) -> float:
+    """기준값 대비 허용하는 최저 ops/s"""
+    slowdown = max_slowdown_fast if base["ops_per_sec"] >= FAST_CASE_OPS_PER_SEC else max_slowdown
+    return base["ops_per_sec"] * (1 - slowdown)
+
+
+def check(
+    results: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    max_slowdown: float,
+    max_alloc_growth: float,
+    max_slowdown_fast: float,
+) -> List[str]:
+    """허용치를 넘은 회귀 목록"""
+    regressions = []
+    for name, row in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        if row["ops_per_sec"] < min_allowed_ops(base, max_slowdown, max_slowdown_fast):
+            regressions.append(
+                f"{name}: {base['ops_per_sec']:,.0f} → {row['ops_per_sec']:,.0f} ops/s "
+                f"({row['ops_per_sec'] / base['ops_per_sec'] - 1:+.0%})"
+            )
+        # 작은 값의 흔들림은 무시 (1 KiB 미만 증가)
+        allowed = max(base["peak_alloc_bytes"] * (1 + max_alloc_growth), base["peak_alloc_bytes"] + 1024)
+        if row["peak_alloc_bytes"] > allowed:
+            regressions.append(
+                f"{name}: peak alloc {base['peak_alloc_bytes']:,} → {row['peak_alloc_bytes']:,} bytes"
+            )
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="요청당 CPU 비용 마이크로 벤치마크")
+    parser.add_argument("--filter", default="", help="이름에 이 문자열이 포함된 항목만 실행")
+    parser.add_argument("--repeats", type=int, default=15, help="측정 회차 수 (중앙값 계산)")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--update", action="store_true", help="측정값으로 기준값 파일 갱신")
+    parser.add_argument("--max-slowdown", type=float, default=0.25,
+                        help="허용하는 ops/s 감소 비율")
+    parser.add_argument("--max-slowdown-fast", type=float, default=0.40,
+                        help="1회 10µs 미만 항목에 허용하는 ops/s 감소 비율")
+    parser.add_argument("--confirm", type=int, default=2,
+                        help="속도 회귀로 보이는 항목을 다시 측정하는 횟수 (모두 느려야 회귀)")
+    parser.add_argument("--max-alloc-growth", type=float, default=0.10,
+                        help="허용하는 최대 추가 메모리 증가 비율")
+    args = parser.parse_args()
+
+    cases = {name: fn for name, fn in build_cases().items() if args.filter in name}
+    if not cases:
+        print(f"'{args.filter}'에 해당하는 항목이 없습니다")
+        return 1
+
+    baseline_file: Dict[str, Any] = {}
+    if args.baseline.exists():
+        baseline_file = json.loads(args.baseline.read_text(encoding="utf-8"))
+    baseline = baseline_file.get("results", {})
+
+    results: Dict[str, Dict[str, float]] = {}
+    print(f"{'benchmark':<36} {'ops/s':>12} {'peak alloc':>12} {'vs baseline':>12}")
+    for name, fn in cases.items():
+        results[name] = {
+            "ops_per_sec": round(measure_speed(fn, args.repeats), 1),
+            "peak_alloc_bytes": measure_peak_alloc(fn),
+        }
+        row, base = results[name], baseline.get(name)
+        delta = f"{row['ops_per_sec'] / base['ops_per_sec'] - 1:+.1%}" if base else "-"
+        print(f"{name:<36} {row['ops_per_sec']:>12,.0f} {row['peak_alloc_bytes']:>12,} {delta:>12}")
+
+    if args.update:
+        merged = {**baseline, **results}
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps({
+            "python": platform.python_version(),
+            "machine": f"{platform.system()} {platform.machine()}",
+            "results": dict(sorted(merged.items())),
+        }, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+        print(f"\n기준값 갱신: {args.baseline}")
+        return 0
+
+    if not baseline:
+        print(f"\n기준값 없음: {args.baseline} (--update로 생성)")
+        return 0
+
+    # 느려 보이는 항목은 다시 측정해 일시적인 잡음(다른 프로세스, CPU 클럭)인지 확인.
+    # 여러 번 측정한 중앙값 중 가장 빠른 값을 쓰므로 매번 느린 경우만 회귀로 남음
+    for attempt in range(args.confirm):
+        slow = [
+            name for name, row in results.items()
+            if name in baseline and row["ops_per_sec"] < min_allowed_ops(
+                baseline[name], args.max_slowdown, args.max_slowdown_fast
+            )
+        ]
+        if not slow:
+            break
+        print(f"\n재측정 {attempt + 1}/{args.confirm}: {', '.join(slow)}")
+        for name in slow:
+            ops = round(measure_speed(cases[name], args.repeats), 1)
+            results[name]["ops_per_sec"] = max(results[name]["ops_per_sec"], ops)
+
+    regressions = check(
+        results, baseline, args.max_slowdown, args.max_alloc_growth, args.max_slowdown_fast
+    )
+    if regressions:
+        print(f"\n회귀 감지 (허용치: 속도 -{args.max_slowdown:.0%} / 10µs 미만 -{args.max_slowdown_fast:.0%}, "
+              f"메모리 +{args.max_alloc_growth:.0%}):")
+        for line in regressions:
+            print(f"  - {line}")
+        return 1
+    print("\n기준값 대비 회귀 없음")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+/api/pipeline 응답 직렬화·압축 벤치마크
+고정 입력(benchmarks/data/pipeline_fixture.json)으로 만든 파이프라인 응답에 대해
+직렬화 방식별 CPU 비용과 압축 방식별 전송 크기/압축 시간을 비교합니다.
+
+직렬화:
+    default  - 기존 경로: jsonable_encoder로 dict 변환 후 JSONResponse(json.dumps)
+    fast     - FastJSONResponse: pydantic-core로 모델을 바로 직렬화
+    orjson   - 참고용: model_dump 후 orjson.dumps (orjson이 설치된 경우)
+
+크기:
+    full / compact 응답 각각에 대해 identity, gzip(레벨별), br(품질별, brotli 설치 시)
+
+사용법 (backend 디렉터리에서):
+    python benchmarks/payload_bench.py
+    python benchmarks/payload_bench.py --repeats 10 --output payload.json
+"""
+import argparse
+import gzip
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+os.environ.setdefault("GOOGLE_GEMINI_API_KEY", "benchmark")
+os.environ.setdefault("HTTP_WARMUP", "false")
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+
+from app.main import AnalysisResponse, PromptsResponse, pipeline_payload  # noqa: E402
+from app.models.schemas import IntentAnalysisResult, TrendResult  # noqa: E402
+from app.services.compression import brotli  # noqa: E402
+from app.services.confirmation_module import ConfirmationModule  # noqa: E402
+from app.services.prompt_generator import PromptGenerator  # noqa: E402
+from app.services.serialization import FastJSONResponse  # noqa: E402
+from microbench import DATA_DIR, measure_speed, run_sync  # noqa: E402
+
+try:
+    import orjson
+except ImportError:  # 참고용 비교 대상
+    orjson = None
+
+GZIP_LEVELS = (1, 6, 9)
+BROTLI_QUALITIES = (4, 5, 6, 11)
+
+
+def build_payloads() -> Dict[str, Dict[str, Any]]:
+    """full / compact 파이프라인 응답 (직렬화 전, 모델이 들어 있는 dict)"""
+    fixture = json.loads((DATA_DIR / "pipeline_fixture.json").read_text(encoding="utf-8"))
+    query = fixture["query"]
+    intent = IntentAnalysisResult(**fixture["intent"])
+    trends = TrendResult(**fixture["trends"])
+
+    prompts = run_sync(PromptGenerator().generate_all(query, trends, intent))
+    analysis = AnalysisResponse(
+        query=query,
+        intent=intent,
+        trends=trends,
+        confirmation_message=ConfirmationModule.generate_confirmation_message(query, intent, trends),
+        analysis_id="benchmark",
+    )
+    prompts_response = PromptsResponse(
+        prompts=prompts,
+        selection_message=ConfirmationModule.generate_strategy_selection_message(len(prompts.prompts)),
+    )
+    return {
+        "full": pipeline_payload(analysis, prompts_response),
+        "compact": pipeline_payload(analysis, prompts_response, compact=True),
+    }
+
+
+def serializers() -> Dict[str, Callable[[Any], bytes]]:
+    default = JSONResponse.render.__get__(JSONResponse(None))
+    fast = FastJSONResponse.render.__get__(FastJSONResponse(None))
+    result = {
+        "default": lambda payload: default(jsonable_encoder(payload)),
+        "fast": fast,
+    }
+    if orjson is not None:
+        result["orjson"] = lambda payload: orjson.dumps(_model_dump(payload))
+    return result
+
+
+def _model_dump(value: Any) -> Any:
+    """orjson이 직렬화할 수 있도록 모델을 dict로 (중첩 dict/list 안의 모델 포함)"""
+    if hasattr(value, "model_dump"):
+        return value.model_dump(mode="json")
+    if isinstance(value, dict):
+        return {key: _model_dump(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_model_dump(item) for item in value]
+    return value
+
+
+def encodings() -> Dict[str, Callable[[bytes], bytes]]:
+    result: Dict[str, Callable[[bytes], bytes]] = {"identity": lambda body: body}
+    for level in GZIP_LEVELS:
+        result[f"gzip-{level}"] = lambda body, level=level: gzip.compress(body, compresslevel=level, mtime=0)
+    if brotli is not None:
+        for quality in BROTLI_QUALITIES:
+            result[f"br-{quality}"] = lambda body, quality=quality: brotli.compress(body, quality=quality)
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="/api/pipeline 응답 직렬화·압축 벤치마크")
+    parser.add_argument("--repeats", type=int, default=5, help="측정 회차 수")
+    parser.add_argument("--output", type=Path, help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    payloads = build_payloads()
+    results: Dict[str, Any] = {"serialize": {}, "encode": {}}
+
+    # 새 직렬화기가 기존과 같은 바이트를 내는지 먼저 확인
+    default_render = serializers()["default"]
+    fast_render = serializers()["fast"]
+    for variant, payload in payloads.items():
+        if default_render(payload) != fast_render(payload):
+            print(f"{variant}: fast 직렬화 결과가 기존과 다릅니다")
+            return 1
+
+    print(f"{'serializer':<20} {'payload':<8} {'ops/s':>10} {'µs/op':>9} {'bytes':>8} {'vs default':>11}")
+    for variant, payload in payloads.items():
+        default_ops = None
+        for name, render in serializers().items():
+            ops = measure_speed(lambda: render(payload), args.repeats)
+            if name == "default":
+                default_ops = ops
+            size = len(render(payload))
+            results["serialize"][f"{name}.{variant}"] = {"ops_per_sec": round(ops, 1), "bytes": size}
+            print(f"{name:<20} {variant:<8} {ops:>10,.0f} {1e6 / ops:>9.1f} {size:>8,} "
+                  f"{ops / default_ops:>10.2f}x")
+
+    print(f"\n{'encoding':<20} {'payload':<8} {'bytes':>8} {'ratio':>7} {'µs/op':>9}")
+    for variant, payload in payloads.items():
+        body = fast_render(payload)
+        for name, encode in encodings().items():
+            size = len(encode(body))
+            ops = measure_speed(lambda: encode(body), args.repeats)
+            results["encode"][f"{name}.{variant}"] = {"bytes": size, "us_per_op": round(1e6 / ops, 1)}
+            print(f"{name:<20} {variant:<8} {size:>8,} {size / len(body):>7.1%} {1e6 / ops:>9.1f}")
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+        print(f"\n결과 저장: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+녹화/재생 기반 파이프라인 벤치마크
+record 모드로 실제(또는 가짜) 업스트림에 /api/pipeline을 실행하며 응답을 cassette에 녹화하고,
+replay 모드로 같은 쿼리를 네트워크 없이 재생해 결정적인 지연 측정과 프로파일링을 합니다.
+앱은 같은 프로세스·같은 스레드에서 실행되므로 cProfile에 파이프라인 전체가 잡힙니다.
+
+사용법 (backend 디렉터리에서):
+    python benchmarks/replay_pipeline.py record --cassette cassettes/demo.jsonl.gz
+    python benchmarks/replay_pipeline.py replay --cassette cassettes/demo.jsonl.gz --timing fast --repeats 20
+    python benchmarks/replay_pipeline.py replay --cassette cassettes/demo.jsonl.gz --profile pipeline.prof
+
+캐시와 로컬 분류기는 꺼서, 재생할 때마다 녹화 때와 같은 업스트림 요청이 나가도록 합니다.
+"""
+import argparse
+import asyncio
+import cProfile
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+DEFAULT_QUERIES = [
+    "겨울 서울 데이트 코스 추천 글 써야 해",
+    "2025년 반도체 산업 투자 전망 정리",
+    "파이썬 비동기 프로그래밍 튜토리얼 작성",
+]
+
+DETERMINISTIC_ENV = {
+    "HTTP_WARMUP": "false",
+    "INTENT_CACHE_ENABLED": "false",
+    "INTENT_FAST_PATH_ENABLED": "false",
+    "SEARCH_CACHE_ENABLED": "false",
+    "TREND_CACHE_ENABLED": "false",
+    "SPECULATIVE_SEARCH_ENABLED": "false",
+    "SEARCH_HEDGING_ENABLED": "false",
+}
+
+
+async def run(queries, repeats: int):
+    import httpx
+    from app.main import app
+    from app.services import llm_client
+
+    timings = {query: [] for query in queries}
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://app", timeout=300) as client:
+            for _ in range(repeats):
+                for query in queries:
+                    start = time.perf_counter()
+                    response = await client.post("/api/pipeline", json={"query": query})
+                    timings[query].append(time.perf_counter() - start)
+                    if response.status_code != 200:
+                        print(f"  {query}: HTTP {response.status_code}")
+        cassette = llm_client.cassette
+        stats = cassette.stats() if hasattr(cassette, "stats") else {"recorded": cassette.recorded}
+    return timings, stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="cassette 녹화/재생 파이프라인 벤치마크")
+    parser.add_argument("mode", choices=["record", "replay"])
+    parser.add_argument("--cassette", type=Path, default=Path("cassettes/pipeline.jsonl.gz"))
+    parser.add_argument("--timing", choices=["original", "fast"], default="original",
+                        help="재생 속도 (original: 녹화된 지연 재현, fast: 대기 없음)")
+    parser.add_argument("--query", action="append", help="실행할 쿼리 (여러 번 지정 가능)")
+    parser.add_argument("--repeats", type=int, default=1, help="쿼리 목록 반복 횟수 (replay)")
+    parser.add_argument("--profile", type=Path, help="cProfile 결과 저장 경로")
+    args = parser.parse_args()
+
+    if args.mode == "record" and args.cassette.exists():
+        parser.error(f"{args.cassette}가 이미 있습니다 (녹화는 파일 끝에 추가되므로 먼저 지우세요)")
+
+    for name, value in DETERMINISTIC_ENV.items():
+        os.environ.setdefault(name, value)
+    if args.mode == "replay":
+        # 재생에는 실제 키가 필요 없음 (녹화할 때는 .env의 키 사용)
+        os.environ.setdefault("GOOGLE_GEMINI_API_KEY", "replay")
+    os.environ["CASSETTE_MODE"] = args.mode
+    os.environ["CASSETTE_PATH"] = str(args.cassette)
+    os.environ["CASSETTE_REPLAY_TIMING"] = args.timing
+
+    queries = args.query or DEFAULT_QUERIES
+    repeats = args.repeats if args.mode == "replay" else 1
+
+    profiler = cProfile.Profile() if args.profile else None
+    if profiler is not None:
+        profiler.enable()
+    timings, stats = asyncio.run(run(queries, repeats))
+    if profiler is not None:
+        profiler.disable()
+        profiler.dump_stats(args.profile)
+
+    print(f"\n{args.mode} ({args.timing if args.mode == 'replay' else 'live'}), cassette {args.cassette}")
+    print(f"{'query':<40} {'n':>3} {'median':>9} {'min':>9} {'max':>9}")
+    for query, values in timings.items():
+        print(f"{query[:40]:<40} {len(values):>3} {statistics.median(values):>9.4f} "
+              f"{min(values):>9.4f} {max(values):>9.4f}")
+    print(f"cassette: {stats}")
+    if args.profile:
+        print(f"프로파일 저장: {args.profile} (python -m pstats {args.profile})")
+
+
+if __name__ == "__main__":
+    main()
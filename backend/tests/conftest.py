@@ -0,0 +1,11 @@
+"""
+백엔드 단위 테스트 공통 설정 (backend 디렉터리에서 python -m pytest tests)
+설정 검증을 통과하도록 가짜 키를 넣고, 외부로 워밍업 요청을 보내지 않습니다.
+"""
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("GOOGLE_GEMINI_API_KEY", "test")
+os.environ.setdefault("HTTP_WARMUP", "false")
@@ -0,0 +1,57 @@
+"""GeminiKeyPool: 키가 하나뿐일 때도 격리를 지키는지"""
+import asyncio
+import time
+
+import pytest
+
+from app.services.key_pool import ApiKey, GeminiKeyPool, KeyQuarantined
+
+
+def _single_key_pool() -> GeminiKeyPool:
+    return GeminiKeyPool([ApiKey("key0-test", "test", 1000, 0)])
+
+
+def test_single_key_quarantine_fails_fast_past_deadline():
+    async def scenario():
+        pool = _single_key_pool()
+        key = await pool.acquire(10)
+        pool.release(key, status=403)  # 600초 격리
+
+        start = time.monotonic()
+        with pytest.raises(KeyQuarantined):
+            await pool.acquire(10, deadline=start + 5)
+        assert time.monotonic() - start < 0.1
+        assert key.requests == 1
+        assert key.inflight == 0
+
+    asyncio.run(scenario())
+
+
+def test_single_key_waits_for_quarantine_within_deadline():
+    async def scenario():
+        pool = _single_key_pool()
+        key = pool.keys[0]
+        key.quarantine(0.2)
+
+        start = time.monotonic()
+        assert await pool.acquire(10, deadline=start + 5) is key
+        assert time.monotonic() >= key.quarantined_until
+        assert time.monotonic() - start >= 0.15
+        pool.release(key)
+
+    asyncio.run(scenario())
+
+
+def test_healthy_key_is_preferred_over_quarantined():
+    async def scenario():
+        pool = GeminiKeyPool([
+            ApiKey("key0-test", "a", 1000, 0),
+            ApiKey("key1-test", "b", 1000, 0),
+        ])
+        pool.keys[0].quarantine(600)
+        for _ in range(3):
+            key = await pool.acquire(10, deadline=time.monotonic() + 1)
+            assert key is pool.keys[1]
+            pool.release(key)
+
+    asyncio.run(scenario())
@@ -0,0 +1,81 @@
+"""TokenBucketLimiter: 마감/취소와 배정이 겹칠 때 슬롯이 새지 않는지"""
+import asyncio
+import heapq
+import time
+
+import pytest
+
+from app.services.rate_limiter import RateLimitTimeout, TokenBucketLimiter
+
+
+def _drained(requests_per_minute: int = 6) -> TokenBucketLimiter:
+    limiter = TokenBucketLimiter(requests_per_minute, 0)
+    limiter._requests = 0.0
+    return limiter
+
+
+def _grant_first(limiter: TokenBucketLimiter) -> None:
+    """_dispatch가 하는 것처럼 맨 앞 대기자에게 슬롯을 배정"""
+    _, _, tokens, future = heapq.heappop(limiter._waiters)
+    limiter._requests += 1.0
+    limiter._take(tokens)
+    future.set_result(None)
+
+
+def test_cancel_racing_grant_returns_slot():
+    async def scenario():
+        limiter = _drained()
+        task = asyncio.create_task(limiter.acquire(10))
+        await asyncio.sleep(0)
+        assert len(limiter._waiters) == 1
+
+        # 배정과 취소가 같은 순간에 일어남
+        _grant_first(limiter)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        # 배정된 슬롯이 버킷에 돌아와 다음 요청이 바로 통과
+        assert limiter._requests >= 1.0
+        assert sum(limiter.granted.values()) == 0
+        await asyncio.wait_for(limiter.acquire(10), 0.1)
+        limiter._dispatcher.cancel()
+
+    asyncio.run(scenario())
+
+
+def test_deadline_racing_grant_is_not_lost():
+    async def scenario():
+        limiter = TokenBucketLimiter(6, 0)
+        # 이미 끝난 대기자가 앞에 있어 대기열을 거치고, 마감 처리 중에 _dispatch가 배정
+        stale = asyncio.get_running_loop().create_future()
+        stale.cancel()
+        limiter._waiters.append((0, -1, 0, stale))
+        before = limiter._requests
+
+        try:
+            await limiter.acquire(10, deadline=time.monotonic() - 1)
+        except RateLimitTimeout:
+            # 배정되지 않았다면 버킷도 그대로여야 함
+            assert limiter._requests == pytest.approx(before, abs=0.01)
+            assert limiter.timeouts == 1
+        else:
+            # 배정으로 처리했다면 정확히 한 번만 차감
+            assert limiter._requests == pytest.approx(before - 1.0, abs=0.01)
+            assert sum(limiter.granted.values()) == 1
+            assert limiter.timeouts == 0
+        assert not limiter._waiters
+
+    asyncio.run(scenario())
+
+
+def test_deadline_without_grant_times_out():
+    async def scenario():
+        limiter = _drained()
+        with pytest.raises(RateLimitTimeout):
+            await limiter.acquire(10, deadline=time.monotonic() + 0.05)
+        assert limiter.timeouts == 1
+        assert limiter.stats()["waiting"] == 0
+        limiter._dispatcher.cancel()
+
+    asyncio.run(scenario())
@@ -1,63 +1,223 @@
 """
 프롬프트 엔지니어링 자동화 - Flask 프론트엔드
 """
-from flask import Flask, render_template, request, jsonify
+from flask import (
+    Flask, Response, abort, g, render_template, request, jsonify,
+    send_from_directory, stream_with_context, url_for,
+)
+from requests.adapters import HTTPAdapter
 import requests
+import json
+import mimetypes
 import os
+import re
+import secrets
 
 app = Flask(__name__)
 
 # 백엔드 API URL
 API_BASE_URL = os.getenv("API_BASE_URL", "http://localhost:8000")
 
+# 백엔드 호출 타임아웃 (연결, 응답 대기) - 파이프라인은 수십 초 걸릴 수 있음
+BACKEND_TIMEOUT = (3.05, float(os.getenv("BACKEND_TIMEOUT", "120")))
 
-@app.route("/")
-def index():
-    """메인 페이지"""
-    return render_template("index.html")
+# 백엔드 커넥션 풀: 요청마다 새 TCP 연결을 맺지 않고 keep-alive 연결을 재사용
+# (풀 크기는 동시에 처리할 요청 수 = Flask 스레드 수에 맞춤)
+backend = requests.Session()
+backend.mount(API_BASE_URL, HTTPAdapter(
+    pool_connections=1,
+    pool_maxsize=int(os.getenv("BACKEND_POOL_SIZE", "32")),
+))
 
+# 응답 헤더 중 그대로 전달하는 것
+PASSTHROUGH_HEADERS = ("Content-Type", "traceparent", "X-Trace-Id")
 
-@app.route("/api/analyze", methods=["POST"])
-def analyze():
-    """분석 API 프록시"""
+# 빌드된 정적 파일 (python build_assets.py): 원래 경로 → 내용 해시가 들어간 배포 경로
+DIST_DIR = os.path.join(app.static_folder, "dist")
+try:
+    with open(os.path.join(DIST_DIR, "manifest.json"), encoding="utf-8") as f:
+        ASSET_MANIFEST = json.load(f)
+except FileNotFoundError:
+    ASSET_MANIFEST = {}
+
+# 배포 파일은 이름이 내용과 함께 바뀌므로 1년 동안 재검증 없이 캐시
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+
+# W3C traceparent: 00-<trace_id 32자>-<parent_id 16자>-<flags>
+TRACEPARENT_RE = re.compile(r"^00-[0-9a-f]{32}-[0-9a-f]{16}-[0-9a-f]{2}$")
+
+
+@app.before_request
+def start_trace():
+    """
+    요청의 trace 문맥을 정합니다.
+    브라우저가 보낸 traceparent가 있으면 이어 쓰고, 없으면 새 trace_id를 만듭니다.
+    백엔드는 이 값을 부모로 span을 기록합니다.
+    """
+    traceparent = request.headers.get("traceparent", "").strip().lower()
+    if not TRACEPARENT_RE.match(traceparent):
+        traceparent = f"00-{secrets.token_hex(16)}-{secrets.token_hex(8)}-01"
+    g.traceparent = traceparent
+    g.trace_id = traceparent.split("-")[1]
+
+
+@app.after_request
+def add_trace_header(response):
+    """느린 요청을 추적 파일에서 찾을 수 있도록 trace_id를 돌려줍니다."""
+    if "trace_id" in g:
+        response.headers["X-Trace-Id"] = g.trace_id
+    return response
+
+
+def trace_headers() -> dict:
+    """백엔드 호출에 붙일 추적 헤더"""
+    return {"traceparent": g.traceparent}
+
+
+def proxy(method: str, path: str, stream: bool = False) -> Response:
+    """
+    요청을 백엔드로 전달하고 응답 본문을 그대로 돌려줍니다 (JSON을 다시 파싱하지 않음).
+    브라우저의 Accept-Encoding을 함께 보내고, 백엔드가 압축한 본문은 풀지 않고 그대로 전달합니다.
+    stream=True면 백엔드가 보내는 조각을 받는 즉시 브라우저로 흘려보냅니다 (SSE / NDJSON).
+    """
+    headers = {"Content-Type": "application/json", **trace_headers()}
+    if not stream:
+        headers["Accept-Encoding"] = request.headers.get("Accept-Encoding", "identity")
     try:
-        data = request.get_json()
-        response = requests.post(f"{API_BASE_URL}/api/analyze", json=data)
-        return jsonify(response.json()), response.status_code
+        upstream = backend.request(
+            method,
+            f"{API_BASE_URL}{path}",
+            params=request.args,
+            data=request.get_data() if method == "POST" else None,
+            headers=headers,
+            timeout=BACKEND_TIMEOUT,
+            stream=True,
+        )
+        if not stream:
+            with upstream:
+                body = upstream.raw.read(decode_content=False)
     except requests.exceptions.ConnectionError:
         return jsonify({
             "error": "백엔드 서버에 연결할 수 없습니다. 서버가 실행 중인지 확인하세요."
         }), 503
+    except requests.exceptions.Timeout:
+        return jsonify({"error": "백엔드 응답 시간이 초과되었습니다."}), 504
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+    headers = {k: upstream.headers[k] for k in PASSTHROUGH_HEADERS if k in upstream.headers}
+    if not stream:
+        for name in ("Content-Encoding", "Vary"):
+            if name in upstream.headers:
+                headers[name] = upstream.headers[name]
+        return Response(body, status=upstream.status_code, headers=headers)
+
+    def relay():
+        try:
+            yield from upstream.iter_content(chunk_size=None)
+        finally:
+            upstream.close()
+
+    # 프록시 서버(nginx 등)가 스트림을 모았다 보내지 않도록
+    headers.update({"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+    return Response(
+        stream_with_context(relay()), status=upstream.status_code, headers=headers
+    )
+
+
+def asset_url(path: str) -> str:
+    """정적 파일 URL (빌드되어 있으면 해시가 들어간 배포 파일)"""
+    return url_for("static", filename=ASSET_MANIFEST.get(path, path))
+
+
+@app.context_processor
+def inject_asset_url():
+    return {"asset_url": asset_url}
+
+
+@app.route("/static/dist/<path:filename>")
+def dist_asset(filename):
+    """
+    빌드된 정적 파일을 immutable 캐시로 제공합니다.
+    브라우저가 받아들이면 사전 압축본(.br, .gz)을 보내고, ETag로 조건부 요청(304)을 처리합니다.
+    """
+    if filename.endswith((".gz", ".br")):
+        abort(404)
+
+    served, encoding = filename, None
+    for candidate, suffix in (("br", ".br"), ("gzip", ".gz")):
+        if request.accept_encodings[candidate] and os.path.isfile(
+            os.path.join(DIST_DIR, filename + suffix)
+        ):
+            served, encoding = filename + suffix, candidate
+            break
+
+    response = send_from_directory(
+        DIST_DIR,
+        served,
+        mimetype=mimetypes.guess_type(filename)[0],
+        conditional=True,
+        etag=True,
+    )
+    response.headers["Cache-Control"] = IMMUTABLE_CACHE
+    response.vary.add("Accept-Encoding")
+    if encoding:
+        response.headers["Content-Encoding"] = encoding
+    return response
+
+
+@app.route("/")
+def index():
+    """메인 페이지 (배포 파일 이름이 바뀌면 바로 반영되도록 매번 재검증)"""
+    response = app.make_response(render_template("index.html"))
+    response.headers["Cache-Control"] = "no-cache"
+    response.add_etag()
+    return response.make_conditional(request)
+
+
+@app.route("/api/analyze", methods=["POST"])
+def analyze():
+    """분석 API 프록시"""
+    return proxy("POST", "/api/analyze")
+
 
 @app.route("/api/generate-prompts", methods=["POST"])
 def generate_prompts():
     """프롬프트 생성 API 프록시"""
-    try:
-        data = request.get_json()
-        response = requests.post(f"{API_BASE_URL}/api/generate-prompts", json=data)
-        return jsonify(response.json()), response.status_code
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+    return proxy("POST", "/api/generate-prompts")
+
+
+@app.route("/api/pipeline", methods=["POST"])
+def pipeline():
+    """전체 파이프라인 API 프록시"""
+    return proxy("POST", "/api/pipeline")
+
+
+@app.route("/api/pipeline/stream", methods=["POST"])
+def pipeline_stream():
+    """스트리밍 파이프라인(SSE) 프록시"""
+    return proxy("POST", "/api/pipeline/stream", stream=True)
+
+
+@app.route("/api/pipeline/batch", methods=["POST"])
+def pipeline_batch():
+    """배치 파이프라인(NDJSON) 프록시"""
+    return proxy("POST", "/api/pipeline/batch", stream=True)
 
 
 @app.route("/api/strategies")
 def get_strategies():
     """전략 목록 조회 API 프록시"""
-    try:
-        response = requests.get(f"{API_BASE_URL}/api/strategies")
-        return jsonify(response.json()), response.status_code
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+    return proxy("GET", "/api/strategies")
 
 
 @app.route("/health")
 def health():
     """헬스 체크"""
     try:
-        response = requests.get(f"{API_BASE_URL}/health")
+        response = backend.get(
+            f"{API_BASE_URL}/health", headers=trace_headers(), timeout=BACKEND_TIMEOUT
+        )
         return jsonify({
             "frontend": "healthy",
             "backend": response.json()
@@ -70,4 +230,5 @@ def health():
 
 
 if __name__ == "__main__":
-    app.run(debug=True, host="0.0.0.0", port=5000)
+    # threaded: 긴 파이프라인 요청이 다른 요청을 막지 않도록 요청마다 스레드 사용
+    app.run(debug=True, host="0.0.0.0", port=5000, threaded=True)
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+정적 파일 빌드
+static/의 CSS/JS를 내용 해시가 들어간 이름으로 static/dist/에 복사하고,
+gzip(.gz)과 brotli(.br) 사전 압축본, 원래 경로 → 배포 경로 manifest.json을 만듭니다.
+파일 이름이 내용에 따라 바뀌므로 배포 파일은 만료 없이(immutable) 캐시할 수 있습니다.
+
+사용법 (frontend 디렉터리에서):
+    python build_assets.py
+
+brotli 패키지가 없으면 .br 파일은 만들지 않습니다 (pip install brotli).
+"""
+import gzip
+import hashlib
+import json
+import shutil
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:  # 선택 의존성
+    brotli = None
+
+STATIC_DIR = Path(__file__).resolve().parent / "static"
+DIST_DIR = STATIC_DIR / "dist"
+MANIFEST_PATH = DIST_DIR / "manifest.json"
+
+# 빌드할 파일 (static/ 기준 경로)
+ASSETS = ["css/style.css", "js/main.js"]
+
+
+def fingerprint(path: str, data: bytes) -> str:
+    """내용 해시를 넣은 배포 경로 (예: css/style.css → css/style.3f2a9c1b7d.css)"""
+    source = Path(path)
+    digest = hashlib.sha256(data).hexdigest()[:10]
+    return str(source.with_name(f"{source.stem}.{digest}{source.suffix}"))
+
+
+def write_compressed(target: Path, data: bytes) -> list:
+    """사전 압축본을 원본보다 작을 때만 씁니다. 만든 파일의 (확장자, 크기) 목록을 반환합니다."""
+    variants = [(".gz", gzip.compress(data, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        variants.append((".br", brotli.compress(data, quality=11)))
+
+    written = []
+    for suffix, compressed in variants:
+        if len(compressed) < len(data):
+            target.with_name(target.name + suffix).write_bytes(compressed)
+            written.append((suffix, len(compressed)))
+    return written
+
+
+def build() -> dict:
+    """dist/를 새로 만들고 manifest를 반환합니다."""
+    if DIST_DIR.exists():
+        shutil.rmtree(DIST_DIR)
+
+    manifest = {}
+    for path in ASSETS:
+        data = (STATIC_DIR / path).read_bytes()
+        built = fingerprint(path, data)
+        target = DIST_DIR / built
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(data)
+        manifest[path] = f"dist/{built}"
+
+        sizes = ", ".join(f"{suffix} {size:,}" for suffix, size in write_compressed(target, data))
+        print(f"{path} → dist/{built} ({len(data):,} bytes; {sizes or '압축 안 함'})")
+
+    MANIFEST_PATH.write_text(json.dumps(manifest, indent=2) + "\n", encoding="utf-8")
+    return manifest
+
+
+if __name__ == "__main__":
+    build()
+    if brotli is None:
+        print("brotli가 설치되어 있지 않아 .br 파일은 만들지 않았습니다")
+    print(f"manifest: {MANIFEST_PATH}")
@@ -69,7 +69,7 @@ async function analyzeQuery() {
 
         if (!response.ok) {
             const errorData = await response.json();
-            throw new Error(errorData.error || '분석 실패');
+            throw new Error(errorData.error || errorData.detail || '분석 실패');
         }
 
         analysisResult = await response.json();
@@ -124,12 +124,17 @@ async function generatePrompts() {
             headers: {
                 'Content-Type': 'application/json',
             },
-            body: JSON.stringify(analysisResult)
+            // 서버에 저장된 분석 결과는 ID만 보냄
+            body: JSON.stringify(
+                analysisResult.analysis_id
+                    ? { analysis_id: analysisResult.analysis_id }
+                    : analysisResult
+            )
         });
 
         if (!response.ok) {
             const errorData = await response.json();
-            throw new Error(errorData.error || '프롬프트 생성 실패');
+            throw new Error(errorData.error || errorData.detail || '프롬프트 생성 실패');
         }
 
         promptsResult = await response.json();